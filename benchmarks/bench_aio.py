@@ -0,0 +1,94 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark of ``gather_results`` against ``asyncio.gather`` followed by ``Result.collect``.
+
+Latency: 1000 awaitables sleeping up to 100 ms, one of them returning an ``Err`` after 5 ms.
+Overhead: 10^4 awaitables returning ``Ok`` immediately.
+
+Run with::
+
+    python -m benchmarks.bench_aio
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+from rusttypes.aio import gather_results
+from rusttypes.result import Err, Ok, Result
+
+N_LATENCY = 1000
+N_OVERHEAD = 10_000
+
+
+async def work(x: int, delay: float) -> Result[int, str]:
+    await asyncio.sleep(delay)
+    return Err("failed") if x == 0 else Ok(x)
+
+
+async def instant(x: int) -> Result[int, str]:
+    return Ok(x)
+
+
+async def plain_gather(aws: list) -> Result[list[int], str]:
+    return Result.collect(await asyncio.gather(*aws))
+
+
+def measure(gather, make) -> float:
+    start = time.perf_counter()
+    asyncio.run(gather(make()))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    rng = random.Random(0)
+    delays = [0.005] + [rng.uniform(0.01, 0.1) for _ in range(N_LATENCY - 1)]
+
+    def failing():
+        return [work(x, delay) for x, delay in enumerate(delays)]
+
+    def succeeding():
+        return [instant(x) for x in range(N_OVERHEAD)]
+
+    cases = {
+        "asyncio.gather": lambda aws: plain_gather(aws),
+        "gather_results": lambda aws: gather_results(*aws),
+        "gather_results(limit=100)": lambda aws: gather_results(*aws, limit=100),
+    }
+
+    print(f"{'function':<26} {'early Err ms':>12} {'all Ok ms':>10}")
+    for name, gather in cases.items():
+        latency = min(measure(gather, failing) for _ in range(3))
+        overhead = min(measure(gather, succeeding) for _ in range(3))
+        print(f"{name:<26} {latency * 1e3:>12.1f} {overhead * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
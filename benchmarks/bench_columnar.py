@@ -0,0 +1,83 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark of ``OptionArray`` against a list of ``Option`` objects.
+
+Runs ``map``, ``filter``, ``unwrap_or`` and ``count_some`` over 10^6 integers (10% ``Nil``), once
+on ``Some``/``Nil`` objects and once on an ``OptionArray`` (vectorized if NumPy is installed).
+
+Run with::
+
+    python -m benchmarks.bench_columnar
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+from rusttypes.columnar import HAS_NUMPY, OptionArray
+from rusttypes.option import Nil, Some
+
+N = 1_000_000
+
+
+def main() -> None:
+    rng = random.Random(0)
+    values = [rng.randrange(100) if rng.random() < 0.9 else None for _ in range(N)]
+    options = [Nil if v is None else Some(v) for v in values]
+    arr = OptionArray.from_optionals(values, typecode="q")
+
+    cases = {
+        "map": (
+            lambda: [o.map(lambda x: x * 2) for o in options],
+            lambda: arr.map(lambda x: x * 2, vectorized=True),
+        ),
+        "filter": (
+            lambda: [o.filter(lambda x: x % 2 == 0) for o in options],
+            lambda: arr.filter(lambda x: x % 2 == 0, vectorized=True),
+        ),
+        "unwrap_or": (
+            lambda: [o.unwrap_or(0) for o in options],
+            lambda: arr.unwrap_or(0),
+        ),
+        "count_some": (
+            lambda: sum(o.is_some() for o in options),
+            lambda: arr.count_some(),
+        ),
+    }
+
+    print(f"{N:,} values, numpy={HAS_NUMPY}")
+    print(f"{'operation':<12} {'objects ms':>11} {'OptionArray ms':>15}")
+    for name, (objects, columnar) in cases.items():
+        t_objects = min(timeit.repeat(objects, number=1, repeat=3))
+        t_columnar = min(timeit.repeat(columnar, number=1, repeat=3))
+        print(f"{name:<12} {t_objects * 1e3:>11.1f} {t_columnar * 1e3:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Allocation and timing benchmark for the ``Option`` and ``Result`` combinators.
+
+Reports the number of memory blocks allocated per combinator call together with the time per call.
+Passthrough combinators (e.g. ``Err.map``, ``Ok.map_err``) must not allocate at all, constructing
+combinators (e.g. ``Ok.map``) must allocate exactly one wrapper.
+
+Run with::
+
+    python -m benchmarks.bench_combinators
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from typing import Any, Callable
+
+from rusttypes.option import Nil, Some
+from rusttypes.result import Err, Ok
+
+N = 100_000
+
+
+def _ident(x: Any) -> Any:
+    return x
+
+
+def _ok(x: Any) -> Any:
+    return Ok(x)
+
+
+def _some(x: Any) -> Any:
+    return Some(x)
+
+
+CASES: list[tuple[str, Any, Callable[[Any], Any]]] = [
+    ("Ok.map", Ok(1), lambda r: r.map(_ident)),
+    ("Ok.map_err", Ok(1), lambda r: r.map_err(_ident)),
+    ("Ok.and_then", Ok(1), lambda r: r.and_then(_ok)),
+    ("Ok.or_", Ok(1), lambda r: r.or_(r)),
+    ("Ok.or_else", Ok(1), lambda r: r.or_else(_ok)),
+    ("Err.map", Err(1), lambda r: r.map(_ident)),
+    ("Err.map_err", Err(1), lambda r: r.map_err(_ident)),
+    ("Err.and_", Err(1), lambda r: r.and_(r)),
+    ("Err.and_then", Err(1), lambda r: r.and_then(_ok)),
+    ("Err.or_else", Err(1), lambda r: r.or_else(_ok)),
+    ("Some.map", Some(1), lambda o: o.map(_ident)),
+    ("Some.and_then", Some(1), lambda o: o.and_then(_some)),
+    ("Some.filter", Some(1), lambda o: o.filter(bool)),
+    ("Nil.map", Nil, lambda o: o.map(_ident)),
+]
+
+
+def allocations_per_call(value: Any, op: Callable[[Any], Any], n: int = N) -> float:
+    """Returns the number of memory blocks that stay allocated per call of ``op(value)``."""
+    out: list[Any] = [None] * n
+    op(value)  # warm up caches before counting
+
+    before = sys.getallocatedblocks()
+    for i in range(n):
+        out[i] = op(value)
+    after = sys.getallocatedblocks()
+
+    return (after - before) / n
+
+
+def main() -> None:
+    print(f"{'combinator':<14} {'allocs/call':>11} {'ns/call':>9}")
+    for name, value, op in CASES:
+        allocs = allocations_per_call(value, op)
+        t = timeit.timeit(lambda value=value, op=op: op(value), number=N) / N
+        print(f"{name:<14} {allocs:>11.2f} {t * 1e9:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
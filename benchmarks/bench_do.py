@@ -0,0 +1,89 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark of the ``do`` decorator against ``try_guard`` on 20-step chains.
+
+Runs a chain of 20 steps returning ``Result`` 10^5 times, once without ``Err``, once with an ``Err``
+at step 10 and once with an ``Err`` at the last step, with ``try_guard`` (exception per ``Err``),
+``try_guard(optimize=True)`` (early returns) and ``do`` (generator based).
+
+Run with::
+
+    python -m benchmarks.bench_do
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from rusttypes.result import Err, Ok, Result, do, try_guard
+
+N = 100_000
+STEPS = 20
+
+
+def step(x: int, i: int, fail_at: int) -> Result[int, str]:
+    return Err("failed") if i == fail_at else Ok(x + 1)
+
+
+def chain_try(x: int, fail_at: int) -> Result[int, str]:
+    for i in range(STEPS):
+        x = step(x, i, fail_at).try_()
+    return Ok(x)
+
+
+def chain_do(x: int, fail_at: int):
+    for i in range(STEPS):
+        x = yield step(x, i, fail_at)
+    return Ok(x)
+
+
+def main() -> None:
+    cases = {
+        "try_guard": try_guard(chain_try),
+        "try_guard(optimize)": try_guard(chain_try, optimize=True),
+        "do": do(chain_do),
+    }
+    scenarios = {"no Err": -1, "Err at step 10": 9, "Err at step 20": STEPS - 1}
+
+    print(f"{'decorator':<20} " + " ".join(f"{name:>15}" for name in scenarios) + "  (ns/call)")
+    for name, fn in cases.items():
+        times = []
+        for fail_at in scenarios.values():
+            t = min(
+                timeit.repeat(
+                    lambda fn=fn, fail_at=fail_at: [fn(0, fail_at) for _ in range(N)],
+                    number=1,
+                    repeat=3,
+                )
+            )
+            times.append(t / N)
+        print(f"{name:<20} " + " ".join(f"{t * 1e9:>15.1f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark of the cost of ``panic`` with and without the lightweight exception mode
+(``rusttypes.misc.set_lightweight_exceptions``).
+
+Measures a ``panic`` raised while another exception is handled, caught (and formatted, as a logging
+layer would) by the caller.
+
+Run with::
+
+    python -m benchmarks.bench_exceptions
+"""
+
+from __future__ import annotations
+
+import contextlib
+import timeit
+import traceback
+
+from rusttypes.misc import panic, set_lightweight_exceptions
+
+N = 100_000
+
+
+def panic_in_handler() -> None:
+    try:
+        {}["missing"]
+    except KeyError:
+        panic("lookup failed")
+
+
+def catch_panic() -> None:
+    with contextlib.suppress(RuntimeError):
+        panic_in_handler()
+
+
+def catch_and_format_panic() -> None:
+    try:
+        panic_in_handler()
+    except RuntimeError as e:
+        traceback.format_exception(e)
+
+
+def main() -> None:
+    cases = {
+        "panic": (catch_panic, N),
+        "panic + format": (catch_and_format_panic, N // 20),
+    }
+
+    print(f"{'case':<16} {'default ns/op':>14} {'lightweight ns/op':>18}")
+    for name, (fn, n) in cases.items():
+        times = []
+        for lightweight in (False, True):
+            set_lightweight_exceptions(lightweight)
+            times.append(min(timeit.repeat(fn, number=n, repeat=5)) / n)
+        set_lightweight_exceptions(None)
+        print(f"{name:<16} {times[0] * 1e9:>14.1f} {times[1] * 1e9:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Latency benchmark of ``par_find_map`` against a serial search.
+
+16 candidates are probed with latencies between 20 and 100 ms (like replicas or parsing
+strategies), the probe returns ``Some`` for candidates 9 and 13 only. Compares the serial
+``or_else`` chain with ``par_find_map`` on a thread pool, in completion order and in input order.
+
+Run with::
+
+    python -m benchmarks.bench_find_map
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+
+from rusttypes.option import Nil, Option, Some
+from rusttypes.parallel import par_find_map
+
+N = 16
+HITS = (9, 13)
+
+
+def main() -> None:
+    rng = random.Random(0)
+    latencies = [rng.uniform(0.02, 0.1) for _ in range(N)]
+
+    def probe(i: int) -> Option[int]:
+        time.sleep(latencies[i])
+        return Some(i) if i in HITS else Nil
+
+    def serial() -> Option[int]:
+        return reduce(lambda found, i: found.or_else(lambda: probe(i)), range(N), Nil)
+
+    with ThreadPoolExecutor(N) as executor:
+        cases = {
+            "serial or_else": serial,
+            "par_find_map": lambda: par_find_map(probe, range(N), executor=executor),
+            "par_find_map(ordered)": lambda: par_find_map(
+                probe, range(N), executor=executor, ordered=True
+            ),
+        }
+        print(f"{'search':<22} {'result':>9} {'ms':>8}")
+        for name, run in cases.items():
+            times = []
+            for _ in range(3):
+                start = time.perf_counter()
+                result = run()
+                times.append(time.perf_counter() - start)
+            print(f"{name:<22} {result!r:>9} {min(times) * 1e3:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark of defensive copying against sharing frozen wrappers.
+
+A cache that hands out mutable ``Some`` values has to copy them on every lookup, otherwise a caller
+could ``insert``/``replace`` the cached value for everybody. ``FrozenSome`` can be handed out as is.
+
+Run with::
+
+    python -m benchmarks.bench_frozen
+"""
+
+from __future__ import annotations
+
+import copy
+import sys
+import timeit
+from typing import Any, Callable
+
+from rusttypes.option import FrozenSome, Some
+
+N = 1_000_000
+KEYS = 1_000
+
+
+def blocks_per_call(get: Callable[[int], Any]) -> float:
+    out: list[Any] = [None] * N
+    before = sys.getallocatedblocks()
+    for i in range(N):
+        out[i] = get(i % KEYS)
+    return (sys.getallocatedblocks() - before) / N
+
+
+def main() -> None:
+    mutable = {k: Some(k) for k in range(KEYS)}
+    frozen = {k: FrozenSome(k) for k in range(KEYS)}
+
+    print(f"{'lookup':<22} {'blocks/call':>11} {'ns/call':>9}")
+    for name, get in (
+        ("copy.copy(Some)", lambda k: copy.copy(mutable[k])),
+        ("Some(cached.inner)", lambda k: Some(mutable[k].inner)),
+        ("shared FrozenSome", lambda k: frozen[k]),
+    ):
+        blocks = blocks_per_call(get)
+        t = timeit.timeit(lambda get=get: [get(i % KEYS) for i in range(N)], number=1) / N
+        print(f"{name:<22} {blocks:>11.2f} {t * 1e9:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
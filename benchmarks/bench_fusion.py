@@ -0,0 +1,93 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark of ``fuse_chains`` against the same functions without fusion.
+
+Calls a ``Result`` chain ``map(f).and_then(g).map_err(h).unwrap_or(d)`` and an ``Option`` chain
+``map(f).filter(p).unwrap_or(d)`` on 10^6 values (10% ``Err``/``Nil``).
+
+Run with::
+
+    python -m benchmarks.bench_fusion
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+from rusttypes.fusion import fuse_chains
+from rusttypes.option import Nil, Some
+from rusttypes.result import Err, Ok
+
+N = 1_000_000
+
+
+def inc(x: int) -> int:
+    return x + 1
+
+
+def half(x: int):
+    return Ok(x // 2) if x % 2 == 0 else Err("odd")
+
+
+def positive(x: int) -> bool:
+    return x > 0
+
+
+def result_chain(r):
+    return r.map(inc).and_then(half).map_err(str.upper).unwrap_or(-1)
+
+
+def option_chain(o):
+    return o.map(inc).filter(positive).unwrap_or(0)
+
+
+def main() -> None:
+    rng = random.Random(0)
+    values = [rng.randrange(100) for _ in range(N)]
+    results = [Ok(v) if v < 90 else Err("too large") for v in values]
+    options = [Some(v) if v < 90 else Nil for v in values]
+
+    fused_result_chain = fuse_chains(result_chain)
+    fused_option_chain = fuse_chains(option_chain)
+
+    cases = {
+        "Result chain": lambda: list(map(result_chain, results)),
+        "Result chain, fused": lambda: list(map(fused_result_chain, results)),
+        "Option chain": lambda: list(map(option_chain, options)),
+        "Option chain, fused": lambda: list(map(fused_option_chain, options)),
+    }
+
+    print(f"{'function':<22} {'ns/call':>8}")
+    for name, run in cases.items():
+        t = min(timeit.repeat(run, number=1, repeat=5)) / N
+        print(f"{name:<22} {t * 1e9:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Tail latency benchmark of ``hedge``.
+
+A call takes 5 ms, except for 5% of the attempts which take 100 ms. 300 calls are made without
+hedging and with hedges after 10 ms (and 10/20 ms), on a shared thread pool and with
+``asyncio``. Prints the latency percentiles and the ``HedgeStats`` counters.
+
+Run with::
+
+    python -m benchmarks.bench_hedge
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rusttypes import aio
+from rusttypes.parallel import HedgeStats, hedge
+from rusttypes.result import Result
+
+N = 300
+SLOW_RATE = 0.05
+
+
+def main() -> None:
+    rng = random.Random(0)
+
+    def latency() -> float:
+        return 0.1 if rng.random() < SLOW_RATE else 0.005
+
+    def call() -> int:
+        time.sleep(latency())
+        return 1
+
+    async def async_call() -> int:
+        await asyncio.sleep(latency())
+        return 1
+
+    def percentiles(times: list[float]) -> str:
+        q = statistics.quantiles(times, n=100)
+        return f"{q[49] * 1e3:>7.1f} {q[94] * 1e3:>7.1f} {q[98] * 1e3:>7.1f}"
+
+    print(f"{'mode':<26} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7}  stats")
+    with ThreadPoolExecutor(16) as executor:
+        cases = {
+            "no hedging": None,
+            "hedge [10 ms]": [0.01],
+            "hedge [10 ms, 20 ms]": [0.01, 0.02],
+        }
+        for name, delays in cases.items():
+            stats = HedgeStats()
+            times = []
+            for _ in range(N):
+                start = time.perf_counter()
+                if delays is None:
+                    Result.from_fn(call)
+                else:
+                    hedge(call, delays, executor=executor, stats=stats)
+                times.append(time.perf_counter() - start)
+            print(f"{name:<26} {percentiles(times)}  {stats if delays else ''}")
+
+    async def run_async(delays: list[float]) -> tuple[list[float], HedgeStats]:
+        stats = HedgeStats()
+        times = []
+        for _ in range(N):
+            start = time.perf_counter()
+            await aio.hedge(async_call, delays, stats=stats)
+            times.append(time.perf_counter() - start)
+        return times, stats
+
+    for delays in ([], [0.01]):
+        times, stats = asyncio.run(run_async(delays))
+        name = f"asyncio hedge {[f'{d * 1e3:.0f} ms' for d in delays]}".replace("'", "")
+        print(f"{name:<26} {percentiles(times)}  {stats}")
+
+
+if __name__ == "__main__":
+    main()
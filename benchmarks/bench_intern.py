@@ -0,0 +1,87 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark for the interning of ``Some`` and ``Ok`` wrappers.
+
+Creates wrappers for a payload mix dominated by ``None``, booleans, small integers and short
+strings, once with the plain constructors and once through ``rusttypes.intern``, and reports the
+time, the memory blocks kept alive per wrapper and the hit rate of the intern table.
+
+Run with::
+
+    python -m benchmarks.bench_intern
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import timeit
+from typing import Any, Callable
+
+from rusttypes.intern import InternTable
+from rusttypes.option import Some
+from rusttypes.result import Ok
+
+N = 1_000_000
+
+
+def payloads(n: int) -> list[Any]:
+    rng = random.Random(0)
+    common = [None, True, False, 0, 1, "", "ok", *range(100)]
+    return [rng.choice(common) if rng.random() < 0.95 else rng.random() for _ in range(n)]
+
+
+def blocks_per_call(factory: Callable[[Any], Any], values: list[Any]) -> float:
+    out: list[Any] = [None] * len(values)
+    before = sys.getallocatedblocks()
+    for i, v in enumerate(values):
+        out[i] = factory(v)
+    return (sys.getallocatedblocks() - before) / len(values)
+
+
+def main() -> None:
+    values = payloads(N)
+    table = InternTable()
+
+    print(f"{'factory':<14} {'blocks/call':>11} {'ns/call':>9}")
+    for name, factory in (
+        ("Some", Some),
+        ("table.some", table.some),
+        ("Ok", Ok),
+        ("table.ok", table.ok),
+    ):
+        blocks = blocks_per_call(factory, values)
+        t = timeit.timeit(lambda factory=factory: [factory(v) for v in values], number=1) / N
+        print(f"{name:<14} {blocks:>11.2f} {t * 1e9:>9.1f}")
+
+    info = table.cache_info()
+    print(f"hit rate: {info.hits / (info.hits + info.misses):.1%} ({info})")
+
+
+if __name__ == "__main__":
+    main()
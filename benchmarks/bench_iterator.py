@@ -0,0 +1,87 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark of ``ResultIter``/``OptionIter`` against per element method chains.
+
+Runs ``map(f).and_then(g).map_err(h)`` over 10^6 results (and ``map(f).and_then(g).filter(p)`` over
+10^6 options), once as method chain per element and once through the fused lazy iterators.
+
+Run with::
+
+    python -m benchmarks.bench_iterator
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+from rusttypes.iterator import OptionIter, ResultIter
+from rusttypes.option import Nil, Some
+from rusttypes.result import Err, Ok
+
+N = 1_000_000
+
+
+def main() -> None:
+    rng = random.Random(0)
+    values = [rng.randrange(100) for _ in range(N)]
+    results = [Ok(v) if v < 90 else Err(str(v)) for v in values]
+    options = [Some(v) if v < 90 else Nil for v in values]
+
+    def inc(x: int) -> int:
+        return x + 1
+
+    def half(x: int):
+        return Ok(x // 2) if x % 2 == 0 else Err("odd")
+
+    def half_opt(x: int):
+        return Some(x // 2) if x % 2 == 0 else Nil
+
+    def positive(x: int) -> bool:
+        return x > 0
+
+    cases = {
+        "Result methods": lambda: [r.map(inc).and_then(half).map_err(str.upper) for r in results],
+        "ResultIter": lambda: list(ResultIter(results).map(inc).and_then(half).map_err(str.upper)),
+        "ResultIter.from_values": lambda: list(
+            ResultIter.from_values(values).map(inc).and_then(half).map_err(str.upper)
+        ),
+        "Option methods": lambda: [o.map(inc).and_then(half_opt).filter(positive) for o in options],
+        "OptionIter": lambda: list(
+            OptionIter(options).map(inc).and_then(half_opt).filter(positive)
+        ),
+    }
+
+    print(f"{'chain':<24} {'ns/element':>11}")
+    for name, run in cases.items():
+        t = min(timeit.repeat(run, number=1, repeat=5)) / N
+        print(f"{name:<24} {t * 1e9:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
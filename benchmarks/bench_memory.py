@@ -0,0 +1,89 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Memory benchmark for the ``Option`` and ``Result`` variants.
+
+Compares the bytes allocated per instance of the slotted variants against an equivalent ``__dict__``
+based layout (the layout used before the variants declared ``__slots__``).
+
+Run with::
+
+    python -m benchmarks.bench_memory
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+from typing import Any, Callable
+
+from rusttypes.option import Some
+from rusttypes.result import Err, Ok
+
+N = 100_000
+
+
+class DictSome(Some):
+    """``Some`` with a per-instance ``__dict__``, as it was laid out before."""
+
+
+class DictOk(Ok):
+    """``Ok`` with a per-instance ``__dict__``, as it was laid out before."""
+
+
+class DictErr(Err):
+    """``Err`` with a per-instance ``__dict__``, as it was laid out before."""
+
+
+def bytes_per_instance(factory: Callable[[int], Any], n: int = N) -> float:
+    """Returns the average number of bytes allocated per instance created by ``factory``."""
+    payloads = list(range(n))
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        objs = [factory(p) for p in payloads]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # The list holding the instances is allocated as well, account for its pointers
+    return (after - before) / n - 8 if objs else 0.0
+
+
+def main() -> None:
+    print(f"{'variant':<8} {'before (dict)':>14} {'after (slots)':>14} {'saved':>8}")
+    for name, before, after in (
+        ("Some", DictSome, Some),
+        ("Ok", DictOk, Ok),
+        ("Err", DictErr, Err),
+    ):
+        b = bytes_per_instance(before)
+        a = bytes_per_instance(after)
+        print(f"{name:<8} {b:>12.1f} B {a:>12.1f} B {1 - a / b:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
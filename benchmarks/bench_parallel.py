@@ -0,0 +1,87 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Scaling benchmark of ``par_map`` with 1, 2, 4 and 8 workers.
+
+CPU bound: a pure Python loop on 10^4 inputs on a process pool. I/O bound: a 1 ms sleep on 2000
+inputs on a thread pool. Both are compared with the serial ``map`` of ``Result.from_fn``.
+
+Run with::
+
+    python -m benchmarks.bench_parallel
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from rusttypes.parallel import par_map
+from rusttypes.result import Result
+
+N_CPU = 10_000
+N_IO = 2000
+WORKERS = (1, 2, 4, 8)
+
+
+def cpu_task(x: int) -> int:
+    total = 0
+    for i in range(2000):
+        total += (x * i) % 7
+    return total
+
+
+def io_task(x: int) -> int:
+    time.sleep(0.001)
+    return x
+
+
+def timed(run) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    serial_cpu = timed(lambda: [Result.from_fn(lambda x=x: cpu_task(x)) for x in range(N_CPU)])
+    serial_io = timed(lambda: [Result.from_fn(lambda x=x: io_task(x)) for x in range(N_IO)])
+
+    print(f"{'workers':>7} {'cpu/process s':>14} {'speedup':>8} {'io/thread s':>12} {'speedup':>8}")
+    print(f"{'serial':>7} {serial_cpu:>14.2f} {1:>7.2f}x {serial_io:>12.2f} {1:>7.2f}x")
+    for workers in WORKERS:
+        with ProcessPoolExecutor(workers) as executor:
+            cpu = timed(lambda: list(par_map(cpu_task, range(N_CPU), executor=executor)))
+        with ThreadPoolExecutor(workers) as executor:
+            io = timed(lambda: list(par_map(io_task, range(N_IO), executor=executor, chunksize=1)))
+        print(
+            f"{workers:>7} {cpu:>14.2f} {serial_cpu / cpu:>7.2f}x "
+            f"{io:>12.2f} {serial_io / io:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
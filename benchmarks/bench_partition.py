@@ -0,0 +1,71 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark of ``Result.partition`` on 10^6 mixed results.
+
+Compares the single pass ``Result.partition``/``Result.partition_indexed`` against the two pass
+``is_ok()``/``unwrap()``/``unwrap_err()`` approach.
+
+Run with::
+
+    python -m benchmarks.bench_partition
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+from typing import Any
+
+from rusttypes.result import Err, Ok, Result
+
+N = 1_000_000
+
+
+def two_pass(results: list[Result[Any, Any]]) -> tuple[list[Any], list[Any]]:
+    oks = [r.unwrap() for r in results if r.is_ok()]
+    errs = [r.unwrap_err() for r in results if not r.is_ok()]
+    return oks, errs
+
+
+def main() -> None:
+    rng = random.Random(0)
+    results = [Ok(i) if rng.random() < 0.9 else Err(str(i)) for i in range(N)]
+
+    print(f"partitioning {N:,} results (10% Err)")
+    print(f"{'approach':<26} {'ms':>8}")
+    for name, run in (
+        ("two passes, method calls", lambda: two_pass(results)),
+        ("Result.partition", lambda: Result.partition(results)),
+        ("Result.partition_indexed", lambda: Result.partition_indexed(results)),
+    ):
+        t = min(timeit.repeat(run, number=1, repeat=3))
+        print(f"{name:<26} {t * 1e3:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
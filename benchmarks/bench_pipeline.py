@@ -0,0 +1,86 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark of ``Pipeline`` against the equivalent method chain.
+
+Applies ``map(f).and_then(g).map_err(h).or_else(k)`` to 10^6 results (90% ``Ok``) through the
+method chain, a ``Pipeline`` call, the compiled function of a ``Pipeline`` and ``Pipeline.apply`` on
+raw values.
+
+Run with::
+
+    python -m benchmarks.bench_pipeline
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+from rusttypes.pipeline import Pipeline
+from rusttypes.result import Err, Ok
+
+N = 1_000_000
+
+
+def main() -> None:
+    rng = random.Random(0)
+    values = [rng.randrange(100) for _ in range(N)]
+    results = [Ok(v) if v < 90 else Err("too large") for v in values]
+
+    def inc(x: int) -> int:
+        return x + 1
+
+    def half(x: int):
+        return Ok(x // 2) if x % 2 == 0 else Err("odd")
+
+    def recover(e: str):
+        return Ok(0) if e == "ODD" else Err(e)
+
+    pipe = Pipeline.ok().map(inc).and_then(half).map_err(str.upper).or_else(recover)
+    run = pipe.compile()
+    run_raw = pipe.compile(raw=True)
+
+    cases = {
+        "method chain": lambda: [
+            r.map(inc).and_then(half).map_err(str.upper).or_else(recover) for r in results
+        ],
+        "pipe(res)": lambda: [pipe(r) for r in results],
+        "pipe.compile()": lambda: list(map(run, results)),
+        "pipe.compile(raw=True)": lambda: list(map(run_raw, values)),
+    }
+
+    print(f"{'variant':<24} {'ns/value':>9} {'speedup':>8}")
+    baseline = None
+    for name, fn in cases.items():
+        t = min(timeit.repeat(fn, number=1, repeat=5)) / N
+        baseline = baseline or t
+        print(f"{name:<24} {t * 1e9:>9.1f} {baseline / t:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark of the allocation free function APIs against the object API.
+
+Runs the same ``map``/``and_then``/``unwrap_or`` chain over raw values through ``Option``/``Result``
+objects and through ``rusttypes.optional``/``rusttypes.tagged`` functions.
+
+Run with::
+
+    python -m benchmarks.bench_raw
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+from rusttypes.option import Nil, Option, Some
+from rusttypes.optional import opt_and_then, opt_map, opt_unwrap_or
+from rusttypes.result import Err, Ok
+from rusttypes.tagged import ERR, OK, res_and_then, res_map, res_unwrap_or
+
+N = 1_000_000
+
+
+def main() -> None:
+    rng = random.Random(0)
+    values = [rng.randrange(100) if rng.random() < 0.9 else None for _ in range(N)]
+
+    def inc(x: int) -> int:
+        return x + 1
+
+    def half_opt(x: int) -> Option[int]:
+        return Some(x // 2) if x % 2 == 0 else Nil
+
+    def half_raw(x: int) -> int | None:
+        return x // 2 if x % 2 == 0 else None
+
+    def half_res(x: int):
+        return Ok(x // 2) if x % 2 == 0 else Err("odd")
+
+    def half_tagged(x: int):
+        return (OK, x // 2) if x % 2 == 0 else (ERR, "odd")
+
+    cases = {
+        "Option methods": lambda: [
+            Option.from_opt(v).map(inc).and_then(half_opt).unwrap_or(0) for v in values
+        ],
+        "opt_* functions": lambda: [
+            opt_unwrap_or(opt_and_then(opt_map(v, inc), half_raw), 0) for v in values
+        ],
+        "Result methods": lambda: [
+            (Ok(v) if v is not None else Err("nil")).map(inc).and_then(half_res).unwrap_or(0)
+            for v in values
+        ],
+        "res_* functions": lambda: [
+            res_unwrap_or(
+                res_and_then(res_map((OK, v) if v is not None else (ERR, "nil"), inc), half_tagged),
+                0,
+            )
+            for v in values
+        ],
+    }
+
+    print(f"{'api':<16} {'ns/value':>9}")
+    for name, run in cases.items():
+        t = timeit.timeit(run, number=1) / N
+        print(f"{name:<16} {t * 1e9:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
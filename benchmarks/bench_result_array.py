@@ -0,0 +1,102 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark of ``ResultArray`` against a list of ``Result`` objects.
+
+Validates a batch of 10^6 integers with a small error rate and compares the memory held by a list
+of ``Ok``/``Err`` objects with a ``ResultArray``, as well as the time of ``map``, ``map_err`` and
+``partition`` on both.
+
+Run with::
+
+    python -m benchmarks.bench_result_array
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+from rusttypes.columnar import HAS_NUMPY, ResultArray
+from rusttypes.result import Err, Ok, Result
+
+N = 1_000_000
+
+
+def allocated(build: Callable[[], Any]) -> tuple[Any, int]:
+    tracemalloc.start()
+    value = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size
+
+
+def main() -> None:
+    rng = random.Random(0)
+    values = [rng.randrange(1 << 40) for _ in range(N)]
+
+    print(f"{N:,} results, numpy={HAS_NUMPY}")
+    print(f"{'error rate':<11} {'objects MiB':>12} {'ResultArray MiB':>16}")
+    for rate in (0.0, 0.01, 0.1):
+        bad = {i for i in range(N) if rng.random() < rate}
+
+        def make_results(bad: set[int] = bad) -> list[Result[int, str]]:
+            return [Err(f"row {i}") if i in bad else Ok(v) for i, v in enumerate(values)]
+
+        results, objects = allocated(make_results)
+        arr, columnar = allocated(
+            lambda results=results: ResultArray.from_results(results, typecode="q")
+        )
+        # the objects above are kept alive by ``results``, only count the new allocations
+        print(f"{rate:<11.0%} {objects / 2**20:>12.1f} {columnar / 2**20:>16.1f}")
+
+    cases = {
+        "map": (
+            lambda: [r.map(lambda x: x * 2) for r in results],
+            lambda: arr.map(lambda x: x * 2, vectorized=True),
+        ),
+        "map_err": (
+            lambda: [r.map_err(str.upper) for r in results],
+            lambda: arr.map_err(str.upper),
+        ),
+        "partition": (
+            lambda: Result.partition(results),
+            lambda: arr.partition(),
+        ),
+    }
+
+    print(f"\n{'operation':<11} {'objects ms':>12} {'ResultArray ms':>16}")
+    for name, (objects_op, columnar_op) in cases.items():
+        t_objects = min(timeit.repeat(objects_op, number=1, repeat=3))
+        t_columnar = min(timeit.repeat(columnar_op, number=1, repeat=3))
+        print(f"{name:<11} {t_objects * 1e3:>12.1f} {t_columnar * 1e3:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Sorting benchmark for ``Option`` and ``Result`` values.
+
+Compares sorting with the Python level comparison methods (``sorted(xs)``) against sorting with the
+tuple based ``sort_key`` (``sorted(xs, key=Option.sort_key)``), which only calls Python code once
+per element instead of once per comparison.
+
+Run with::
+
+    python -m benchmarks.bench_sort
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+from rusttypes.option import Nil, Option, Some
+from rusttypes.result import Err, Ok, Result
+
+N = 1_000_000
+
+
+def main() -> None:
+    rng = random.Random(0)
+    options = [Some(rng.randrange(N)) if rng.random() < 0.9 else Nil for _ in range(N)]
+    results = [
+        Ok(rng.randrange(N)) if rng.random() < 0.9 else Err(rng.randrange(N)) for _ in range(N)
+    ]
+
+    print(f"sorting {N:,} values")
+    print(f"{'values':<8} {'__lt__':>9} {'sort_key':>9}")
+    for name, xs, key in (
+        ("Option", options, Option.sort_key),
+        ("Result", results, Result.sort_key),
+    ):
+        plain = timeit.timeit(lambda xs=xs: sorted(xs), number=1)
+        keyed = timeit.timeit(lambda xs=xs, key=key: sorted(xs, key=key), number=1)
+        print(f"{name:<8} {plain:>8.2f}s {keyed:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark of ``SparseOptionVector`` against a dense list of ``Option`` values.
+
+Stores 10^7 slots of which 1% are ``Some`` and compares memory, random point lookups and ``map``.
+
+Run with::
+
+    python -m benchmarks.bench_sparse
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+from rusttypes.option import Nil, Option, Some
+from rusttypes.sparse import SparseOptionVector
+
+N = 10_000_000
+DENSITY = 0.01
+LOOKUPS = 100_000
+
+
+def allocated(build: Callable[[], Any]) -> tuple[Any, int]:
+    tracemalloc.start()
+    value = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size
+
+
+def main() -> None:
+    rng = random.Random(0)
+    present = {i: rng.random() for i in rng.sample(range(N), int(N * DENSITY))}
+
+    def make_dense() -> list[Option[float]]:
+        options: list[Option[float]] = [Nil] * N
+        for i, v in present.items():
+            options[i] = Some(v)
+        return options
+
+    dense, dense_size = allocated(make_dense)
+    sparse, sparse_size = allocated(
+        lambda: SparseOptionVector.from_items(N, present.items(), typecode="d")
+    )
+    positions = [rng.randrange(N) for _ in range(LOOKUPS)]
+
+    cases = {
+        f"{LOOKUPS:,} lookups": (
+            lambda: [dense[i] for i in positions],
+            lambda: [sparse[i] for i in positions],
+        ),
+        "map": (
+            lambda: [o.map(lambda x: x * 2) for o in dense],
+            lambda: sparse.map(lambda x: x * 2),
+        ),
+        "count_some": (
+            lambda: sum(o.is_some() for o in dense),
+            lambda: sparse.count_some(),
+        ),
+    }
+
+    print(f"{N:,} slots, {DENSITY:.0%} Some")
+    print(f"{'':<16} {'dense':>10} {'sparse':>10}")
+    print(f"{'MiB':<16} {dense_size / 2**20:>10.1f} {sparse_size / 2**20:>10.1f}")
+    for name, (dense_op, sparse_op) in cases.items():
+        t_dense = min(timeit.repeat(dense_op, number=1, repeat=3))
+        t_sparse = min(timeit.repeat(sparse_op, number=1, repeat=3))
+        print(f"{name + ' ms':<16} {t_dense * 1e3:>10.1f} {t_sparse * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
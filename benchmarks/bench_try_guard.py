@@ -0,0 +1,85 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark of ``try_guard`` with and without ``optimize=True``.
+
+Parses 10^5 pairs ``"a,b"`` of integers with a function that calls ``try_`` on both parsed values,
+with 0%, 10% and 90% of the pairs containing an invalid number.
+
+Run with::
+
+    python -m benchmarks.bench_try_guard
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+from rusttypes.result import Err, Ok, Result, try_guard
+
+N = 100_000
+
+
+def parse_int(s: str) -> Result[int, str]:
+    return Ok(int(s)) if s.isdigit() else Err(s)
+
+
+def parse_pair(s: str) -> Result[int, str]:
+    a, b = s.split(",")
+    x = parse_int(a).try_()
+    y = parse_int(b).try_()
+    return Ok(x + y)
+
+
+def main() -> None:
+    guarded = try_guard(parse_pair)
+    optimized = try_guard(parse_pair, optimize=True)
+    rng = random.Random(0)
+
+    print(f"{'Err rate':>8} {'exceptions ns/call':>19} {'optimized ns/call':>18} {'speedup':>8}")
+    for rate in (0.0, 0.1, 0.9):
+        pairs = [
+            f"{rng.randrange(1000)},{'x' if rng.random() < rate else rng.randrange(1000)}"
+            for _ in range(N)
+        ]
+        t_guarded = (
+            min(timeit.repeat(lambda pairs=pairs: list(map(guarded, pairs)), number=1, repeat=5))
+            / N
+        )
+        t_optimized = (
+            min(timeit.repeat(lambda pairs=pairs: list(map(optimized, pairs)), number=1, repeat=5))
+            / N
+        )
+        print(
+            f"{rate:>8.0%} {t_guarded * 1e9:>19.1f} {t_optimized * 1e9:>18.1f} "
+            f"{t_guarded / t_optimized:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Helpers to rewrite and recompile the source of a function at definition time.
+
+Used by the opt-in optimizations of ``rusttypes.fusion`` and ``rusttypes.result.try_guard``. A
+function is only rewritten if it can be recompiled to an equivalent function: it must be a plain
+Python function with available source, without closure variables (including the implicit
+``__class__`` of ``super()``), without other decorators below the rewriting one and without names
+that are mangled inside a class body.
+"""
+
+from __future__ import annotations
+
+import __future__
+import ast
+import inspect
+import textwrap
+import types
+from typing import Any, Final, Iterator, Optional, Union
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+_FACTORY: Final = "__rusttypes_factory__"
+
+
+def parse_function(fn: Any) -> Optional[FunctionNode]:
+    """Returns the parsed definition of ``fn`` without its decorators, with line numbers of the
+    source file, or ``None`` if ``fn`` can not be recompiled safely."""
+    if not isinstance(fn, types.FunctionType) or fn.__code__.co_freevars:
+        return None
+    if hasattr(fn, "__wrapped__"):
+        return None
+    try:
+        source = textwrap.dedent(inspect.getsource(fn))
+        tree = ast.parse(source)
+    except (OSError, TypeError, SyntaxError):
+        return None
+
+    node = tree.body[0] if len(tree.body) == 1 else None
+    if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) or node.name != fn.__name__:
+        return None
+    if any(_is_mangled(name) for name in identifiers(node)):
+        return None
+    ast.increment_lineno(tree, fn.__code__.co_firstlineno - 1)
+    node.decorator_list = []
+    return node
+
+
+def identifiers(node: ast.AST) -> Iterator[str]:
+    """Yields every name and attribute name used in ``node``."""
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            yield child.id
+        elif isinstance(child, ast.Attribute):
+            yield child.attr
+        elif isinstance(child, ast.arg):
+            yield child.arg
+
+
+def unique_prefix(node: ast.AST, prefix: str) -> str:
+    """Returns ``prefix`` (extended with underscores) such that no identifier in ``node`` starts
+    with it."""
+    names = set(identifiers(node))
+    while any(name.startswith(prefix) for name in names):
+        prefix += "_"
+    return prefix
+
+
+def recompile(fn: types.FunctionType, node: FunctionNode, env: dict[str, Any]) -> Any:
+    """Compiles the rewritten definition ``node`` of ``fn`` in the globals of ``fn``.
+
+    The names in ``env`` are made available to the new function as closure variables, so that the
+    module globals stay untouched. Defaults, annotations, docstring and attributes of ``fn`` are
+    copied to the new function.
+    """
+    factory = ast.FunctionDef(
+        name=_FACTORY,
+        args=ast.arguments(
+            posonlyargs=[],
+            args=[ast.arg(arg=name) for name in env],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        ),
+        body=[node, ast.Return(value=ast.Name(id=node.name, ctx=ast.Load()))],
+        decorator_list=[],
+    )
+    module = ast.Module(body=[factory], type_ignores=[])
+    ast.copy_location(factory, node)
+    ast.fix_missing_locations(module)
+
+    flags = 0
+    for feature in __future__.all_feature_names:
+        flag = getattr(__future__, feature).compiler_flag
+        if fn.__code__.co_flags & flag:
+            flags |= flag
+    code = compile(module, fn.__code__.co_filename, "exec", flags=flags, dont_inherit=True)
+
+    ns: dict[str, Any] = {}
+    exec(code, fn.__globals__, ns)
+    new = ns[_FACTORY](**env)
+    new.__defaults__ = fn.__defaults__
+    new.__kwdefaults__ = fn.__kwdefaults__
+    new.__annotations__ = fn.__annotations__
+    new.__doc__ = fn.__doc__
+    new.__module__ = fn.__module__
+    new.__qualname__ = fn.__qualname__
+    new.__dict__.update(fn.__dict__)
+    return new
+
+
+def _is_mangled(name: str) -> bool:
+    return name.startswith("__") and not name.endswith("__")
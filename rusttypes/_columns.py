@@ -0,0 +1,53 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Helpers shared by the column types of ``rusttypes.columnar`` and ``rusttypes.sparse``."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Final, Iterable, Optional, TypeVar
+
+C = TypeVar("C")
+
+SAME: Final = object()
+"""Default of ``typecode`` arguments, keeps the typecode of the source column."""
+
+
+def make_array(values: Iterable[Any], typecode: Optional[str]) -> Any:
+    """Creates an ``array.array`` for ``typecode`` from ``values``, a ``list`` if ``typecode`` is
+    ``None``."""
+    return list(values) if typecode is None else array(typecode, values)
+
+
+def unchecked(cls: type[C], **columns: Any) -> C:
+    """Creates an instance of ``cls`` from ``columns`` that are consistent already, without the
+    checks of its ``__init__``."""
+    instance = object.__new__(cls)
+    for name, column in columns.items():
+        setattr(instance, name, column)
+    return instance
@@ -0,0 +1,218 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Fusion of combinator chains into a single generated function.
+
+A chain is a sequence of ``(kind, op)`` steps, e.g. ``[("map", f), ("and_then", g)]``. The chain is
+compiled into one Python function per element: every step becomes one or two lines of straight
+code working on the raw contained value, the state (``Ok``/``Err`` or ``Some``/``Nil``) is tracked
+by the position in the generated code instead of wrapper objects. Only the final result is
+allocated, and where a step switches the state (``and_then``/``or_else``), the rest of the chain
+for the other state is a separate generated function, so the code grows linearly with the chain.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Final, NamedTuple, Sequence
+
+from .option import Nil, Some
+from .result import Err, Ok
+
+SKIP: Final = object()
+"""Returned by a fused chain for elements that are dropped (``filter_map``)."""
+
+STOP: Final = object()
+"""Returned by a fused chain for the element that ends the iteration (``take_while_*``)."""
+
+
+class _Family(NamedTuple):
+    rules: dict[tuple[str, bool], str]
+    """Action of a step kind in the present (``True``) or absent (``False``) state."""
+    present_end: str
+    absent_end: str
+    absent_has_value: bool
+    present_test: str
+    """Expression that is true if the result ``x`` of a step is present."""
+    absent_test: str
+    """Expression that is true if the result ``x`` of a step is absent."""
+
+
+RESULT: Final = _Family(
+    rules={
+        ("map", True): "assign",
+        ("map_err", False): "assign",
+        ("inspect", True): "call",
+        ("inspect_err", False): "call",
+        ("and_then", True): "branch",
+        ("or_else", False): "branch",
+        ("filter_map", True): "skip",
+        ("take_while_ok", False): "stop",
+    },
+    present_end="return Ok(x)",
+    absent_end="return Err(x)",
+    absent_has_value=True,
+    present_test="not x._discriminant",
+    absent_test="x._discriminant",
+)
+
+OPTION: Final = _Family(
+    rules={
+        ("map", True): "assign",
+        ("inspect", True): "call",
+        ("and_then", True): "branch",
+        ("or_else", False): "branch",
+        ("filter", True): "filter",
+        ("filter_map", True): "skip",
+        ("take_while_some", False): "stop",
+    },
+    present_end="return Some(x)",
+    absent_end="return Nil",
+    absent_has_value=False,
+    present_test="x._discriminant",
+    absent_test="not x._discriminant",
+)
+
+Steps = Sequence[tuple[str, Callable[..., Any]]]
+
+
+def kinds(family: _Family) -> frozenset[str]:
+    """Returns all step kinds supported by ``family``."""
+    return frozenset(kind for kind, _ in family.rules)
+
+
+def fuse(family: _Family, steps: Steps, entry: str) -> Callable[[Any], Any]:
+    """Compiles ``steps`` into one function of a single element.
+
+    Args:
+        family (_Family): ``RESULT`` or ``OPTION``.
+        steps (Steps): The ``(kind, op)`` steps of the chain.
+        entry (str): What the function is called with: ``"wrapped"`` for ``Result``/``Option``
+            values, ``"value"`` for raw values (in the present state) or ``"optional"`` for
+            ``Optional`` values, where ``None`` is the absent state.
+
+    Returns:
+        Callable[[Any], Any]: The fused chain, it returns the final ``Result``/``Option`` of an
+        element, ``SKIP`` or ``STOP``. Its generated source is available as ``__source__``.
+    """
+    return _Compiler(family, steps).compile(entry)
+
+
+class _Compiler:
+    __slots__ = ("family", "steps", "tails", "defs")
+
+    def __init__(self, family: _Family, steps: Steps) -> None:
+        for kind, _ in steps:
+            if kind not in kinds(family):
+                raise ValueError(f"unsupported step {kind!r}")
+        self.family = family
+        self.steps = list(steps)
+        self.tails: dict[tuple[int, bool], str] = {}
+        self.defs: list[list[str]] = []
+
+    def compile(self, entry: str) -> Callable[[Any], Any]:
+        f = self.family
+        if entry == "wrapped":
+            lines = [f"if {f.absent_test}:"]
+            if f.absent_has_value:
+                lines.append("    x = x.inner")
+            lines += _indent(self.body(0, False))
+            lines.append("x = x.inner")
+        elif entry == "optional":
+            lines = ["if x is None:", *_indent(self.body(0, False))]
+        elif entry == "value":
+            lines = []
+        else:
+            raise ValueError(f"unknown entry {entry!r}")
+        lines += self.body(0, True)
+
+        src = "\n".join(
+            line for fn in [["def fused(x):", *_indent(lines)], *self.defs] for line in fn
+        )
+        ns: dict[str, Any] = {"Ok": Ok, "Err": Err, "Some": Some, "Nil": Nil}
+        ns.update(SKIP=SKIP, STOP=STOP)
+        ns.update((f"op{k}", op) for k, (_, op) in enumerate(self.steps))
+        exec(compile(src, "<rusttypes fused chain>", "exec"), ns)
+        fused = ns["fused"]
+        fused.__source__ = src
+        return fused
+
+    def action(self, k: int, present: bool) -> str | None:
+        return self.family.rules.get((self.steps[k][0], present))
+
+    def body(self, k: int, present: bool) -> list[str]:
+        """Code of the steps ``k..`` in the given state, always ending in a ``return``."""
+        f = self.family
+        lines: list[str] = []
+        last = len(self.steps) - 1
+        for j in range(k, len(self.steps)):
+            action = self.action(j, present)
+            if action is None:
+                continue
+            arg = "x" if present or f.absent_has_value else ""
+            if action == "assign":
+                lines.append(f"x = op{j}(x)")
+            elif action == "call":
+                lines.append(f"op{j}(x)")
+            elif action == "stop":
+                lines.append("return STOP")
+                return lines
+            elif action == "skip":
+                lines += [f"x = op{j}(x)", "if not x._discriminant:", "    return SKIP"]
+                lines.append("x = x.inner")
+            elif action == "filter":
+                lines.append(f"if not op{j}(x):")
+                lines += _indent(self.jump(j + 1, False))
+            elif action == "branch":
+                if j == last:
+                    # the result of the last step is the final result
+                    lines.append(f"return op{j}({arg})")
+                    return lines
+                lines.append(f"x = op{j}({arg})")
+                lines.append(f"if {f.absent_test if present else f.present_test}:")
+                switched = not present
+                if switched or f.absent_has_value:
+                    lines.append("    x = x.inner")
+                lines += _indent(self.jump(j + 1, switched))
+                if present or f.absent_has_value:
+                    lines.append("x = x.inner")
+        lines.append(f.present_end if present else f.absent_end)
+        return lines
+
+    def jump(self, k: int, present: bool) -> list[str]:
+        """Code that continues with the steps ``k..`` in the given state."""
+        if all(self.action(j, present) is None for j in range(k, len(self.steps))):
+            return [self.family.present_end if present else self.family.absent_end]
+        key = (k, present)
+        if key not in self.tails:
+            name = f"_tail{k}_{'present' if present else 'absent'}"
+            self.tails[key] = name
+            self.defs.append([f"def {name}(x):", *_indent(self.body(k, present))])
+        return [f"return {self.tails[key]}(x)"]
+
+
+def _indent(lines: list[str]) -> list[str]:
+    return ["    " + line for line in lines]
@@ -0,0 +1,275 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Rewrites ``expr.try_()`` inside functions decorated with ``try_guard(optimize=True)`` into
+inline checks with an early ``return`` of the ``Err``.
+
+A call ``expr.try_()`` (without arguments) is hoisted out of its statement into::
+
+    <t> = expr
+    if <builtin type>(<t>) in <ok types>:
+        <t> = <t>.inner
+    elif <builtin type>(<t>) in <err types>:
+        return <t>
+    else:
+        <t> = <t>.try_()
+
+and replaced by ``<t>``. To keep the evaluation order of the statement, a call is only hoisted if
+nothing but constants, local variables and other hoisted calls is evaluated before it in the
+statement. Local variables that are not shared with nested functions can not be rebound by the
+hoisted call, every other load (globals like ``Ok``, attributes like ``p.pos``) may observe its
+side effects and therefore stops hoisting. Calls are never hoisted out of lambdas,
+comprehensions, conditional expressions, the right-hand side of ``and``/``or``, ``while``
+conditions, nested functions and classes, or the bodies of ``try`` and ``with`` statements, where
+an exception can be observed by the surrounding code.
+These keep raising ``ResultException``, which ``try_guard`` still catches.
+
+For ``on_error="continue"`` of ``try_guard`` and ``catch`` on generator functions, the body of
+every outermost loop of the generator is wrapped into::
+
+    try:
+        <body>
+    except <reraised exceptions>:
+        raise
+    except <caught exceptions> as <e>:
+        yield <to_err>(<e>)
+
+so that a failing iteration yields an ``Err`` and the loop continues with the next iteration.
+"""
+
+from __future__ import annotations
+
+import ast
+from typing import Any, Callable, Optional
+
+from . import _ast
+
+_SCOPES = (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+_OPAQUE = (
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.ClassDef,
+    ast.Try,
+    ast.TryStar,
+    ast.With,
+    ast.AsyncWith,
+)
+
+
+def hoist_try_calls(fn: Callable[..., Any], env: dict[str, Any]) -> Optional[Callable[..., Any]]:
+    """Returns ``fn`` with its ``try_`` calls rewritten, or ``None`` if ``fn`` can not be rewritten
+    or contains no call to rewrite. ``env`` must provide the closure variables
+    ``__rusttypes_ok__`` and ``__rusttypes_err__`` (the exact ``Ok`` and ``Err`` types) and
+    ``__rusttypes_type__`` (``builtins.type``, which the function may shadow)."""
+    node = _ast.parse_function(fn)
+    if node is None or _is_generator(node):
+        return None
+    code = fn.__code__
+    local_names = frozenset(code.co_varnames) - frozenset(code.co_cellvars)
+    hoister = _Hoister(_ast.unique_prefix(node, "_rt"), local_names)
+    node.body = hoister.block(node.body)
+    if not hoister.count:
+        return None
+    new = _ast.recompile(fn, node, env)
+    new.__rusttypes_source__ = ast.unparse(node)
+    return new
+
+
+def guard_loop_bodies(fn: Callable[..., Any], env: dict[str, Any]) -> Optional[Callable[..., Any]]:
+    """Returns ``fn`` with the bodies of its outermost loops wrapped in ``try`` statements, or
+    ``None`` if ``fn`` can not be rewritten or has no loop. ``env`` must provide the closure
+    variables ``__rusttypes_reraise__``, ``__rusttypes_exceptions__`` (tuples of exception types)
+    and ``__rusttypes_to_err__`` (the function mapping a caught exception to the yielded item)."""
+    node = _ast.parse_function(fn)
+    if node is None:
+        return None
+    name = _ast.unique_prefix(node, "_rt") + "e"
+    if not _guard_loops(node.body, name):
+        return None
+    new = _ast.recompile(fn, node, env)
+    new.__rusttypes_source__ = ast.unparse(node)
+    return new
+
+
+def _guard_loops(body: list[ast.stmt], name: str) -> int:
+    count = 0
+    for stmt in body:
+        if isinstance(stmt, (ast.For, ast.AsyncFor, ast.While)):
+            handler = ast.parse(
+                "try:\n"
+                "    pass\n"
+                "except __rusttypes_reraise__:\n"
+                "    raise\n"
+                f"except __rusttypes_exceptions__ as {name}:\n"
+                f"    yield __rusttypes_to_err__({name})\n"
+            ).body[0]
+            for child in ast.walk(handler):
+                if "lineno" in child._attributes:
+                    ast.copy_location(child, stmt)
+            handler.body = stmt.body
+            stmt.body = [handler]
+            count += 1
+        elif not isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            for field in ("body", "orelse", "finalbody"):
+                count += _guard_loops(getattr(stmt, field, []), name)
+            for handler in getattr(stmt, "handlers", []):
+                count += _guard_loops(handler.body, name)
+            for case in getattr(stmt, "cases", []):
+                count += _guard_loops(case.body, name)
+    return count
+
+
+def _is_generator(node: _ast.FunctionNode) -> bool:
+    """Whether the body of ``node`` (outside nested scopes) contains ``yield``."""
+    todo: list[ast.AST] = list(node.body)
+    while todo:
+        child = todo.pop()
+        if isinstance(child, (ast.Yield, ast.YieldFrom)):
+            return True
+        if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            todo.extend(ast.iter_child_nodes(child))
+    return False
+
+
+def _is_try_call(node: ast.AST) -> bool:
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == "try_"
+        and not node.args
+        and not node.keywords
+    )
+
+
+class _Hoister:
+    """Hoists the ``try_`` calls of the statements of a function body."""
+
+    def __init__(self, prefix: str, local_names: frozenset[str]) -> None:
+        self.prefix = prefix
+        self.local_names = local_names
+        self.count = 0
+        self.blocked = False
+        self.hoisted: list[ast.stmt] = []
+
+    def block(self, body: list[ast.stmt]) -> list[ast.stmt]:
+        return [new for stmt in body for new in self.statement(stmt)]
+
+    def statement(self, stmt: ast.stmt) -> list[ast.stmt]:
+        if isinstance(stmt, _OPAQUE):
+            return [stmt]
+        for name in ("body", "orelse"):
+            if isinstance(getattr(stmt, name, None), list):
+                setattr(stmt, name, self.block(getattr(stmt, name)))
+        if isinstance(stmt, ast.Match):
+            for case in stmt.cases:
+                case.body = self.block(case.body)
+
+        self.blocked = False
+        self.hoisted = []
+        if isinstance(stmt, (ast.Return, ast.Assign, ast.AnnAssign, ast.Expr)):
+            if stmt.value is not None:
+                stmt.value = self.expr(stmt.value)
+        elif isinstance(stmt, ast.AugAssign) and isinstance(stmt.target, ast.Name):
+            stmt.value = self.expr(stmt.value)
+        elif isinstance(stmt, ast.If):
+            stmt.test = self.expr(stmt.test)
+        elif isinstance(stmt, (ast.For, ast.AsyncFor)):
+            stmt.iter = self.expr(stmt.iter)
+        elif isinstance(stmt, ast.Match):
+            stmt.subject = self.expr(stmt.subject)
+        elif isinstance(stmt, ast.Raise) and stmt.exc is not None:
+            stmt.exc = self.expr(stmt.exc)
+        return [*self.hoisted, stmt]
+
+    def expr(self, node: ast.expr) -> ast.expr:
+        """Hoists the ``try_`` calls of ``node`` in evaluation order, until something with
+        possible side effects is evaluated before the next call, or something that may observe the
+        side effects of the next call."""
+        if self.blocked or self.is_stable(node):
+            return node
+        if _is_try_call(node):
+            return self.hoist(node)
+        if isinstance(node, _SCOPES):
+            self.blocked = True
+        elif isinstance(node, ast.BoolOp):
+            node.values[0] = self.expr(node.values[0])
+            self.blocked = True
+        elif isinstance(node, ast.IfExp):
+            node.test = self.expr(node.test)
+            self.blocked = True
+        elif isinstance(node, ast.Compare) and len(node.ops) > 1:
+            node.left = self.expr(node.left)
+            node.comparators[0] = self.expr(node.comparators[0])
+            self.blocked = True
+        elif isinstance(node, ast.Dict):
+            for k, (key, value) in enumerate(zip(node.keys, node.values, strict=True)):
+                if key is not None:
+                    node.keys[k] = self.expr(key)
+                node.values[k] = self.expr(value)
+            self.blocked = True
+        else:
+            for field, value in ast.iter_fields(node):
+                if isinstance(value, ast.expr):
+                    setattr(node, field, self.expr(value))
+                elif isinstance(value, list):
+                    for k, item in enumerate(value):
+                        if isinstance(item, ast.expr):
+                            value[k] = self.expr(item)
+                        elif isinstance(item, ast.keyword):
+                            item.value = self.expr(item.value)
+            self.blocked = True
+        return node
+
+    def is_stable(self, node: ast.expr) -> bool:
+        """Whether ``node`` is a constant or a local variable, whose value the hoisted calls can not
+        change."""
+        return isinstance(node, ast.Constant) or (
+            isinstance(node, ast.Name) and node.id in self.local_names
+        )
+
+    def hoist(self, call: Any) -> ast.expr:
+        attribute = call.func
+        attribute.value = self.expr(attribute.value)
+        name = f"{self.prefix}{self.count}"
+        self.count += 1
+        generated = ast.parse(
+            f"{name} = __rusttypes_receiver__\n"
+            f"if __rusttypes_type__({name}) in __rusttypes_ok__:\n"
+            f"    {name} = {name}.inner\n"
+            f"elif __rusttypes_type__({name}) in __rusttypes_err__:\n"
+            f"    return {name}\n"
+            f"else:\n"
+            f"    {name} = {name}.try_()\n"
+        ).body
+        for stmt in generated:
+            for child in ast.walk(stmt):
+                if "lineno" in child._attributes:
+                    ast.copy_location(child, call)
+        generated[0].value = attribute.value
+        self.hoisted += generated
+        self.blocked = False
+        return ast.copy_location(ast.Name(id=name, ctx=ast.Load()), call)
@@ -0,0 +1,439 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""``Result`` support for ``asyncio`` code.
+
+``AsyncResult`` wraps an awaitable that resolves to a ``Result`` and lets combinators be chained
+before it is awaited. Every callback may be a plain function or a coroutine function, and the whole
+chain runs in a single coroutine when the ``AsyncResult`` is awaited, without scheduling tasks.
+
+``gather_results``, ``settle_results`` and ``as_completed_results`` run awaitables that resolve to
+``Result`` values concurrently, optionally with bounded concurrency. ``gather_results`` stops at the
+first ``Err`` and cancels the awaitables that are still running. ``hedge`` is the ``asyncio``
+variant of ``rusttypes.parallel.hedge``.
+
+Examples::
+
+    >>> from rusttypes.aio import AsyncResult
+    >>> async def fetch_user(uid: int) -> Result[dict, str]: ...
+    >>> async def fetch_avatar(user: dict) -> Result[bytes, str]: ...
+    >>> avatar = await AsyncResult(fetch_user(1)).and_then(fetch_avatar).map(len)
+    Ok(1337)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generator,
+    Generic,
+    Optional,
+    Sequence,
+    TypeVar,
+    final,
+)
+
+from . import _delays
+from .misc import stringify
+from .parallel import HedgeStats
+from .result import Err, Ok, Result
+
+T = TypeVar("T")
+E = TypeVar("E")
+U = TypeVar("U")
+F = TypeVar("F")
+
+
+@final
+class AsyncResult(Generic[T, E]):
+    """Awaitable ``Result`` with combinators that accept sync and async callbacks.
+
+    An ``AsyncResult`` is immutable: every combinator returns a new ``AsyncResult`` sharing the
+    wrapped awaitable. Like a coroutine, the chain should be awaited only once.
+
+    Args:
+        awaitable (Awaitable[Result[T, E]]): The awaitable that resolves to the ``Result``.
+
+    Examples::
+
+        >>> await AsyncResult(fetch(1)).map(lambda x: x + 1)
+        Ok(2)
+    """
+
+    __slots__ = ("_awaitable", "_steps")
+
+    def __init__(self, awaitable: Awaitable[Result[T, E]]) -> None:
+        self._awaitable = awaitable
+        self._steps: tuple[tuple[str, Callable[[Any], Any]], ...] = ()
+
+    @staticmethod
+    def from_result(result: Result[T, E]) -> AsyncResult[T, E]:
+        """Returns an ``AsyncResult`` of an already available ``Result``.
+
+        Args:
+            result (Result[T, E]): The result.
+
+        Returns:
+            AsyncResult[T, E]: The ``AsyncResult`` resolving to ``result``.
+
+        Examples::
+
+            >>> await AsyncResult.from_result(Ok(1)).map(str)
+            Ok(1)
+        """
+        return AsyncResult(_ready(result))
+
+    def map(self, op: Callable[[T], U] | Callable[[T], Awaitable[U]]) -> AsyncResult[U, E]:
+        """Appends ``map(op)`` to the chain, see ``Result.map``."""
+        return self._then("map", op)
+
+    def map_err(self, op: Callable[[E], F] | Callable[[E], Awaitable[F]]) -> AsyncResult[T, F]:
+        """Appends ``map_err(op)`` to the chain, see ``Result.map_err``."""
+        return self._then("map_err", op)
+
+    def and_then(self, op: Callable[[T], Any]) -> AsyncResult[Any, E]:
+        """Appends ``and_then(op)`` to the chain, see ``Result.and_then``. ``op`` returns a
+        ``Result`` or an awaitable of a ``Result``."""
+        return self._then("and_then", op)
+
+    def or_else(self, op: Callable[[E], Any]) -> AsyncResult[T, Any]:
+        """Appends ``or_else(op)`` to the chain, see ``Result.or_else``. ``op`` returns a
+        ``Result`` or an awaitable of a ``Result``."""
+        return self._then("or_else", op)
+
+    def inspect(self, op: Callable[[T], Any]) -> AsyncResult[T, E]:
+        """Appends ``inspect(op)`` to the chain, see ``Result.inspect``."""
+        return self._then("inspect", op)
+
+    def inspect_err(self, op: Callable[[E], Any]) -> AsyncResult[T, E]:
+        """Appends ``inspect_err(op)`` to the chain, see ``Result.inspect_err``."""
+        return self._then("inspect_err", op)
+
+    def __await__(self) -> Generator[Any, None, Result[T, E]]:
+        return self._run().__await__()
+
+    def __repr__(self) -> str:
+        steps = "".join(
+            f".{kind}({getattr(op, '__qualname__', repr(op))})" for kind, op in self._steps
+        )
+        return f"AsyncResult({self._awaitable!r}){steps}"
+
+    def _then(self, kind: str, op: Callable[[Any], Any]) -> AsyncResult[Any, Any]:
+        new: AsyncResult[Any, Any] = AsyncResult(self._awaitable)
+        new._steps = self._steps + ((kind, op),)
+        return new
+
+    async def _run(self) -> Result[T, E]:
+        result = await self._awaitable
+        for kind, op in self._steps:
+            if not result._discriminant:
+                if kind == "map":
+                    value = op(result.inner)
+                    result = Ok(await value if inspect.isawaitable(value) else value)
+                elif kind == "and_then":
+                    result = op(result.inner)
+                    if inspect.isawaitable(result):
+                        result = await result
+                elif kind == "inspect":
+                    value = op(result.inner)
+                    if inspect.isawaitable(value):
+                        await value
+            elif kind == "map_err":
+                value = op(result.inner)
+                result = Err(await value if inspect.isawaitable(value) else value)
+            elif kind == "or_else":
+                result = op(result.inner)
+                if inspect.isawaitable(result):
+                    result = await result
+            elif kind == "inspect_err":
+                value = op(result.inner)
+                if inspect.isawaitable(value):
+                    await value
+        return result
+
+
+async def _ready(result: Result[T, E]) -> Result[T, E]:
+    return result
+
+
+async def gather_results(
+    *aws: Awaitable[Result[T, E]], fail_fast: bool = True, limit: Optional[int] = None
+) -> Result[list[T], E]:
+    """Runs the awaitables concurrently and collects their ``Ok`` values, like ``Result.collect``.
+
+    With ``fail_fast``, the first ``Err`` (in completion order) is returned as soon as it arrives
+    and the awaitables that are still running are cancelled. Otherwise all awaitables run to
+    completion and the first ``Err`` in input order is returned. An exception raised by an
+    awaitable cancels the others and is propagated.
+
+    Args:
+        *aws (Awaitable[Result[T, E]]): The awaitables.
+        fail_fast (bool): Whether to stop at the first ``Err``. Defaults to ``True``.
+        limit (Optional[int]): The maximum number of awaitables running at the same time, or
+            ``None`` for no limit. Defaults to ``None``.
+
+    Returns:
+        Result[list[T], E]: ``Ok`` with the values in input order, or the ``Err``.
+
+    Raises:
+        ValueError: If ``limit`` is smaller than 1.
+
+    Examples::
+
+        >>> await gather_results(fetch(1), fetch(2), limit=8)
+        Ok([1, 2])
+
+        >>> await gather_results(fetch(1), fetch(-1), fetch_slowly(2))
+        Err("negative")
+    """
+    tasks = _start(aws, limit)
+    try:
+        if not fail_fast:
+            results = await asyncio.gather(*tasks)
+            for result in results:
+                if result._discriminant:
+                    return result
+            return Ok([result.inner for result in results])
+
+        if tasks:
+            err = await _first_err(tasks)
+            if err is not None:
+                return err
+        return Ok([task.result().inner for task in tasks])
+    finally:
+        await _cancel(tasks)
+
+
+async def settle_results(
+    *aws: Awaitable[Result[T, E]],
+    limit: Optional[int] = None,
+    map_err: Callable[[BaseException], E] = stringify,
+) -> list[Result[T, E]]:
+    """Runs the awaitables concurrently until all of them are settled and returns their results in
+    input order. An exception raised by an awaitable becomes an ``Err``, mapped with ``map_err``
+    like in ``rusttypes.result.catch``.
+
+    Args:
+        *aws (Awaitable[Result[T, E]]): The awaitables.
+        limit (Optional[int]): The maximum number of awaitables running at the same time, or
+            ``None`` for no limit. Defaults to ``None``.
+        map_err (Callable[[BaseException], E]): The function to map a raised exception to the
+            error type. Defaults to ``rusttypes.misc.stringify``.
+
+    Returns:
+        list[Result[T, E]]: The results in input order.
+
+    Raises:
+        ValueError: If ``limit`` is smaller than 1.
+
+    Examples::
+
+        >>> await settle_results(fetch(1), fetch(-1), raise_error())
+        [Ok(1), Err(negative), Err(boom)]
+    """
+    tasks = _start(aws, limit)
+    try:
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await _cancel(tasks)
+    return [
+        Err(map_err(outcome)) if isinstance(outcome, BaseException) else outcome
+        for outcome in outcomes
+    ]
+
+
+async def as_completed_results(
+    *aws: Awaitable[Result[T, E]], limit: Optional[int] = None
+) -> AsyncIterator[tuple[int, Result[T, E]]]:
+    """Runs the awaitables concurrently and yields ``(index, result)`` pairs in completion order,
+    where ``index`` is the position of the awaitable in ``aws``. Closing the iterator early (e.g.
+    with ``break``) cancels the awaitables that are still running. An exception raised by an
+    awaitable is propagated.
+
+    Args:
+        *aws (Awaitable[Result[T, E]]): The awaitables.
+        limit (Optional[int]): The maximum number of awaitables running at the same time, or
+            ``None`` for no limit. Defaults to ``None``.
+
+    Yields:
+        tuple[int, Result[T, E]]: The index of the awaitable and its result.
+
+    Raises:
+        ValueError: If ``limit`` is smaller than 1.
+
+    Examples::
+
+        >>> async for index, result in as_completed_results(fetch_slowly(1), fetch(2)):
+        ...     print(index, result)
+        1 Ok(2)
+        0 Ok(1)
+    """
+    tasks = _start(aws, limit)
+    done: asyncio.Queue[int] = asyncio.Queue()
+    for index, task in enumerate(tasks):
+        task.add_done_callback(lambda _, index=index: done.put_nowait(index))
+    try:
+        for _ in range(len(tasks)):
+            index = await done.get()
+            yield index, tasks[index].result()
+    finally:
+        await _cancel(tasks)
+
+
+async def hedge(
+    fn: Callable[[], Awaitable[Any]],
+    delays: Sequence[float],
+    stats: Optional[HedgeStats] = None,
+    err_t: type[BaseException] | tuple[type[BaseException], ...] = Exception,
+) -> Result[Any, list[Any]]:
+    """Awaits ``fn()`` with hedging, see ``rusttypes.parallel.hedge``. Every attempt runs in its own
+    task, the attempts that are still running when the result is known are cancelled.
+
+    Args:
+        fn (Callable[[], Awaitable[Any]]): The coroutine function to hedge.
+        delays (Sequence[float]): The non-decreasing start times of the additional attempts, in
+            seconds after the start of the call.
+        stats (Optional[HedgeStats]): Counters to update. Defaults to ``None``.
+        err_t (type[BaseException] | tuple[type[BaseException], ...]): The exceptions to turn into
+            ``Err``. Defaults to ``Exception``.
+
+    Returns:
+        Result[Any, list[Any]]: The first ``Ok``, or ``Err`` with the errors of all attempts in
+            attempt order.
+
+    Raises:
+        ValueError: If ``delays`` is negative or decreasing.
+
+    Examples::
+
+        >>> await hedge(lambda: fetch("/users/1"), delays=[0.05, 0.2])
+        Ok({'id': 1})
+    """
+    _delays.check_delays(delays)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    attempts = [asyncio.ensure_future(_attempt(fn, err_t))]
+    running = {attempts[0]: 0}
+    errors: dict[int, Any] = {}
+    winner: Optional[int] = None
+    try:
+        while True:
+            timeout: Optional[float] = None
+            if len(attempts) <= len(delays):
+                timeout = max(0.0, start + delays[len(attempts) - 1] - loop.time())
+            done, _ = await asyncio.wait(
+                running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in sorted(done, key=running.__getitem__):
+                index = running.pop(task)
+                result = task.result()
+                if not result._discriminant:
+                    winner = index
+                    return result
+                errors[index] = result.inner
+            if len(attempts) <= len(delays) and (not done or not running):
+                task = asyncio.ensure_future(_attempt(fn, err_t))
+                running[task] = len(attempts)
+                attempts.append(task)
+            elif not running:
+                return Err([errors[index] for index in range(len(attempts))])
+    finally:
+        for task in running:
+            task.cancel()
+        if stats is not None:
+            stats.record(len(attempts) - 1, winner is not None and winner > 0)
+
+
+async def _attempt(
+    fn: Callable[[], Awaitable[Any]], err_t: type[BaseException] | tuple[type[BaseException], ...]
+) -> Result[Any, Any]:
+    try:
+        value = await fn()
+    except err_t as e:
+        return Err(e)
+    return value if isinstance(value, Result) else Ok(value)
+
+
+def _start(aws: tuple[Awaitable[Any], ...], limit: Optional[int]) -> list[asyncio.Future[Any]]:
+    if limit is None:
+        return [asyncio.ensure_future(aw) for aw in aws]
+    if limit < 1:
+        raise ValueError(f"limit must be at least 1, not {limit}")
+    semaphore = asyncio.Semaphore(limit)
+    return [asyncio.ensure_future(_limited(semaphore, aw)) for aw in aws]
+
+
+async def _limited(semaphore: asyncio.Semaphore, aw: Awaitable[T]) -> T:
+    try:
+        await semaphore.acquire()
+    except BaseException:
+        # cancelled before it could start, close the coroutine to not leave it unawaited
+        if inspect.iscoroutine(aw):
+            aw.close()
+        raise
+    try:
+        return await aw
+    finally:
+        semaphore.release()
+
+
+async def _first_err(tasks: list[asyncio.Future[Any]]) -> Any:
+    """Waits until all tasks are done or one of them returned an ``Err`` or raised, with a single
+    done callback per task. Returns the ``Err`` or ``None``."""
+    finished = asyncio.get_running_loop().create_future()
+    remaining = len(tasks)
+
+    def on_done(task: asyncio.Future[Any]) -> None:
+        nonlocal remaining
+        remaining -= 1
+        if finished.done():
+            return
+        if task.cancelled():
+            finished.cancel()
+        elif task.exception() is not None:
+            finished.set_exception(task.exception())
+        elif task.result()._discriminant:
+            finished.set_result(task.result())
+        elif not remaining:
+            finished.set_result(None)
+
+    for task in tasks:
+        task.add_done_callback(on_done)
+    return await finished
+
+
+async def _cancel(tasks: list[asyncio.Future[Any]]) -> None:
+    pending = [task for task in tasks if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
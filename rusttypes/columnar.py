@@ -0,0 +1,886 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Columnar storage of many ``Option`` and ``Result`` values.
+
+An ``OptionArray`` stores a sequence of ``Option`` values as one contiguous buffer of the contained
+values plus a validity bitmap, instead of one ``Some``/``Nil`` object per element. Bit ``i`` of the
+bitmap (least significant bit first, as in the Arrow columnar format) is set if element ``i`` is
+``Some``; the value of a ``Nil`` slot is unspecified.
+
+The value buffer is a NumPy array if NumPy is installed, an ``array.array`` otherwise, or a plain
+``list`` for arbitrary Python objects (``typecode=None``). Combinators work on the whole column at
+once and never create ``Some``/``Nil`` objects, bitmap operations (``and_``, ``zip``, counts) run
+on the bitmap as a whole.
+
+Typed buffers follow the Arrow columnar layout of a primitive array, so they can be handed to other
+libraries without copying: ``buffers`` exposes the validity bitmap and the value buffer through the
+buffer protocol (``memoryview``), ``from_buffers`` wraps any such pair again. ``to_arrow`` and
+``from_arrow`` convert from and to ``pyarrow`` arrays, if ``pyarrow`` is installed.
+
+A ``ResultArray`` stores ``Ok`` values the same way (the bitmap marks the ``Ok`` elements) and the
+errors in a sparse ``index -> error`` mapping, so that its size beyond the value buffer grows with
+the number of errors instead of the number of elements.
+
+Examples::
+
+    >>> from rusttypes.columnar import OptionArray
+    >>> arr = OptionArray.from_optionals([1, None, 3], typecode="q")
+    >>> arr.map(lambda x: x * 2).to_optionals()
+    [2, None, 6]
+
+    >>> arr.count_some()
+    2
+
+    >>> from rusttypes.result import Err, Ok
+    >>> ResultArray.from_results([Ok(1), Err("e"), Ok(3)]).partition()
+    ([1, 3], ['e'])
+"""
+
+from __future__ import annotations
+
+from array import array
+from itertools import compress
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Final,
+    Generic,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    TypeVar,
+    final,
+)
+
+from . import _columns
+from .option import Nil, Option, Some
+from .result import Err, Ok, Result
+
+try:
+    import numpy as _np
+except ImportError:  # pragma: no cover - depends on the environment
+    _np = None
+
+T = TypeVar("T")
+U = TypeVar("U")
+E = TypeVar("E")
+F = TypeVar("F")
+
+HAS_NUMPY: Final = _np is not None
+"""Whether value buffers with a typecode are stored as NumPy arrays."""
+
+_TO_BITS: Final = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_BITS: Final = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _pack(mask: bytes, n: int) -> bytes:
+    """Packs one ``0``/``1`` byte per element into an LSB first bitmap of ``n`` bits."""
+    if not n:
+        return b""
+    return int(mask[::-1].translate(_TO_BITS), 2).to_bytes((n + 7) // 8, "little")
+
+
+def _unpack(validity: bytes, n: int) -> bytes:
+    """Expands an LSB first bitmap of ``n`` bits into one ``0``/``1`` byte per element."""
+    if not n:
+        return b""
+    bits = format(int.from_bytes(validity, "little"), f"0{n}b")
+    return bits[::-1].encode().translate(_FROM_BITS)
+
+
+def _bitmap_and(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, "little") & int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+def _make_values(values: Iterable[Any], typecode: Optional[str]) -> Any:
+    """Creates a value buffer for ``typecode`` from ``values``.
+
+    NumPy buffers reject lossy conversions like ``array.array`` does: floating point values in an
+    integer buffer raise a ``TypeError``, integers out of the range of the buffer an
+    ``OverflowError``.
+    """
+    if typecode is None or _np is None:
+        return _columns.make_array(values, typecode)
+
+    source = _np.asarray(values if isinstance(values, (list, _np.ndarray)) else list(values))
+    if source.dtype.char == typecode:
+        return source
+    target = _np.dtype(typecode)
+    if not source.size:
+        return source.astype(target)
+    if source.dtype.kind not in "biuO" and not (source.dtype.kind == target.kind == "f"):
+        raise TypeError(f"can not store {source.dtype} values with typecode {typecode!r}")
+    buffer = source.astype(target)
+    if target.kind in "biu" and not _np.array_equal(buffer, source):
+        raise OverflowError(f"values out of range for typecode {typecode!r}")
+    return buffer
+
+
+def _typecode_of(values: Any) -> Optional[str]:
+    """Returns the typecode of a value buffer, ``None`` if it stores arbitrary Python objects."""
+    if isinstance(values, array):
+        return values.typecode
+    if isinstance(values, memoryview) and len(values.format) == 1:
+        return values.format
+    if _np is not None and isinstance(values, _np.ndarray) and values.dtype != object:
+        return values.dtype.char
+    return None
+
+
+def _arrow_type(pa: Any, typecode: Optional[str]) -> Any:
+    """Returns the ``pyarrow`` type of the values of a buffer for ``typecode``."""
+    if typecode in ("f", "d"):
+        return pa.float32() if typecode == "f" else pa.float64()
+    if typecode is not None and typecode in "bBhHiIlLqQ":
+        bits = array(typecode).itemsize * 8
+        return getattr(pa, f"{'int' if typecode.islower() else 'uint'}{bits}")()
+    raise TypeError(f"typecode {typecode!r} has no Arrow primitive type")
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("converting from and to Arrow arrays requires pyarrow") from e
+    return pyarrow
+
+
+def _fill(typecode: Optional[str]) -> Any:
+    """Returns the placeholder value stored in the ``Nil`` slots of a buffer for ``typecode``."""
+    return None if typecode is None else 0
+
+
+def _result_typecode(values: list[Any], typecode: Optional[str]) -> Optional[str]:
+    """Returns the typecode for the results ``values`` of an op on a buffer of ``typecode``,
+    promoted like NumPy does: ``int`` results keep ``typecode``, ``float`` results need a floating
+    point typecode and any other results are stored as Python objects."""
+    if typecode is None:
+        return None
+    types = set(map(type, values))
+    if types <= {int}:
+        return typecode
+    if types <= {int, float}:
+        return typecode if typecode in "fd" else "d"
+    return None
+
+
+@final
+class OptionArray(Generic[T]):
+    """Immutable sequence of ``Option`` values, stored as a value buffer and a validity bitmap.
+
+    ``OptionArray`` is usually created with ``from_options`` or ``from_optionals``. The constructor
+    takes the raw buffers: ``values`` must be a NumPy array, an ``array.array``, a ``memoryview``
+    or a ``list`` and ``validity`` a bitmap with at least ``len(values)`` bits (unused trailing bits
+    are ignored). Buffers are shared between arrays and never modified, combinators always return
+    new arrays.
+
+    Args:
+        values (Any): The value buffer, one value per element.
+        validity (bytes): LSB first bitmap, bit ``i`` is set if element ``i`` is ``Some``.
+        typecode (Optional[str]): The ``array`` typecode (or NumPy dtype character) of the values,
+            ``None`` for arbitrary Python objects. Defaults to the typecode of ``values``.
+
+    Examples::
+
+        >>> OptionArray([1, 2, 3], b"\\x05")
+        OptionArray([Some(1), Nil, Some(3)], typecode=None)
+    """
+
+    __slots__ = ("_values", "_validity", "_typecode")
+
+    def __init__(self, values: Any, validity: bytes, typecode: Optional[str] = None) -> None:
+        n = len(values)
+        nbytes = (n + 7) // 8
+        if len(validity) < nbytes:
+            raise ValueError(f"validity bitmap has {len(validity) * 8} bits, need {n}")
+        validity = bytes(validity[:nbytes])
+        if n % 8:
+            # keep unused bits cleared, so that counts can work on the bitmap as a whole
+            validity = validity[:-1] + bytes([validity[-1] & ((1 << (n % 8)) - 1)])
+
+        current = _typecode_of(values)
+        if typecode is None:
+            typecode = current
+            if current is None and not isinstance(values, list):
+                values = list(values)
+        elif typecode != current:
+            values = _make_values(values, typecode)
+
+        self._values = values
+        self._validity = validity
+        self._typecode = typecode
+
+    @staticmethod
+    def from_options(
+        options: Iterable[Option[T]], typecode: Optional[str] = None
+    ) -> OptionArray[T]:
+        """Creates an ``OptionArray`` from ``Option`` values.
+
+        Args:
+            options (Iterable[Option[T]]): The options to store.
+            typecode (Optional[str]): The ``array`` typecode of the contained values, e.g. ``"q"``
+                or ``"d"``, ``None`` for arbitrary Python objects. Defaults to ``None``.
+
+        Returns:
+            OptionArray[T]: The stored options.
+
+        Examples::
+
+            >>> OptionArray.from_options([Some(1), Nil], typecode="q")
+            OptionArray([Some(1), Nil], typecode='q')
+        """
+        fill = _fill(typecode)
+        values: list[Any] = []
+        mask = bytearray()
+        append_value = values.append
+        append_mask = mask.append
+        for opt in options:
+            if opt._discriminant:
+                append_value(opt.inner)
+                append_mask(1)
+            else:
+                append_value(fill)
+                append_mask(0)
+        return OptionArray(_make_values(values, typecode), _pack(mask, len(values)), typecode)
+
+    @staticmethod
+    def from_optionals(
+        values: Iterable[Optional[T]], typecode: Optional[str] = None
+    ) -> OptionArray[T]:
+        """Creates an ``OptionArray`` from ``Optional`` values, where ``None`` is ``Nil``.
+
+        Args:
+            values (Iterable[Optional[T]]): The values to store.
+            typecode (Optional[str]): The ``array`` typecode of the contained values, e.g. ``"q"``
+                or ``"d"``, ``None`` for arbitrary Python objects. Defaults to ``None``.
+
+        Returns:
+            OptionArray[T]: The stored values.
+
+        Examples::
+
+            >>> OptionArray.from_optionals([1.5, None], typecode="d")
+            OptionArray([Some(1.5), Nil], typecode='d')
+        """
+        values = list(values)
+        mask = bytes([v is not None for v in values])
+        if typecode is not None:
+            values = [0 if v is None else v for v in values]
+        return OptionArray(_make_values(values, typecode), _pack(mask, len(values)), typecode)
+
+    @property
+    def typecode(self) -> Optional[str]:
+        """The typecode of the value buffer, ``None`` if it stores arbitrary Python objects."""
+        return self._typecode
+
+    def to_options(self) -> list[Option[T]]:
+        """Returns the elements as a list of ``Some``/``Nil``.
+
+        Examples::
+
+            >>> OptionArray.from_optionals([1, None]).to_options()
+            [Some(1), Nil]
+        """
+        return list(self)
+
+    def to_optionals(self) -> list[Optional[T]]:
+        """Returns the elements as a list of ``Optional`` values, where ``Nil`` is ``None``.
+
+        Examples::
+
+            >>> OptionArray.from_options([Some(1), Nil]).to_optionals()
+            [1, None]
+        """
+        return [v if m else None for v, m in zip(self._values_list(), self._mask(), strict=True)]
+
+    def count_some(self) -> int:
+        """Returns the number of ``Some`` elements.
+
+        Examples::
+
+            >>> OptionArray.from_optionals([1, None, 3]).count_some()
+            2
+        """
+        return int.from_bytes(self._validity, "little").bit_count()
+
+    def count_nil(self) -> int:
+        """Returns the number of ``Nil`` elements.
+
+        Examples::
+
+            >>> OptionArray.from_optionals([1, None, 3]).count_nil()
+            1
+        """
+        return len(self) - self.count_some()
+
+    def map(
+        self, op: Callable[[T], U], typecode: Any = _columns.SAME, vectorized: bool = False
+    ) -> OptionArray[U]:
+        """Maps the values of all ``Some`` elements with ``op``, ``Nil`` elements stay ``Nil``.
+
+        With ``vectorized=True``, ``op`` is called once with the whole value buffer and must return
+        a buffer of the same length (e.g. ``lambda x: x * 2`` or a NumPy ufunc). This only applies
+        if the buffer is a NumPy array, otherwise ``op`` is called per element. ``op`` then also
+        sees the unspecified values of ``Nil`` slots, NumPy floating point warnings are suppressed.
+
+        Args:
+            op (Callable[[T], U]): The function to apply.
+            typecode (Optional[str]): The typecode of the result. Defaults to the typecode of this
+                array; for vectorized calls the type of the results of ``op``, also if ``op`` is
+                called per element.
+            vectorized (bool): Whether ``op`` works on whole NumPy arrays. Defaults to ``False``.
+
+        Returns:
+            OptionArray[U]: The mapped elements.
+
+        Raises:
+            TypeError: If the results can not be stored with ``typecode`` without loss, e.g.
+                floating point values with an integer typecode.
+
+        Examples::
+
+            >>> OptionArray.from_optionals([1, None], typecode="q").map(str, typecode=None)
+            OptionArray([Some(1), Nil], typecode=None)
+        """
+        if vectorized and self._is_numpy():
+            with _np.errstate(all="ignore"):
+                values = _np.asarray(op(self._values))
+            if len(values) != len(self):
+                raise ValueError(f"vectorized op returned {len(values)} values, need {len(self)}")
+            if typecode is not _columns.SAME:
+                return OptionArray(_make_values(values.tolist(), typecode), self._validity)
+            if values.dtype == object:
+                return OptionArray(values.tolist(), self._validity)
+            return OptionArray(values, self._validity)
+
+        if typecode is _columns.SAME and not vectorized:
+            typecode = self._typecode
+        fill = _fill(self._typecode if typecode is _columns.SAME else typecode)
+        values = [
+            op(v) if m else fill for v, m in zip(self._values_list(), self._mask(), strict=True)
+        ]
+        if typecode is _columns.SAME:
+            typecode = _result_typecode(values, self._typecode)
+        return OptionArray(_make_values(values, typecode), self._validity, typecode)
+
+    def filter(self, predicate: Callable[[T], bool], vectorized: bool = False) -> OptionArray[T]:
+        """Turns all ``Some`` elements, for which ``predicate`` returns ``False``, into ``Nil``.
+
+        Args:
+            predicate (Callable[[T], bool]): The predicate to check the values against.
+            vectorized (bool): Whether ``predicate`` works on whole NumPy arrays (see ``map``).
+                Defaults to ``False``.
+
+        Returns:
+            OptionArray[T]: The filtered elements, sharing the value buffer with this array.
+
+        Examples::
+
+            >>> arr = OptionArray.from_optionals([1, None, 4])
+            >>> arr.filter(lambda x: x % 2 == 0).to_optionals()
+            [None, None, 4]
+        """
+        n = len(self)
+        if vectorized and self._is_numpy():
+            with _np.errstate(all="ignore"):
+                keep = _np.asarray(predicate(self._values), dtype=bool)
+            if len(keep) != n:
+                raise ValueError(f"vectorized predicate returned {len(keep)} values, need {n}")
+            mask = _np.packbits(keep, bitorder="little").tobytes()
+        else:
+            keep = [
+                m and bool(predicate(v))
+                for v, m in zip(self._values_list(), self._mask(), strict=True)
+            ]
+            mask = _pack(bytes(keep), n)
+        return OptionArray(self._values, _bitmap_and(self._validity, mask), self._typecode)
+
+    def unwrap_or(self, default: T) -> Any:
+        """Returns the value buffer with the values of all ``Nil`` elements replaced by
+        ``default``.
+
+        Args:
+            default (T): The value for ``Nil`` elements.
+
+        Returns:
+            Any: A NumPy array, ``array.array`` or ``list``, like the value buffer.
+
+        Examples::
+
+            >>> OptionArray.from_optionals([1, None], typecode="q").unwrap_or(0).tolist()
+            [1, 0]
+        """
+        if self._is_numpy():
+            values = _np.where(_np.frombuffer(self._mask(), dtype=bool), self._values, default)
+            return _make_values(values, self._typecode)
+        values = [
+            v if m else default for v, m in zip(self._values_list(), self._mask(), strict=True)
+        ]
+        return _make_values(values, self._typecode)
+
+    def zip(self, other: OptionArray[U]) -> OptionArray[tuple[T, U]]:
+        """Zips this array with ``other``, elementwise like ``Option.zip``.
+
+        Args:
+            other (OptionArray[U]): An array of the same length.
+
+        Returns:
+            OptionArray[tuple[T, U]]: ``Some((a, b))`` where both elements are ``Some``, ``Nil``
+            otherwise. The values are stored as Python objects.
+
+        Examples::
+
+            >>> a = OptionArray.from_optionals([1, None, 3])
+            >>> a.zip(OptionArray.from_optionals(["a", "b", None])).to_optionals()
+            [(1, 'a'), None, None]
+        """
+        validity = _bitmap_and(self._validity, self._check_len(other)._validity)
+        mask = _unpack(validity, len(self))
+        values = [
+            (a, b) if m else None
+            for a, b, m in zip(self._values_list(), other._values_list(), mask, strict=True)
+        ]
+        return OptionArray(values, validity)
+
+    def and_(self, other: OptionArray[U]) -> OptionArray[U]:
+        """Elementwise ``Option.and_``: the element of ``other`` where this array is ``Some``,
+        ``Nil`` otherwise.
+
+        Args:
+            other (OptionArray[U]): An array of the same length.
+
+        Returns:
+            OptionArray[U]: The combined elements, sharing the value buffer with ``other``.
+
+        Examples::
+
+            >>> a = OptionArray.from_optionals([1, None, 3])
+            >>> a.and_(OptionArray.from_optionals(["a", "b", None])).to_optionals()
+            ['a', None, None]
+        """
+        validity = _bitmap_and(self._validity, self._check_len(other)._validity)
+        return OptionArray(other._values, validity, other._typecode)
+
+    @staticmethod
+    def from_buffers(
+        values: Any, validity: Optional[Any], typecode: str, length: Optional[int] = None
+    ) -> OptionArray[Any]:
+        """Creates an ``OptionArray`` from a value buffer and a validity bitmap in the Arrow layout
+        without copying the values.
+
+        The values are used as NumPy array (if NumPy is installed) or ``memoryview`` of
+        ``values``, which must stay unchanged while the array is in use.
+
+        Args:
+            values (Any): An object supporting the buffer protocol, holding the values.
+            validity (Optional[Any]): An object supporting the buffer protocol, holding the LSB
+                first validity bitmap, or ``None`` if all elements are ``Some``.
+            typecode (str): The ``array`` typecode of the values.
+            length (Optional[int]): The number of elements. Defaults to the size of ``values``.
+
+        Returns:
+            OptionArray[Any]: The elements of the buffers.
+
+        Examples::
+
+            >>> arr = OptionArray.from_optionals([1, None, 3], typecode="q")
+            >>> validity, values = arr.buffers()
+            >>> OptionArray.from_buffers(values, validity, "q").to_optionals()
+            [1, None, 3]
+        """
+        view = memoryview(values).cast("B")
+        if length is not None:
+            view = view[: length * array(typecode).itemsize]
+        view = view.cast(typecode)
+        n = len(view)
+        if validity is None:
+            validity = b"\xff" * ((n + 7) // 8)
+        if _np is not None:
+            return OptionArray(_np.frombuffer(view, dtype=typecode), validity)
+        return OptionArray(view, validity)
+
+    @staticmethod
+    def from_arrow(arr: Any) -> OptionArray[Any]:
+        """Creates an ``OptionArray`` from a ``pyarrow`` array of a primitive integer or floating
+        point type, sharing its value buffer. Requires ``pyarrow``.
+
+        Args:
+            arr (pyarrow.Array): The array to convert.
+
+        Returns:
+            OptionArray[Any]: The elements of ``arr``, ``Nil`` for every null.
+
+        Examples::
+
+            >>> import pyarrow as pa
+            >>> OptionArray.from_arrow(pa.array([1, None, 3])).to_optionals()
+            [1, None, 3]
+        """
+        pa = _import_pyarrow()
+        typecode = next(
+            (tc for tc in "bBhHiIqQfd" if _arrow_type(pa, tc) == arr.type),
+            None,
+        )
+        if typecode is None:
+            raise TypeError(f"Arrow type {arr.type} is not a primitive integer or float type")
+        validity, values = arr.buffers()
+        n, offset = len(arr), arr.offset
+        itemsize = array(typecode).itemsize
+        values = memoryview(values).cast("B")[offset * itemsize : (offset + n) * itemsize]
+        if validity is not None and offset:
+            bits = int.from_bytes(validity, "little") >> offset
+            validity = (bits & ((1 << n) - 1)).to_bytes((n + 7) // 8, "little")
+        return OptionArray.from_buffers(values, validity, typecode)
+
+    def buffers(self) -> tuple[memoryview, memoryview]:
+        """Returns the validity bitmap and the value buffer in the Arrow layout, without copying.
+
+        Returns:
+            tuple[memoryview, memoryview]: The read-only LSB first validity bitmap and the values,
+            formatted with the typecode of this array.
+
+        Raises:
+            TypeError: If the values are arbitrary Python objects (``typecode`` is ``None``).
+
+        Examples::
+
+            >>> validity, values = OptionArray.from_optionals([1, None], typecode="q").buffers()
+            >>> bytes(validity), values.tolist()
+            (b'\\x01', [1, 0])
+        """
+        if self._typecode is None:
+            raise TypeError("OptionArray of Python objects has no value buffer")
+        return memoryview(self._validity), memoryview(self._values)
+
+    def to_arrow(self) -> Any:
+        """Returns the elements as a ``pyarrow`` array, with a null for every ``Nil``. Typed
+        buffers are shared with the ``pyarrow`` array, Python objects are converted by
+        ``pyarrow.array``. Requires ``pyarrow``.
+
+        Returns:
+            pyarrow.Array: The elements of this array.
+
+        Examples::
+
+            >>> OptionArray.from_optionals([1, None], typecode="q").to_arrow().to_pylist()
+            [1, None]
+        """
+        pa = _import_pyarrow()
+        if self._typecode is None:
+            return pa.array(self.to_optionals())
+        validity, values = self.buffers()
+        return pa.Array.from_buffers(
+            _arrow_type(pa, self._typecode),
+            len(self),
+            [pa.py_buffer(validity), pa.py_buffer(values)],
+            null_count=self.count_nil(),
+        )
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[Option[T]]:
+        for v, m in zip(self._values_list(), self._mask(), strict=True):
+            yield Some(v) if m else Nil
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            mask = self._mask()[index]
+            return OptionArray(self._values[index], _pack(mask, len(mask)), self._typecode)
+
+        n = len(self)
+        i = index + n if index < 0 else index
+        if not 0 <= i < n:
+            raise IndexError("OptionArray index out of range")
+        if not self._validity[i >> 3] >> (i & 7) & 1:
+            return Nil
+        value = self._values[i]
+        return Some(value.item() if self._is_numpy() else value)
+
+    def __repr__(self) -> str:
+        return f"OptionArray({self.to_options()!r}, typecode={self._typecode!r})"
+
+    def _is_numpy(self) -> bool:
+        return _np is not None and isinstance(self._values, _np.ndarray)
+
+    def _values_list(self) -> list[Any]:
+        values = self._values
+        return values if isinstance(values, list) else values.tolist()
+
+    def _mask(self) -> bytes:
+        return _unpack(self._validity, len(self))
+
+    def _check_len(self, other: OptionArray[Any]) -> OptionArray[Any]:
+        if len(other) != len(self):
+            raise ValueError(f"length mismatch: {len(self)} != {len(other)}")
+        return other
+
+
+@final
+class ResultArray(Generic[T, E]):
+    """Immutable sequence of ``Result`` values, stored as an ``OptionArray`` of the ``Ok`` values
+    and a sparse mapping from the indices of the ``Err`` elements to their errors.
+
+    ``ResultArray`` is usually created with ``from_results``. The constructor takes the raw
+    columns: element ``i`` is ``Ok`` if ``oks[i]`` is ``Some`` and ``Err(errs[i])`` otherwise.
+
+    Args:
+        oks (OptionArray[T]): The ``Ok`` values, ``Nil`` for every error.
+        errs (Mapping[int, E]): The errors by index, exactly for the ``Nil`` elements of ``oks``.
+
+    Examples::
+
+        >>> ResultArray(OptionArray.from_optionals([1, None]), {1: "e"})
+        ResultArray([Ok(1), Err(e)], typecode=None)
+    """
+
+    __slots__ = ("_oks", "_errs")
+
+    def __init__(self, oks: OptionArray[T], errs: Mapping[int, E]) -> None:
+        if len(errs) != oks.count_nil():
+            raise ValueError(f"got {len(errs)} errors for {oks.count_nil()} error slots")
+        validity = oks._validity
+        for i in errs:
+            if not 0 <= i < len(oks) or validity[i >> 3] >> (i & 7) & 1:
+                raise ValueError(f"error at index {i}, which is not an error slot")
+        self._oks = oks
+        self._errs = dict(sorted(errs.items()))
+
+    @staticmethod
+    def from_results(
+        results: Iterable[Result[T, E]], typecode: Optional[str] = None
+    ) -> ResultArray[T, E]:
+        """Creates a ``ResultArray`` from ``Result`` values.
+
+        Args:
+            results (Iterable[Result[T, E]]): The results to store.
+            typecode (Optional[str]): The ``array`` typecode of the ``Ok`` values, e.g. ``"q"`` or
+                ``"d"``, ``None`` for arbitrary Python objects. Defaults to ``None``.
+
+        Returns:
+            ResultArray[T, E]: The stored results.
+
+        Examples::
+
+            >>> ResultArray.from_results([Ok(1), Err("e")], typecode="q")
+            ResultArray([Ok(1), Err(e)], typecode='q')
+        """
+        fill = _fill(typecode)
+        values: list[Any] = []
+        mask = bytearray()
+        errs: dict[int, E] = {}
+        append_value = values.append
+        append_mask = mask.append
+        for i, res in enumerate(results):
+            if res._discriminant:
+                append_value(fill)
+                append_mask(0)
+                errs[i] = res.inner
+            else:
+                append_value(res.inner)
+                append_mask(1)
+        oks = OptionArray(_make_values(values, typecode), _pack(mask, len(values)), typecode)
+        return ResultArray(oks, errs)
+
+    @property
+    def typecode(self) -> Optional[str]:
+        """The typecode of the ``Ok`` values, ``None`` if they are arbitrary Python objects."""
+        return self._oks.typecode
+
+    @property
+    def oks(self) -> OptionArray[T]:
+        """The ``Ok`` values as an ``OptionArray``, with ``Nil`` for every error."""
+        return self._oks
+
+    @property
+    def errors(self) -> Mapping[int, E]:
+        """Read-only mapping from the indices of all ``Err`` elements to their errors, in index
+        order."""
+        return MappingProxyType(self._errs)
+
+    def to_results(self) -> list[Result[T, E]]:
+        """Returns the elements as a list of ``Ok``/``Err``.
+
+        Examples::
+
+            >>> ResultArray.from_results([Ok(1), Err("e")]).to_results()
+            [Ok(1), Err(e)]
+        """
+        return list(self)
+
+    def count_ok(self) -> int:
+        """Returns the number of ``Ok`` elements.
+
+        Examples::
+
+            >>> ResultArray.from_results([Ok(1), Err("e")]).count_ok()
+            1
+        """
+        return len(self) - len(self._errs)
+
+    def count_err(self) -> int:
+        """Returns the number of ``Err`` elements.
+
+        Examples::
+
+            >>> ResultArray.from_results([Ok(1), Err("e")]).count_err()
+            1
+        """
+        return len(self._errs)
+
+    def map(
+        self, op: Callable[[T], U], typecode: Any = _columns.SAME, vectorized: bool = False
+    ) -> ResultArray[U, E]:
+        """Maps the values of all ``Ok`` elements with ``op``, errors are left untouched. See
+        ``OptionArray.map`` for ``typecode`` and ``vectorized``.
+
+        Args:
+            op (Callable[[T], U]): The function to apply.
+            typecode (Optional[str]): The typecode of the result. Defaults to the typecode of this
+                array; for vectorized calls the type of the results of ``op``, also if ``op`` is
+                called per element.
+            vectorized (bool): Whether ``op`` works on whole NumPy arrays. Defaults to ``False``.
+
+        Returns:
+            ResultArray[U, E]: The mapped elements, sharing the errors with this array.
+
+        Examples::
+
+            >>> ResultArray.from_results([Ok(1), Err("e")]).map(lambda x: x * 2).to_results()
+            [Ok(2), Err(e)]
+        """
+        return self._with(self._oks.map(op, typecode, vectorized), self._errs)
+
+    def map_err(self, op: Callable[[E], F]) -> ResultArray[T, F]:
+        """Maps the errors of all ``Err`` elements with ``op``. Only the errors are visited, the
+        ``Ok`` values are shared with this array.
+
+        Args:
+            op (Callable[[E], F]): The function to apply.
+
+        Returns:
+            ResultArray[T, F]: The mapped elements.
+
+        Examples::
+
+            >>> ResultArray.from_results([Ok(1), Err("e")]).map_err(str.upper).to_results()
+            [Ok(1), Err(E)]
+        """
+        return self._with(self._oks, {i: op(e) for i, e in self._errs.items()})
+
+    def and_then(
+        self, op: Callable[[T], Result[U, E]], typecode: Any = _columns.SAME
+    ) -> ResultArray[U, E]:
+        """Calls ``op`` with the value of every ``Ok`` element and stores its result, errors are
+        left untouched.
+
+        Args:
+            op (Callable[[T], Result[U, E]]): The function to apply.
+            typecode (Optional[str]): The typecode of the ``Ok`` values of the result. Defaults to
+                the typecode of this array.
+
+        Returns:
+            ResultArray[U, E]: The results of ``op`` and the existing errors.
+
+        Examples::
+
+            >>> arr = ResultArray.from_results([Ok(1), Err("e"), Ok(-1)])
+            >>> arr.and_then(lambda x: Ok(x) if x > 0 else Err("neg")).to_results()
+            [Ok(1), Err(e), Err(neg)]
+        """
+        if typecode is _columns.SAME:
+            typecode = self.typecode
+        fill = _fill(typecode)
+        values = [fill] * len(self)
+        mask = bytearray(self._oks._mask())
+        errs = dict(self._errs)
+        ok_values = self._oks._values_list()
+        for i in compress(range(len(self)), mask):
+            res = op(ok_values[i])
+            if res._discriminant:
+                mask[i] = 0
+                errs[i] = res.inner
+            else:
+                values[i] = res.inner
+        oks = OptionArray(_make_values(values, typecode), _pack(mask, len(values)), typecode)
+        return ResultArray(oks, errs)
+
+    def unwrap_or(self, default: T) -> Any:
+        """Returns the ``Ok`` values with the values of all ``Err`` elements replaced by
+        ``default``.
+
+        Args:
+            default (T): The value for ``Err`` elements.
+
+        Returns:
+            Any: A NumPy array, ``array.array`` or ``list``, like the value buffer.
+
+        Examples::
+
+            >>> ResultArray.from_results([Ok(1), Err("e")]).unwrap_or(0)
+            [1, 0]
+        """
+        return self._oks.unwrap_or(default)
+
+    def partition(self) -> tuple[list[T], list[E]]:
+        """Splits the elements into the ``Ok`` values and the errors, like ``Result.partition``.
+
+        Returns:
+            tuple[list[T], list[E]]: The values of all ``Ok`` and the errors of all ``Err``
+            elements, both in index order.
+
+        Examples::
+
+            >>> ResultArray.from_results([Ok(1), Err("e"), Ok(3)]).partition()
+            ([1, 3], ['e'])
+        """
+        oks = list(compress(self._oks._values_list(), self._oks._mask()))
+        return oks, list(self._errs.values())
+
+    def __len__(self) -> int:
+        return len(self._oks)
+
+    def __iter__(self) -> Iterator[Result[T, E]]:
+        errs = self._errs
+        for i, (v, m) in enumerate(zip(self._oks._values_list(), self._oks._mask(), strict=True)):
+            yield Ok(v) if m else Err(errs[i])
+
+    def __getitem__(self, index: int) -> Result[T, E]:
+        opt = self._oks[index]
+        if opt._discriminant:
+            return Ok(opt.inner)
+        return Err(self._errs[index + len(self) if index < 0 else index])
+
+    def __repr__(self) -> str:
+        return f"ResultArray({self.to_results()!r}, typecode={self.typecode!r})"
+
+    @staticmethod
+    def _with(oks: OptionArray[Any], errs: dict[int, Any]) -> ResultArray[Any, Any]:
+        return _columns.unchecked(ResultArray, _oks=oks, _errs=errs)
@@ -0,0 +1,333 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Opt-in fusion of ``Option``/``Result`` method chains at definition time.
+
+Decorating a function with ``fuse_chains`` rewrites method chains like
+``x.map(f).and_then(g).unwrap_or(d)`` in its source into plain ``if``/``else`` code on the
+contained value, so that no intermediate ``Some``/``Ok``/``Err`` objects are created and no
+combinator method is dispatched. A chain is rewritten if
+
+* it is the whole value of a ``return``, an assignment or an expression statement,
+* it consists of at least two calls of ``map``, ``map_err``, ``and_then``, ``or_else``,
+  ``filter``, ``inspect`` or ``inspect_err``, optionally ending in ``unwrap_or``,
+  ``unwrap_or_else`` or ``map_or``, with positional arguments only.
+
+The rewritten code keeps the evaluation order of the chain (every argument is evaluated exactly
+where the chain would evaluate it) and checks at runtime that the values it works on are exactly
+``Some``/``Nil``/``Ok``/``Err`` (or their frozen variants). For any other value, e.g. a subclass
+with own combinators, the original chain is executed instead. Functions that can not be
+recompiled safely (closures, methods using ``super()``, functions without source, ...) are
+returned unchanged.
+
+Examples::
+
+    >>> from rusttypes.fusion import fuse_chains, fused_source
+    >>> @fuse_chains
+    ... def parse(s):
+    ...     return to_int(s).map(abs).and_then(check).unwrap_or(0)
+
+    >>> print(fused_source(parse))  # shows the generated code
+"""
+
+from __future__ import annotations
+
+import ast
+import copy
+from typing import Any, Callable, Final, Optional, TypeVar
+
+from . import _ast
+from .option import FrozenSome, Nil, NilType, Some
+from .result import Err, FrozenErr, FrozenOk, Ok
+
+Fn = TypeVar("Fn", bound=Callable[..., Any])
+
+_RUNTIME: Final = {
+    "__rusttypes_option__": frozenset({Some, FrozenSome, NilType}),
+    "__rusttypes_result__": frozenset({Ok, FrozenOk, Err, FrozenErr}),
+    "__rusttypes_some__": Some,
+    "__rusttypes_nil__": Nil,
+    "__rusttypes_ok__": Ok,
+    "__rusttypes_err__": Err,
+    "__rusttypes_type__": type,
+}
+"""Closure variables of the rewritten functions."""
+
+_OPTION_STEPS: Final = frozenset({"map", "and_then", "or_else", "filter", "inspect"})
+_RESULT_STEPS: Final = frozenset(
+    {"map", "map_err", "and_then", "or_else", "inspect", "inspect_err"}
+)
+_TERMINALS: Final = {"unwrap_or": 1, "unwrap_or_else": 1, "map_or": 2}
+
+
+def fuse_chains(fn: Fn) -> Fn:
+    """Decorator, that rewrites the ``Option``/``Result`` method chains of ``fn`` into inline code
+    (see the module documentation). Returns ``fn`` itself if nothing can be rewritten.
+
+    Args:
+        fn (Fn): The function to optimize.
+
+    Returns:
+        Fn: The optimized function, with the same behaviour as ``fn``.
+
+    Examples::
+
+        >>> @fuse_chains
+        ... def first_even_half(xs):
+        ...     return first(xs).filter(lambda x: x % 2 == 0).map(lambda x: x // 2).unwrap_or(-1)
+    """
+    node = _ast.parse_function(fn)
+    if node is None:
+        return fn
+    fuser = _ChainFuser(_ast.unique_prefix(node, "_rt"))
+    node.body = [stmt for s in node.body for stmt in _as_list(fuser.visit(s))]
+    if not fuser.count:
+        return fn
+    new = _ast.recompile(fn, node, _RUNTIME)
+    new.__rusttypes_source__ = ast.unparse(node)
+    return new
+
+
+def fused_source(fn: Callable[..., Any]) -> Optional[str]:
+    """Returns the generated source of a function optimized by ``fuse_chains`` or
+    ``rusttypes.result.try_guard(optimize=True)``, or ``None`` if ``fn`` was not rewritten.
+
+    Args:
+        fn (Callable[..., Any]): The decorated function.
+
+    Returns:
+        Optional[str]: The rewritten source code.
+    """
+    return getattr(fn, "__rusttypes_source__", None)
+
+
+class _ChainFuser(ast.NodeTransformer):
+    """Rewrites chains in the statements of a function body, without entering nested scopes."""
+
+    def __init__(self, prefix: str) -> None:
+        self.prefix = prefix
+        self.count = 0
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.AST:
+        return node
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> ast.AST:
+        return node
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> ast.AST:
+        return node
+
+    def visit_Lambda(self, node: ast.Lambda) -> ast.AST:
+        return node
+
+    def visit_Return(self, node: ast.Return) -> Any:
+        return self._fuse(node)
+
+    def visit_Assign(self, node: ast.Assign) -> Any:
+        return self._fuse(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> Any:
+        return self._fuse(node)
+
+    def visit_Expr(self, node: ast.Expr) -> Any:
+        return self._fuse(node)
+
+    def _fuse(self, stmt: Any) -> Any:
+        chain = _match_chain(stmt.value) if stmt.value is not None else None
+        if chain is None:
+            return stmt
+        base, calls = chain
+        pre = f"{self.prefix}{self.count}_"
+        self.count += 1
+
+        placeholders: dict[str, ast.expr] = {f"{pre}B": base}
+        for k, (_, args) in enumerate(calls):
+            for j, arg in enumerate(args):
+                placeholders[f"{pre}A{k}_{j}"] = arg
+
+        source = "\n".join(_Generator(pre, calls).lines())
+        generated = ast.parse(source).body
+        for node in generated:
+            for child in ast.walk(node):
+                if "lineno" in child._attributes:
+                    ast.copy_location(child, stmt)
+        generated = [_Substitute(placeholders).visit(node) for node in generated]
+
+        stmt.value = ast.copy_location(ast.Name(id=f"{pre}r", ctx=ast.Load()), stmt.value)
+        return [*generated, stmt]
+
+
+class _Substitute(ast.NodeTransformer):
+    def __init__(self, placeholders: dict[str, ast.expr]) -> None:
+        self.placeholders = placeholders
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        original = self.placeholders.get(node.id)
+        return node if original is None else copy.deepcopy(original)
+
+
+class _Generator:
+    """Generates the source of a fused chain, with placeholder names for the base expression
+    (``<pre>B``) and the arguments (``<pre>A<step>_<arg>``)."""
+
+    def __init__(self, pre: str, calls: list[tuple[str, list[ast.expr]]]) -> None:
+        self.pre = pre
+        self.calls = calls
+        if calls[-1][0] in _TERMINALS:
+            self.steps, self.terminal = calls[:-1], calls[-1][0]
+        else:
+            self.steps, self.terminal = calls, None
+
+    def lines(self) -> list[str]:
+        p = self.pre
+        names = {name for name, _ in self.steps}
+        lines = [f"{p}v = {p}B", f"{p}t = __rusttypes_type__({p}v)"]
+        keyword = "if"
+        for family, steps in (("option", _OPTION_STEPS), ("result", _RESULT_STEPS)):
+            if names <= steps:
+                lines.append(f"{keyword} {p}t in __rusttypes_{family}__:")
+                lines += _indent(self.family(family == "option"))
+                keyword = "elif"
+        lines += ["else:", f"    {p}r = {p}v{self.rest(0)}"]
+        return lines
+
+    def rest(self, k: int) -> str:
+        """The method calls of step ``k`` onwards, including the terminal."""
+        p = self.pre
+        return "".join(
+            f".{name}({', '.join(f'{p}A{i}_{j}' for j in range(len(args)))})"
+            for i, (name, args) in enumerate(self.calls)
+            if i >= k
+        )
+
+    def family(self, option: bool) -> list[str]:
+        return [*self.unwrap(option), *self.step(0, option)]
+
+    def unwrap(self, option: bool) -> list[str]:
+        p = self.pre
+        if option:
+            return [f"{p}ok = {p}v._discriminant == 1", f"{p}x = {p}v.inner if {p}ok else None"]
+        return [f"{p}ok = not {p}v._discriminant", f"{p}x = {p}v.inner"]
+
+    def step(self, k: int, option: bool) -> list[str]:
+        """Code of the steps ``k..`` and the terminal, storing the result in ``<pre>r``."""
+        p = self.pre
+        if k == len(self.steps):
+            return self.end(k, option)
+
+        name = self.steps[k][0]
+        a = f"{p}a{k}"
+        lines = [f"{a} = {p}A{k}_0"]
+        if name == "map":
+            lines += [f"if {p}ok:", f"    {p}x = {a}({p}x)"]
+        elif name == "map_err":
+            lines += [f"if not {p}ok:", f"    {p}x = {a}({p}x)"]
+        elif name == "inspect":
+            lines += [f"if {p}ok:", f"    {a}({p}x)"]
+        elif name == "inspect_err":
+            lines += [f"if not {p}ok:", f"    {a}({p}x)"]
+        elif name == "filter":
+            lines += [f"if {p}ok and not {a}({p}x):", f"    {p}ok = False", f"    {p}x = None"]
+        else:
+            call = f"{a}()" if option and name == "or_else" else f"{a}({p}x)"
+            test = f"if {'' if name == 'and_then' else 'not '}{p}ok:"
+            if k + 1 == len(self.steps) and self.terminal is None:
+                # the result of the last step is the final result
+                return lines + [test, f"    {p}r = {call}", "else:", *_indent(self.end(k, option))]
+
+            # ``and_then``/``or_else`` replace the value, continue with the methods of the new
+            # value if it is not one of the known variants
+            s = f"{p}s{k}"
+            family = "__rusttypes_option__" if option else "__rusttypes_result__"
+            lines += [
+                f"{s} = False",
+                test,
+                f"    {p}v = {call}",
+                f"    if __rusttypes_type__({p}v) in {family}:",
+                *_indent(_indent(self.unwrap(option))),
+                "    else:",
+                f"        {s} = True",
+                f"if {s}:",
+                f"    {p}r = {p}v{self.rest(k + 1)}",
+                "else:",
+                *_indent(self.step(k + 1, option)),
+            ]
+            return lines
+        return lines + self.step(k + 1, option)
+
+    def end(self, k: int, option: bool) -> list[str]:
+        p = self.pre
+        ok, x, r = f"{p}ok", f"{p}x", f"{p}r"
+        if self.terminal is None:
+            if option:
+                return [f"{r} = __rusttypes_some__({x}) if {ok} else __rusttypes_nil__"]
+            return [f"{r} = __rusttypes_ok__({x}) if {ok} else __rusttypes_err__({x})"]
+        a = f"{p}a{k}"
+        if self.terminal == "unwrap_or":
+            return [f"{a} = {p}A{k}_0", f"{r} = {x} if {ok} else {a}"]
+        if self.terminal == "unwrap_or_else":
+            call = f"{a}()" if option else f"{a}({x})"
+            return [f"{a} = {p}A{k}_0", f"{r} = {x} if {ok} else {call}"]
+        # map_or(default, f)
+        return [f"{a}d = {p}A{k}_0", f"{a} = {p}A{k}_1", f"{r} = {a}({x}) if {ok} else {a}d"]
+
+
+def _match_chain(expr: ast.expr) -> Optional[tuple[ast.expr, list[tuple[str, list[ast.expr]]]]]:
+    """Returns the base expression and the ``(method, args)`` calls of a fusable chain."""
+    links = []
+    node = expr
+    while (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and not node.keywords
+        and not any(isinstance(arg, ast.Starred) for arg in node.args)
+    ):
+        links.append(node)
+        node = node.func.value
+
+    chain = []
+    for i, call in enumerate(links):
+        name, nargs = call.func.attr, len(call.args)
+        if i == 0 and name in _TERMINALS:
+            if nargs != _TERMINALS[name]:
+                break
+        elif name not in _OPTION_STEPS | _RESULT_STEPS or nargs != 1:
+            break
+        chain.append(call)
+
+    steps = {call.func.attr for call in chain} - _TERMINALS.keys()
+    if len(chain) < 2 or not (steps <= _OPTION_STEPS or steps <= _RESULT_STEPS):
+        return None
+    return chain[-1].func.value, [(call.func.attr, call.args) for call in reversed(chain)]
+
+
+def _indent(lines: list[str]) -> list[str]:
+    return ["    " + line for line in lines]
+
+
+def _as_list(node: Any) -> list[Any]:
+    return node if isinstance(node, list) else [node]
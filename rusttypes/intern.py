@@ -0,0 +1,226 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Opt-in interning of ``Some`` and ``Ok`` wrappers around common immutable payloads.
+
+Most ``Option`` and ``Result`` values in a typical program wrap the same handful of payloads
+(``None``, ``True``, ``False``, small integers and short strings). Instead of allocating a new
+wrapper for each of them, an ``InternTable`` hands out a shared instance per payload.
+
+Shared instances must never change, therefore an ``InternTable`` hands out ``FrozenSome`` and
+``FrozenOk`` instances, which reject attribute assignment and return new objects from
+``insert``/``replace`` instead of mutating them in place. Apart from that they behave exactly like
+(and compare equal to) ``Some``/``Ok``.
+
+Examples::
+
+    >>> from rusttypes import intern
+    >>> intern.some(1) is intern.some(1)
+    True
+
+    >>> intern.ok(None)
+    Ok(None)
+
+    >>> intern.cache_info()
+    InternInfo(hits=1, misses=2, maxsize=1024, currsize=2)
+
+Interning is opt-in: only values created through ``some``/``ok`` (or an own ``InternTable``) are
+shared, ``Some(...)`` and ``Ok(...)`` always allocate.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Final, NamedTuple, TypeVar
+
+from .option import FrozenSome, Some
+from .result import FrozenOk, Ok
+
+T = TypeVar("T")
+
+
+class InternInfo(NamedTuple):
+    """Statistics of an ``InternTable``, similar to ``functools.lru_cache().cache_info()``."""
+
+    hits: int
+    """Number of calls that returned a shared instance."""
+    misses: int
+    """Number of calls that had to allocate a new instance."""
+    maxsize: int
+    """Maximum number of payloads per variant, counting every stored ``None``, ``True``, ``False``,
+    ``int`` and ``str`` payload."""
+    currsize: int
+    """Current number of ``None``, ``True``, ``False``, ``int`` and ``str`` payloads over all
+    variants."""
+
+
+class InternTable:
+    """Bounded table of shared ``Some`` and ``Ok`` instances for immutable payloads.
+
+    Eligible payloads are ``None``, ``True``, ``False``, ``int`` values inside ``int_range`` and
+    ``str`` values of at most ``max_str_len`` characters. Every other payload (including subclasses
+    of ``int`` and ``str``) gets a new, regular wrapper. Once ``maxsize`` payloads of a variant are
+    stored, further eligible payloads are no longer added, already stored ones are still shared.
+
+    The hit and miss counters are not synchronized and may be slightly off when a table is used by
+    several threads at once, the shared instances themselves are always safe to use.
+
+    Args:
+        maxsize (int): Maximum number of payloads per variant. Defaults to ``1024``.
+        int_range (tuple[int, int]): Inclusive range of ``int`` payloads to intern. Defaults to
+            ``(-5, 256)``.
+        max_str_len (int): Maximum length of ``str`` payloads to intern. Defaults to ``32``.
+
+    Examples::
+
+        >>> table = InternTable()
+        >>> table.some(0) is table.some(0)
+        True
+
+        >>> table.some(1.5) is table.some(1.5)
+        False
+
+        >>> table.cache_info()
+        InternInfo(hits=1, misses=3, maxsize=1024, currsize=1)
+    """
+
+    __slots__ = ("maxsize", "int_range", "max_str_len", "_hits", "_misses", "_some", "_ok")
+
+    def __init__(
+        self, maxsize: int = 1024, int_range: tuple[int, int] = (-5, 256), max_str_len: int = 32
+    ) -> None:
+        self.maxsize = maxsize
+        self.int_range = int_range
+        self.max_str_len = max_str_len
+        self._hits = 0
+        self._misses = 0
+        self._some: dict[Any, Some[Any]] = {}
+        self._ok: dict[Any, Ok[Any, Any]] = {}
+
+    def _key(self, value: Any) -> Any:
+        t = type(value)
+        if t is int:
+            lo, hi = self.int_range
+            return value if lo <= value <= hi else _UNINTERNABLE
+        if t is str:
+            return value if len(value) <= self.max_str_len else _UNINTERNABLE
+        if t is bool:
+            # ``True == 1`` and ``hash(True) == hash(1)``, use keys that do not collide with ints
+            return _TRUE if value else _FALSE
+        return None if value is None else _UNINTERNABLE
+
+    def some(self, value: T) -> Some[T]:
+        """Returns ``Some(value)``, which is shared with all other calls for the same payload if the
+        payload is eligible for interning.
+
+        Args:
+            value (T): The value to wrap.
+
+        Returns:
+            Some[T]: The (possibly shared) ``Some``.
+
+        Examples::
+
+            >>> table = InternTable()
+            >>> table.some("foo") is table.some("foo")
+            True
+        """
+        key = self._key(value)
+        shared = self._some.get(key)
+        if shared is not None:
+            self._hits += 1
+            return shared
+
+        self._misses += 1
+        if key is _UNINTERNABLE or len(self._some) >= self.maxsize:
+            return Some(value)
+
+        shared = self._some[key] = FrozenSome(value)
+        return shared
+
+    def ok(self, value: T = None) -> Ok[T, Any]:
+        """Returns ``Ok(value)``, which is shared with all other calls for the same payload if the
+        payload is eligible for interning.
+
+        Args:
+            value (T): The value to wrap. Defaults to ``None``.
+
+        Returns:
+            Ok[T, Any]: The (possibly shared) ``Ok``.
+
+        Examples::
+
+            >>> table = InternTable()
+            >>> table.ok() is table.ok(None)
+            True
+        """
+        key = self._key(value)
+        shared = self._ok.get(key)
+        if shared is not None:
+            self._hits += 1
+            return shared
+
+        self._misses += 1
+        if key is _UNINTERNABLE or len(self._ok) >= self.maxsize:
+            return Ok(value)
+
+        shared = self._ok[key] = FrozenOk(value)
+        return shared
+
+    def cache_info(self) -> InternInfo:
+        """Returns the hit/miss statistics and the current size of the table.
+
+        Returns:
+            InternInfo: The statistics of the table.
+        """
+        return InternInfo(self._hits, self._misses, self.maxsize, len(self._some) + len(self._ok))
+
+    def cache_clear(self) -> None:
+        """Drops all shared instances and resets the statistics. Instances handed out before stay
+        valid, they are just no longer shared with later calls."""
+        self._hits = 0
+        self._misses = 0
+        self._some.clear()
+        self._ok.clear()
+
+
+_TRUE: Final = object()
+_FALSE: Final = object()
+_UNINTERNABLE: Final = object()
+
+_default: Final = InternTable()
+
+some: Final = _default.some
+"""``InternTable.some`` of the default table."""
+
+ok: Final = _default.ok
+"""``InternTable.ok`` of the default table."""
+
+cache_info: Final = _default.cache_info
+"""``InternTable.cache_info`` of the default table."""
+
+cache_clear: Final = _default.cache_clear
+"""``InternTable.cache_clear`` of the default table."""
@@ -0,0 +1,437 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Lazy iterator adapters over streams of ``Result`` and ``Option`` values.
+
+``ResultIter`` and ``OptionIter`` record a chain of combinators (``map``, ``and_then``, ...) and
+apply it to every element of a stream once the iterator is consumed. The chain is fused into a
+single generated function per element first, which passes the raw contained value from step to
+step, so intermediate ``Ok``/``Err``/``Some`` objects are never created, only the final result of
+each element is. Elements are pulled one at a time, so streams of any length (e.g. generators) are
+processed in constant memory.
+
+Examples::
+
+    >>> from rusttypes.iterator import ResultIter
+    >>> from rusttypes.result import Err, Ok
+    >>> it = ResultIter([Ok(1), Err("e"), Ok(3)]).map(lambda x: x * 2).map_err(str.upper)
+    >>> list(it)
+    [Ok(2), Err(E), Ok(6)]
+
+    >>> ResultIter.from_values(range(4)).try_fold(0, lambda acc, x: Ok(acc + x))
+    Ok(6)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Final, Generic, Iterable, Iterator, Optional, TypeVar, final
+
+from ._fuse import OPTION, RESULT, SKIP, STOP, Steps, fuse
+from .option import Nil, Option, Some
+from .result import Ok, Result
+
+T = TypeVar("T")
+E = TypeVar("E")
+U = TypeVar("U")
+F = TypeVar("F")
+A = TypeVar("A")
+
+_CHECKED: Final = frozenset({"filter_map", "take_while_ok", "take_while_some"})
+"""Steps that can drop elements or end the iteration."""
+
+
+def _iter_checked(element: Callable[[Any], Any], source: Iterable[Any]) -> Iterator[Any]:
+    for x in source:
+        out = element(x)
+        if out is SKIP:
+            continue
+        if out is STOP:
+            return
+        yield out
+
+
+def _iter_fused(family: Any, steps: Steps, entry: str, source: Iterable[Any]) -> Iterator[Any]:
+    if not steps and entry == "wrapped":
+        return iter(source)
+    element = fuse(family, steps, entry)
+    if any(kind in _CHECKED for kind, _ in steps):
+        return _iter_checked(element, source)
+    return map(element, source)
+
+
+@final
+class ResultIter(Generic[T, E]):
+    """Lazy iterator over ``Result`` values with fused combinators.
+
+    Combinators return a new ``ResultIter`` over the same source, the source is only consumed
+    when the ``ResultIter`` is iterated over or one of the ``try_*``/``collect`` methods is called.
+    Like any iterator over a one-shot source (e.g. a generator), it can only be consumed once.
+
+    Args:
+        source (Iterable[Result[T, E]]): The results to iterate over.
+
+    Examples::
+
+        >>> it = ResultIter(Ok(x) if x % 3 else Err(x) for x in range(1, 5))
+        >>> list(it.and_then(lambda x: Ok(x) if x < 4 else Err(-x)))
+        [Ok(1), Ok(2), Err(3), Err(-4)]
+    """
+
+    __slots__ = ("_source", "_raw", "_steps")
+
+    def __init__(self, source: Iterable[Result[T, E]]) -> None:
+        self._source = source
+        self._raw = False
+        self._steps: tuple[tuple[str, Callable[..., Any]], ...] = ()
+
+    @staticmethod
+    def from_values(values: Iterable[T]) -> ResultIter[T, Any]:
+        """Creates a ``ResultIter`` that treats every element of ``values`` as ``Ok``, without
+        creating ``Ok`` objects for them.
+
+        Args:
+            values (Iterable[T]): The contained values.
+
+        Returns:
+            ResultIter[T, Any]: The lazy iterator.
+
+        Examples::
+
+            >>> list(ResultIter.from_values([1, 2]).map(str))
+            [Ok(1), Ok(2)]
+        """
+        it: ResultIter[T, Any] = ResultIter(values)
+        it._raw = True
+        return it
+
+    def map(self, op: Callable[[T], U]) -> ResultIter[U, E]:
+        """Lazy ``Result.map`` of every element.
+
+        Examples::
+
+            >>> list(ResultIter([Ok(1), Err("e")]).map(lambda x: x + 1))
+            [Ok(2), Err(e)]
+        """
+        return self._then("map", op)
+
+    def map_err(self, op: Callable[[E], F]) -> ResultIter[T, F]:
+        """Lazy ``Result.map_err`` of every element.
+
+        Examples::
+
+            >>> list(ResultIter([Ok(1), Err("e")]).map_err(str.upper))
+            [Ok(1), Err(E)]
+        """
+        return self._then("map_err", op)
+
+    def and_then(self, op: Callable[[T], Result[U, E]]) -> ResultIter[U, E]:
+        """Lazy ``Result.and_then`` of every element.
+
+        Examples::
+
+            >>> it = ResultIter([Ok(1), Ok(-1)]).and_then(lambda x: Ok(x) if x > 0 else Err(x))
+            >>> list(it)
+            [Ok(1), Err(-1)]
+        """
+        return self._then("and_then", op)
+
+    def filter_map(self, op: Callable[[T], Option[U]]) -> ResultIter[U, E]:
+        """Maps the value of every ``Ok`` element with ``op`` and drops the elements for which
+        ``op`` returns ``Nil``. ``Err`` elements are kept.
+
+        Examples::
+
+            >>> it = ResultIter([Ok(1), Ok(2), Err("e")])
+            >>> list(it.filter_map(lambda x: Some(x) if x % 2 == 0 else Nil))
+            [Ok(2), Err(e)]
+        """
+        return self._then("filter_map", op)
+
+    def inspect(self, op: Callable[[T], Any]) -> ResultIter[T, E]:
+        """Calls ``op`` with the value of every ``Ok`` element and passes the element on.
+
+        Examples::
+
+            >>> seen = []
+            >>> list(ResultIter([Ok(1), Err("e")]).inspect(seen.append)), seen
+            ([Ok(1), Err(e)], [1])
+        """
+        return self._then("inspect", op)
+
+    def take_while_ok(self) -> ResultIter[T, E]:
+        """Ends the iteration at the first ``Err`` element, which is not yielded.
+
+        Examples::
+
+            >>> list(ResultIter([Ok(1), Err("e"), Ok(3)]).take_while_ok())
+            [Ok(1)]
+        """
+        return self._then("take_while_ok", None)
+
+    def try_fold(self, init: A, op: Callable[[A, T], Result[A, E]]) -> Result[A, E]:
+        """Folds the values of all elements with ``op``, starting with ``init``. Stops at the first
+        ``Err`` element or the first ``Err`` returned by ``op`` and returns it.
+
+        Args:
+            init (A): The initial accumulator.
+            op (Callable[[A, T], Result[A, E]]): Called with the accumulator and every value.
+
+        Returns:
+            Result[A, E]: ``Ok`` of the final accumulator or the first ``Err``.
+
+        Examples::
+
+            >>> ResultIter([Ok(1), Ok(2)]).try_fold(0, lambda acc, x: Ok(acc + x))
+            Ok(3)
+
+            >>> ResultIter([Ok(1), Err("e")]).try_fold(0, lambda acc, x: Ok(acc + x))
+            Err(e)
+        """
+        acc = init
+        for res in self:
+            if res._discriminant:
+                return res
+            res = op(acc, res.inner)
+            if res._discriminant:
+                return res
+            acc = res.inner
+        return Ok(acc)
+
+    def try_for_each(self, op: Callable[[T], Result[Any, E]]) -> Result[None, E]:
+        """Calls ``op`` with the value of every element. Stops at the first ``Err`` element or the
+        first ``Err`` returned by ``op`` and returns it.
+
+        Args:
+            op (Callable[[T], Result[Any, E]]): Called with every value.
+
+        Returns:
+            Result[None, E]: ``Ok(None)`` or the first ``Err``.
+
+        Examples::
+
+            >>> ResultIter([Ok(1), Ok(-1)]).try_for_each(lambda x: Ok() if x > 0 else Err(x))
+            Err(-1)
+        """
+        for res in self:
+            if res._discriminant:
+                return res
+            res = op(res.inner)
+            if res._discriminant:
+                return res
+        return Ok(None)
+
+    def collect(self) -> Result[list[T], E]:
+        """Consumes the iterator like ``Result.collect``.
+
+        Examples::
+
+            >>> ResultIter([Ok(1), Ok(2)]).map(lambda x: x * 2).collect()
+            Ok([2, 4])
+        """
+        return Result.collect(self)
+
+    def __iter__(self) -> Iterator[Result[T, E]]:
+        entry = "value" if self._raw else "wrapped"
+        return _iter_fused(RESULT, self._steps, entry, self._source)
+
+    def _then(self, kind: str, op: Any) -> ResultIter[Any, Any]:
+        it: ResultIter[Any, Any] = ResultIter(self._source)
+        it._raw = self._raw
+        it._steps = self._steps + ((kind, op),)
+        return it
+
+
+@final
+class OptionIter(Generic[T]):
+    """Lazy iterator over ``Option`` values with fused combinators, see ``ResultIter``.
+
+    Args:
+        source (Iterable[Option[T]]): The options to iterate over.
+
+    Examples::
+
+        >>> list(OptionIter([Some(1), Nil]).map(lambda x: x + 1).filter(lambda x: x > 1))
+        [Some(2), Nil]
+    """
+
+    __slots__ = ("_source", "_raw", "_steps")
+
+    def __init__(self, source: Iterable[Option[T]]) -> None:
+        self._source = source
+        self._raw = False
+        self._steps: tuple[tuple[str, Callable[..., Any]], ...] = ()
+
+    @staticmethod
+    def from_optionals(values: Iterable[Optional[T]]) -> OptionIter[T]:
+        """Creates an ``OptionIter`` that treats every ``None`` in ``values`` as ``Nil`` and every
+        other value as ``Some``, without creating ``Some`` objects for them.
+
+        Args:
+            values (Iterable[Optional[T]]): The values.
+
+        Returns:
+            OptionIter[T]: The lazy iterator.
+
+        Examples::
+
+            >>> list(OptionIter.from_optionals([1, None]).map(str))
+            [Some(1), Nil]
+        """
+        it: OptionIter[T] = OptionIter(values)
+        it._raw = True
+        return it
+
+    def map(self, op: Callable[[T], U]) -> OptionIter[U]:
+        """Lazy ``Option.map`` of every element.
+
+        Examples::
+
+            >>> list(OptionIter([Some(1), Nil]).map(lambda x: x + 1))
+            [Some(2), Nil]
+        """
+        return self._then("map", op)
+
+    def and_then(self, op: Callable[[T], Option[U]]) -> OptionIter[U]:
+        """Lazy ``Option.and_then`` of every element.
+
+        Examples::
+
+            >>> list(OptionIter([Some(1), Some(-1)]).and_then(lambda x: Some(x) if x > 0 else Nil))
+            [Some(1), Nil]
+        """
+        return self._then("and_then", op)
+
+    def filter(self, predicate: Callable[[T], bool]) -> OptionIter[T]:
+        """Lazy ``Option.filter`` of every element.
+
+        Examples::
+
+            >>> list(OptionIter([Some(1), Some(2)]).filter(lambda x: x % 2 == 0))
+            [Nil, Some(2)]
+        """
+        return self._then("filter", predicate)
+
+    def filter_map(self, op: Callable[[T], Option[U]]) -> OptionIter[U]:
+        """Maps the value of every ``Some`` element with ``op`` and drops the elements for which
+        ``op`` returns ``Nil``. ``Nil`` elements are kept.
+
+        Examples::
+
+            >>> it = OptionIter([Some(1), Some(2), Nil])
+            >>> list(it.filter_map(lambda x: Some(x) if x % 2 == 0 else Nil))
+            [Some(2), Nil]
+        """
+        return self._then("filter_map", op)
+
+    def inspect(self, op: Callable[[T], Any]) -> OptionIter[T]:
+        """Calls ``op`` with the value of every ``Some`` element and passes the element on.
+
+        Examples::
+
+            >>> seen = []
+            >>> list(OptionIter([Some(1), Nil]).inspect(seen.append)), seen
+            ([Some(1), Nil], [1])
+        """
+        return self._then("inspect", op)
+
+    def take_while_some(self) -> OptionIter[T]:
+        """Ends the iteration at the first ``Nil`` element, which is not yielded.
+
+        Examples::
+
+            >>> list(OptionIter([Some(1), Nil, Some(3)]).take_while_some())
+            [Some(1)]
+        """
+        return self._then("take_while_some", None)
+
+    def try_fold(self, init: A, op: Callable[[A, T], Option[A]]) -> Option[A]:
+        """Folds the values of all elements with ``op``, starting with ``init``. Stops at the first
+        ``Nil`` element or the first ``Nil`` returned by ``op``.
+
+        Args:
+            init (A): The initial accumulator.
+            op (Callable[[A, T], Option[A]]): Called with the accumulator and every value.
+
+        Returns:
+            Option[A]: ``Some`` of the final accumulator or ``Nil``.
+
+        Examples::
+
+            >>> OptionIter([Some(1), Some(2)]).try_fold(0, lambda acc, x: Some(acc + x))
+            Some(3)
+        """
+        acc = init
+        for opt in self:
+            if not opt._discriminant:
+                return Nil
+            opt = op(acc, opt.inner)
+            if not opt._discriminant:
+                return Nil
+            acc = opt.inner
+        return Some(acc)
+
+    def try_for_each(self, op: Callable[[T], Option[Any]]) -> Option[None]:
+        """Calls ``op`` with the value of every element. Stops at the first ``Nil`` element or the
+        first ``Nil`` returned by ``op``.
+
+        Args:
+            op (Callable[[T], Option[Any]]): Called with every value.
+
+        Returns:
+            Option[None]: ``Some(None)`` or ``Nil``.
+
+        Examples::
+
+            >>> OptionIter([Some(1), Some(2)]).try_for_each(lambda x: Some(None))
+            Some(None)
+        """
+        for opt in self:
+            if not opt._discriminant:
+                return Nil
+            if not op(opt.inner)._discriminant:
+                return Nil
+        return Some(None)
+
+    def collect(self) -> Option[list[T]]:
+        """Consumes the iterator like ``Option.collect``.
+
+        Examples::
+
+            >>> OptionIter([Some(1), Some(2)]).map(lambda x: x * 2).collect()
+            Some([2, 4])
+        """
+        return Option.collect(self)
+
+    def __iter__(self) -> Iterator[Option[T]]:
+        entry = "optional" if self._raw else "wrapped"
+        return _iter_fused(OPTION, self._steps, entry, self._source)
+
+    def _then(self, kind: str, op: Any) -> OptionIter[Any]:
+        it: OptionIter[Any] = OptionIter(self._source)
+        it._raw = self._raw
+        it._steps = self._steps + ((kind, op),)
+        return it
@@ -26,11 +26,69 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from typing import Any
+import threading
+from typing import Any, ClassVar, Optional
+
+
+class _ExceptionMode(threading.local):
+    lightweight: Optional[bool] = None
+
+
+_thread_mode = _ExceptionMode()
+_global_lightweight = False
+
+
+def set_lightweight_exceptions(enabled: Optional[bool] = True, *, scope: str = "thread") -> None:
+    """Enables or disables the lightweight exception mode, for the current thread or globally.
+
+    In lightweight mode, ``panic`` raises its ``RuntimeError`` with ``from None``, so that the
+    traceback of the exception that is currently handled is left out when the error is printed or
+    formatted. The handled exception is still kept in ``__context__``. Use it where panics are
+    caught and logged by upper layers, which then only format the traceback of the panic.
+
+    Args:
+        enabled (Optional[bool]): Whether to enable the mode. For ``scope="thread"``, ``None``
+            makes the thread follow the global setting again. Defaults to ``True``.
+        scope (str): ``"thread"`` (the default) or ``"global"``. The thread setting takes
+            precedence over the global one.
+
+    Raises:
+        ValueError: If ``scope`` is invalid.
+
+    Examples::
+
+        >>> set_lightweight_exceptions(True)
+        >>> lightweight_exceptions_enabled()
+        True
+
+        >>> set_lightweight_exceptions(None)
+        >>> lightweight_exceptions_enabled()
+        False
+    """
+    global _global_lightweight
+    if scope == "thread":
+        _thread_mode.lightweight = enabled
+    elif scope == "global":
+        _global_lightweight = bool(enabled)
+    else:
+        raise ValueError(f"scope must be 'thread' or 'global', not {scope!r}")
+
+
+def lightweight_exceptions_enabled() -> bool:
+    """Returns whether the lightweight exception mode is enabled in the current thread (see
+    ``set_lightweight_exceptions``).
+
+    Returns:
+        bool: ``True`` if the mode is enabled, ``False`` otherwise.
+    """
+    lightweight = _thread_mode.lightweight
+    return _global_lightweight if lightweight is None else lightweight
 
 
 def panic(msg: str) -> None:
-    """Raise a RuntimeError with the given message.
+    """Raise a RuntimeError with the given message. In lightweight exception mode (see
+    ``set_lightweight_exceptions``), the error is raised ``from None``, which hides the exception
+    that is currently handled in the formatted traceback.
 
     Args:
         msg (str): The message to be displayed.
@@ -38,6 +96,8 @@ def panic(msg: str) -> None:
     Raises:
         RuntimeError: The message is displayed.
     """
+    if lightweight_exceptions_enabled():
+        raise RuntimeError(msg) from None
     raise RuntimeError(msg)
 
 
@@ -51,3 +111,48 @@ def stringify(e: Any) -> str:
         str: The converted object.
     """
     return str(e)
+
+
+class SumType:
+    """Base class of the sum types (``Option``, ``Result``) of this package.
+
+    Replaces ``abc.ABC`` without using a metaclass, so that construction and ``isinstance`` checks
+    stay plain ``type`` operations. The abstract API contract is still enforced: a subclass that
+    does not implement every method marked with ``abc.abstractmethod`` can only be declared by
+    passing ``abstract=True`` as class keyword, and abstract classes can not be instantiated.
+
+    Examples::
+
+        >>> class Shape(SumType, abstract=True):
+        ...     @abstractmethod
+        ...     def area(self) -> float: ...
+
+        >>> class Square(Shape):
+        ...     pass
+        TypeError: Can't define concrete class Square without an implementation for abstract
+        method area
+    """
+
+    __slots__ = ()
+
+    _abstract: ClassVar[bool] = True
+
+    def __init_subclass__(cls, abstract: bool = False, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._abstract = abstract
+
+        if not abstract:
+            missing = sorted(
+                name
+                for name in dir(cls)
+                if getattr(getattr(cls, name, None), "__isabstractmethod__", False)
+            )
+            if missing:
+                raise TypeError(
+                    f"Can't define concrete class {cls.__name__} without an implementation for "
+                    f"abstract method{'s' if len(missing) > 1 else ''} {', '.join(missing)}"
+                )
+
+    def __init__(self) -> None:
+        if self._abstract:
+            raise TypeError(f"Can't instantiate abstract class {type(self).__name__}")
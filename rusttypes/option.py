@@ -28,27 +28,55 @@
 
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
-from typing import Any, Callable, Generic, Optional, TypeVar, final, Final
+import builtins
+import math
+from abc import abstractmethod
+from functools import wraps
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Generator,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+    final,
+    Final,
+)
 
 from . import result as r
-from .misc import panic
+from .misc import SumType, panic
 
 T = TypeVar("T")
 U = TypeVar("U")
 E = TypeVar("E")
 R = TypeVar("R")
+C = TypeVar("C")
 
 
-class Option(ABC, Generic[T]):
+class Option(SumType, Generic[T], abstract=True):
     """Option type that represents an optional value.
 
     Variants:
 
     - ``Some(T)``: Some value of type ``T``.
     - ``Nil``: No value.
+
+    All variants use ``__slots__`` and therefore carry no per-instance ``__dict__``. Weak references
+    are not supported by default, subclasses that need them can opt in by adding ``"__weakref__"``
+    to their own ``__slots__``.
+
+    The hierarchy does not use ``abc.ABCMeta``, so ``isinstance`` checks against ``Option`` are
+    plain ``type`` checks and the cheapest way to test for an option in hot code.
     """
 
+    __slots__ = ()
+
+    _rusttypes_tag: ClassVar[str] = "option"
+    _discriminant: ClassVar[int]
+
     @staticmethod
     def from_opt(value: Optional[T]) -> Option[T]:
         """Converts a Python ``Optional`` to an ``Option``.
@@ -69,6 +97,122 @@ class Option(ABC, Generic[T]):
         """
         return Some(value) if value is not None else Nil
 
+    @staticmethod
+    def sort_key(opt: Option[T]) -> tuple[int] | tuple[int, T]:
+        """Returns a key for ``sorted``, ``list.sort``, ``min`` and ``max`` that orders options the
+        same way as the comparison operators do, but is compared entirely by the builtin ``tuple``
+        comparison instead of calling ``Option.__lt__`` for every pair.
+
+        Args:
+            opt (Option[T]): The option to compute the key for.
+
+        Returns:
+            tuple[int] | tuple[int, T]: ``(0,)`` for ``Nil`` and ``(1, v)`` for ``Some(v)``.
+
+        Examples::
+
+            >>> sorted([Some(2), Nil, Some(1)], key=Option.sort_key)
+            [Nil, Some(1), Some(2)]
+        """
+        return (1, opt.inner) if opt._discriminant else (0,)
+
+    @staticmethod
+    def collect(iterable: Iterable[Option[T]]) -> Option[list[T]]:
+        """Collects an iterable of ``Option`` values into an ``Option`` of a list, like Rust's
+        ``collect::<Option<Vec<_>>>()``. Stops consuming ``iterable`` at the first ``Nil``.
+
+        Args:
+            iterable (Iterable[Option[T]]): The options to collect, may be a lazy generator.
+
+        Returns:
+            Option[list[T]]: ``Some`` of all contained values, or ``Nil`` if any option is ``Nil``.
+
+        Examples::
+
+            >>> Option.collect([Some(1), Some(2)])
+            Some([1, 2])
+
+            >>> Option.collect([Some(1), Nil, Some(3)])
+            Nil
+        """
+        values: list[T] = []
+        append = values.append
+        for opt in iterable:
+            if not opt._discriminant:
+                return Nil
+            append(opt.inner)
+        return Some(values)
+
+    @staticmethod
+    def collect_into(iterable: Iterable[Option[T]], into: Callable[[Iterable[T]], C]) -> Option[C]:
+        """Collects the contained values of an iterable of ``Option`` values with ``into`` (e.g.
+        ``set``, ``dict``, ``tuple``, ``"".join``), stopping at the first ``Nil``. ``into`` receives
+        a lazy iterator, the values are never materialized in between.
+
+        Args:
+            iterable (Iterable[Option[T]]): The options to collect, may be a lazy generator.
+            into (Callable[[Iterable[T]], C]): Consumes the contained values and builds the
+                collection.
+
+        Returns:
+            Option[C]: ``Some`` of the collection, or ``Nil`` if any option is ``Nil``.
+
+        Examples::
+
+            >>> Option.collect_into([Some(1), Some(1), Some(2)], set)
+            Some({1, 2})
+
+            >>> Option.collect_into([Some(("a", 1)), Nil], dict)
+            Nil
+        """
+        failed: list[Option[T]] = []
+        collected = into(_values_until_nil(iterable, failed))
+        return Nil if failed else Some(collected)
+
+    @staticmethod
+    def sum(iterable: Iterable[Option[T]], start: Any = 0) -> Option[Any]:
+        """Sums up the contained values of an iterable of ``Option`` values, stopping at the first
+        ``Nil``.
+
+        Args:
+            iterable (Iterable[Option[T]]): The options to sum up, may be a lazy generator.
+            start (Any): The start value of the sum. Defaults to ``0``.
+
+        Returns:
+            Option[Any]: ``Some`` of the sum, or ``Nil`` if any option is ``Nil``.
+
+        Examples::
+
+            >>> Option.sum([Some(1), Some(2)])
+            Some(3)
+
+            >>> Option.sum([Some(1), Nil])
+            Nil
+        """
+        return Option.collect_into(iterable, lambda values: builtins.sum(values, start))
+
+    @staticmethod
+    def product(iterable: Iterable[Option[T]], start: Any = 1) -> Option[Any]:
+        """Multiplies the contained values of an iterable of ``Option`` values, stopping at the
+        first ``Nil``.
+
+        Args:
+            iterable (Iterable[Option[T]]): The options to multiply, may be a lazy generator.
+            start (Any): The start value of the product. Defaults to ``1``.
+
+        Returns:
+            Option[Any]: ``Some`` of the product, or ``Nil`` if any option is ``Nil``.
+
+        Examples::
+
+            >>> Option.product([Some(2), Some(3)])
+            Some(6)
+
+            >>> Option.product([Nil, Some(3)])
+            Nil
+        """
+        return Option.collect_into(iterable, lambda values: math.prod(values, start=start))
+
     @abstractmethod
     def __eq__(self, other: Any) -> bool:
         """Compares an ``Option`` with any other object and returns ``True`` if they are equal,
@@ -96,6 +240,61 @@ class Option(ABC, Generic[T]):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def __hash__(self) -> int:
+        """Returns the hash of the ``Option``. Only ``Option``s with a hashable contained value are
+        hashable. ``Nil`` hashes like ``None``, since both compare equal.
+
+        Returns:
+            int: The hash of the ``Option``.
+
+        Examples::
+
+            >>> hash(Some(1)) == hash(Some(1))
+            True
+
+            >>> {Some(1): "one", Nil: "nothing"}[Nil]
+            "nothing"
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def __lt__(self, other: Any) -> bool:
+        """Compares two ``Option``s the same way as Rust does: ``Nil`` is less than any ``Some`` and
+        two ``Some`` values are compared by their contained values. ``__le__``, ``__gt__`` and
+        ``__ge__`` follow the same order.
+
+        Args:
+            other (Any): The object to compare with.
+
+        Returns:
+            bool: ``True`` if ``self`` is ordered before ``other``, ``False`` otherwise.
+
+        Examples::
+
+            >>> Nil < Some(0)
+            True
+
+            >>> Some(1) < Some(2)
+            True
+
+            >>> sorted([Some(2), Nil, Some(1)])
+            [Nil, Some(1), Some(2)]
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def __le__(self, other: Any) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def __gt__(self, other: Any) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def __ge__(self, other: Any) -> bool:
+        raise NotImplementedError
+
     @abstractmethod
     def __repr__(self) -> str:
         """Representation of the ``Option`` as a ``str``
@@ -1008,14 +1207,41 @@ class Option(ABC, Generic[T]):
 
 
 class Some(Option, Generic[T]):
+    __slots__ = ("inner",)
+
     inner: T
 
+    _discriminant: ClassVar[int] = 1
+
     def __init__(self, inner: T) -> None:
         self.inner = inner
 
     def __eq__(self, other: Any) -> bool:
         return isinstance(other, Some) and self.inner == other.inner
 
+    def __hash__(self) -> int:
+        return hash((Some, self.inner))
+
+    def __lt__(self, other: Any) -> bool:
+        if isinstance(other, Some):
+            return self.inner < other.inner
+        return False if isinstance(other, NilType) else NotImplemented
+
+    def __le__(self, other: Any) -> bool:
+        if isinstance(other, Some):
+            return self.inner <= other.inner
+        return False if isinstance(other, NilType) else NotImplemented
+
+    def __gt__(self, other: Any) -> bool:
+        if isinstance(other, Some):
+            return self.inner > other.inner
+        return True if isinstance(other, NilType) else NotImplemented
+
+    def __ge__(self, other: Any) -> bool:
+        if isinstance(other, Some):
+            return self.inner >= other.inner
+        return True if isinstance(other, NilType) else NotImplemented
+
     def __repr__(self) -> str:
         return f"Some({self.inner})"
 
@@ -1143,11 +1369,83 @@ class Some(Option, Generic[T]):
         return self.inner
 
 
+@final
+class FrozenSome(Some, Generic[T]):
+    """Immutable variant of ``Some``, that can be shared between threads, caches and callers without
+    copying it defensively.
+
+    A ``FrozenSome`` compares and hashes like a ``Some`` with the same value and supports the same
+    methods. Assigning to its attributes raises an ``AttributeError``, ``insert`` and ``replace``
+    return new ``FrozenSome`` instances instead of updating the value in place and ``copy.copy``
+    returns the instance itself. Only the wrapper is frozen, to share it safely the contained value
+    has to be immutable as well.
+
+    Examples::
+
+        >>> x = FrozenSome(1)
+        >>> y = x.insert(2)
+        >>> x, y
+        (Some(1), Some(2))
+
+        >>> x.inner = 2
+        AttributeError: Can not assign to 'inner' of a FrozenSome
+    """
+
+    __slots__ = ()
+
+    def __init__(self, inner: T) -> None:
+        object.__setattr__(self, "inner", inner)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Can not assign to '{name}' of a FrozenSome")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Can not delete '{name}' of a FrozenSome")
+
+    def __copy__(self) -> FrozenSome[T]:
+        return self
+
+    def __reduce__(self) -> tuple[type[FrozenSome[T]], tuple[T]]:
+        return FrozenSome, (self.inner,)
+
+    def insert(self, value: T) -> Some[T]:
+        return FrozenSome(value)
+
+    def take(self) -> tuple[NilType, Option[T]]:
+        return Nil, self
+
+    def replace(self, value: T) -> tuple[Option[T], Option[T]]:
+        return FrozenSome(value), self
+
+
 @final
 class NilType(Option, Generic[T]):
+    __slots__ = ()
+
+    _discriminant: ClassVar[int] = 0
+
     def __eq__(self, other: Any) -> bool:
         return isinstance(other, NilType) or other is None
 
+    def __hash__(self) -> int:
+        return hash(None)
+
+    def __lt__(self, other: Any) -> bool:
+        if isinstance(other, Option):
+            return isinstance(other, Some)
+        return NotImplemented
+
+    def __le__(self, other: Any) -> bool:
+        return True if isinstance(other, Option) else NotImplemented
+
+    def __gt__(self, other: Any) -> bool:
+        return False if isinstance(other, Option) else NotImplemented
+
+    def __ge__(self, other: Any) -> bool:
+        if isinstance(other, Option):
+            return isinstance(other, NilType)
+        return NotImplemented
+
     def __repr__(self) -> str:
         return "Nil"
 
@@ -1268,3 +1566,88 @@ class NilType(Option, Generic[T]):
 
 Nil: Final = NilType()
 """A final instance of the ``NilType`` class, representing a ``Nil`` value."""
+
+
+def _values_until_nil(iterable: Iterable[Option[T]], failed: list[Option[T]]) -> Iterator[T]:
+    for opt in iterable:
+        if not opt._discriminant:
+            failed.append(opt)
+            return
+        yield opt.inner
+
+
+def is_option(value: Any) -> bool:
+    """Returns ``True`` if ``value`` is an ``Option`` (``Some`` or ``Nil``), by comparing the class
+    tag of ``value``. Meant as a predicate, e.g. for ``filter(is_option, values)``. The
+    function call makes it slower than ``isinstance(value, Option)``, which should be preferred
+    in hot loops.
+
+    Args:
+        value (Any): The value to check.
+
+    Returns:
+        bool: ``True`` if ``value`` is an ``Option``, ``False`` otherwise.
+
+    Examples::
+
+        >>> is_option(Some(1))
+        True
+
+        >>> is_option(Nil)
+        True
+
+        >>> is_option(1)
+        False
+    """
+    return getattr(value, "_rusttypes_tag", None) == "option"
+
+
+#
+#  --- DECORATORS ---
+#
+
+
+def do(fn: Callable[..., Generator[Any, Any, Option[T]]]) -> Callable[..., Option[T]]:
+    """Runs a generator function as do-block: every ``value = yield option`` unwraps a ``Some`` into
+    ``value``, a ``Nil`` ends the block and returns ``Nil``. The ``return`` value of the generator
+    is the result of the block. See ``rusttypes.result.do``.
+
+    Args:
+        fn (Callable[..., Generator[Option[Any], Any, Option[T]]]): The generator function.
+
+    Returns:
+        Callable[..., Option[T]]: Function that runs the do-block.
+
+    Examples::
+
+        >>> @do
+        ... def full_name(user: dict):
+        ...     first = yield Option.from_opt(user.get("first"))
+        ...     last = yield Option.from_opt(user.get("last"))
+        ...     return Some(f"{first} {last}")
+
+        >>> full_name({"first": "Ada", "last": "Lovelace"})
+        Some(Ada Lovelace)
+
+        >>> full_name({"first": "Ada"})
+        Nil
+    """
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Option[T]:
+        gen = fn(*args, **kwargs)
+        send = gen.send
+        try:
+            value = send(None)
+            while True:
+                if isinstance(value, Some):
+                    value = send(value.inner)
+                elif isinstance(value, NilType):
+                    gen.close()
+                    return value
+                else:
+                    value = gen.throw(TypeError(f"do-block yielded {value!r}, expected an Option"))
+        except StopIteration as e:
+            return e.value
+
+    return wrapper
@@ -0,0 +1,250 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Allocation free ``Option`` functions over Python ``Optional`` values.
+
+``None`` takes the role of ``Nil`` and every other value the role of ``Some(value)``. Every method
+of ``Option`` has a function counterpart here, prefixed with ``opt_``, that works on the raw value
+instead of a ``Some``/``Nil`` instance (``opt_map(x, f)`` is ``Option.from_opt(x).map(f)``), so no
+wrapper is allocated when a value is only mapped or unwrapped once.
+
+As ``None`` is the empty case, a present ``None`` value (``Some(None)``) can not be represented;
+functions whose callback returns ``None`` produce the empty case. Functions that return a
+``Result`` in ``Option`` return a tagged tuple (see ``rusttypes.tagged``).
+
+Examples::
+
+    >>> from rusttypes.optional import opt_map, opt_unwrap_or
+    >>> opt_unwrap_or(opt_map(2, lambda x: x * 2), 0)
+    4
+
+    >>> opt_unwrap_or(opt_map(None, lambda x: x * 2), 0)
+    0
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Optional, TypeVar
+
+from .misc import panic
+from .tagged import ERR, OK, Tagged
+
+T = TypeVar("T")
+U = TypeVar("U")
+E = TypeVar("E")
+R = TypeVar("R")
+
+
+def opt_is_some(x: Optional[T]) -> bool:
+    """See ``Option.is_some``."""
+    return x is not None
+
+
+def opt_is_some_and(x: Optional[T], f: Callable[[T], bool]) -> bool:
+    """See ``Option.is_some_and``."""
+    return x is not None and f(x)
+
+
+def opt_is_nil(x: Optional[T]) -> bool:
+    """See ``Option.is_nil``."""
+    return x is None
+
+
+def opt_expect(x: Optional[T], msg: str) -> T:
+    """See ``Option.expect``."""
+    if x is None:
+        raise RuntimeError(msg)
+    return x
+
+
+def opt_unwrap(x: Optional[T]) -> T:
+    """See ``Option.unwrap``."""
+    if x is None:
+        raise RuntimeError("Called unwrap on a Nil value")
+    return x
+
+
+def opt_unwrap_or(x: Optional[T], default: T) -> T:
+    """See ``Option.unwrap_or``."""
+    return default if x is None else x
+
+
+def opt_unwrap_or_else(x: Optional[T], f: Callable[[], T]) -> T:
+    """See ``Option.unwrap_or_else``."""
+    return f() if x is None else x
+
+
+def opt_unwrap_or_default(x: Optional[T], t: type[T]) -> T:
+    """See ``Option.unwrap_or_default``."""
+    if x is not None:
+        return x
+    try:
+        return t.default()
+    except AttributeError:
+        panic("Called unwrap_or_default on Err without t implementing default() function")
+
+
+def opt_unwrap_unchecked(x: Optional[T]) -> T:
+    """See ``Option.unwrap_unchecked``."""
+    if x is None:
+        raise RuntimeError("Called unwrap_unchecked on a Nil value")
+    return x
+
+
+def opt_map(x: Optional[T], f: Callable[[T], U]) -> Optional[U]:
+    """See ``Option.map``."""
+    return None if x is None else f(x)
+
+
+def opt_inspect(x: Optional[T], f: Callable[[T], None]) -> Optional[T]:
+    """See ``Option.inspect``."""
+    if x is not None:
+        f(x)
+    return x
+
+
+def opt_map_or(x: Optional[T], default: U, f: Callable[[T], U]) -> U:
+    """See ``Option.map_or``."""
+    return default if x is None else f(x)
+
+
+def opt_map_or_else(x: Optional[T], default: Callable[[], U], f: Callable[[T], U]) -> U:
+    """See ``Option.map_or_else``."""
+    return default() if x is None else f(x)
+
+
+def opt_ok_or(x: Optional[T], err: E) -> Tagged[T, E]:
+    """See ``Option.ok_or``. Returns a tagged tuple."""
+    return (ERR, err) if x is None else (OK, x)
+
+
+def opt_ok_or_else(x: Optional[T], f: Callable[[], E]) -> Tagged[T, E]:
+    """See ``Option.ok_or_else``. Returns a tagged tuple."""
+    return (ERR, f()) if x is None else (OK, x)
+
+
+def opt_and(x: Optional[T], optb: Optional[U]) -> Optional[U]:
+    """See ``Option.and_``."""
+    return None if x is None else optb
+
+
+def opt_and_then(x: Optional[T], f: Callable[[T], Optional[U]]) -> Optional[U]:
+    """See ``Option.and_then``."""
+    return None if x is None else f(x)
+
+
+def opt_filter(x: Optional[T], predicate: Callable[[T], bool]) -> Optional[T]:
+    """See ``Option.filter``."""
+    return x if x is not None and predicate(x) else None
+
+
+def opt_or(x: Optional[T], optb: Optional[T]) -> Optional[T]:
+    """See ``Option.or_``."""
+    return optb if x is None else x
+
+
+def opt_or_else(x: Optional[T], f: Callable[[], Optional[T]]) -> Optional[T]:
+    """See ``Option.or_else``."""
+    return f() if x is None else x
+
+
+def opt_xor(x: Optional[T], optb: Optional[T]) -> Optional[T]:
+    """See ``Option.xor``."""
+    if x is None:
+        return optb
+    return x if optb is None else None
+
+
+def opt_insert(x: Optional[T], value: T) -> T:
+    """See ``Option.insert``. Returns the new value, which replaces ``x``."""
+    return value
+
+
+def opt_get_or_insert(x: Optional[T], value: T) -> T:
+    """See ``Option.get_or_insert``."""
+    return value if x is None else x
+
+
+def opt_get_or_insert_default(x: Optional[T], t: type[T]) -> T:
+    """See ``Option.get_or_insert_default``."""
+    if x is not None:
+        return x
+    try:
+        return t.default()
+    except AttributeError as exc:
+        raise RuntimeError(
+            "Can not get_or_insert_default Err without t implementing default() function"
+        ) from exc
+
+
+def opt_get_or_insert_with(x: Optional[T], f: Callable[[], T]) -> T:
+    """See ``Option.get_or_insert_with``."""
+    return f() if x is None else x
+
+
+def opt_take(x: Optional[T]) -> tuple[None, Optional[T]]:
+    """See ``Option.take``. Returns ``(None, x)``."""
+    return None, x
+
+
+def opt_replace(x: Optional[T], value: T) -> tuple[T, Optional[T]]:
+    """See ``Option.replace``. Returns ``(value, x)``."""
+    return value, x
+
+
+def opt_zip(x: Optional[T], other: Optional[U]) -> Optional[tuple[T, U]]:
+    """See ``Option.zip``."""
+    return None if x is None or other is None else (x, other)
+
+
+def opt_zip_with(x: Optional[T], other: Optional[U], f: Callable[[T, U], R]) -> Optional[R]:
+    """See ``Option.zip_with``."""
+    return None if x is None or other is None else f(x, other)
+
+
+def opt_unzip(x: Optional[tuple[T, U]]) -> tuple[Optional[T], Optional[U]]:
+    """See ``Option.unzip``."""
+    if x is None:
+        return None, None
+    if not isinstance(x, tuple | list):
+        raise ValueError("Can not unzip non-tuple type")
+    if len(x) != 2:
+        raise ValueError("Can not unzip tuple with more/less than 2 elements")
+
+    return x[0], x[1]
+
+
+def opt_transpose(x: Optional[Tagged[T, E]]) -> Tagged[Optional[T], E]:
+    """See ``Option.transpose``. Transposes an optional tagged tuple into a tagged tuple of an
+    optional value."""
+    return (OK, None) if x is None else x
+
+
+def opt_flatten(x: Optional[Optional[T]]) -> Optional[T]:
+    """See ``Option.flatten``. Nested ``Optional`` values are already flat, ``x`` is returned as
+    is."""
+    return x
@@ -0,0 +1,428 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Parallel combinators on thread and process pools that produce ``Result`` values.
+
+``par_map`` maps a function over an iterable on a ``concurrent.futures`` executor and streams the
+results as ``Result`` values: exceptions raised by the function become ``Err`` values like in
+``Result.from_fn``. Inputs are sent to the workers in chunks, to reduce the per-item overhead of
+futures (and of pickling, for process pools), and only a bounded number of chunks is in flight, so
+arbitrary long iterables can be processed lazily.
+
+``par_find_map`` runs probes returning ``Option`` values on a pool and returns the first ``Some``,
+cancelling the remaining probes. ``hedge`` reduces the tail latency of a call by starting further
+attempts when it takes too long and taking the first ``Ok``.
+
+Examples::
+
+    >>> from rusttypes.parallel import par_map
+    >>> from rusttypes.result import Result
+    >>> Result.collect(par_map(parse_int, ["1", "2", "3"], executor="process"))
+    Ok([1, 2, 3])
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Final,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Sized,
+    TypeVar,
+    Union,
+    final,
+)
+
+from . import _delays
+from .option import Nil, Option
+from .result import Err, Ok, Result
+
+T = TypeVar("T")
+U = TypeVar("U")
+E = TypeVar("E")
+
+ExecutorLike = Union[str, Executor]
+
+_EXECUTORS: Final = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+"""Executor classes by name."""
+
+
+_CHUNKS_PER_WORKER: Final = 4
+"""Number of chunks per worker if the chunk size is derived from the length of the input."""
+
+_IN_FLIGHT_PER_WORKER: Final = 2
+"""Number of chunks per worker that are submitted but not yet consumed."""
+
+
+def par_map(
+    fn: Callable[[T], Any],
+    iterable: Iterable[T],
+    executor: ExecutorLike = "thread",
+    chunksize: Optional[int] = None,
+    ordered: bool = True,
+    fail_fast: bool = False,
+    max_workers: Optional[int] = None,
+    err_t: type[BaseException] | tuple[type[BaseException], ...] = Exception,
+) -> Iterator[Result[Any, Any]]:
+    """Maps ``fn`` over ``iterable`` in parallel and yields the results as ``Result`` values.
+
+    A return value of ``fn`` that is a ``Result`` (e.g. of a function decorated with
+    ``rusttypes.result.catch``) is yielded as is, any other value ``v`` as ``Ok(v)``. An exception
+    of type ``err_t`` raised by ``fn`` is yielded as ``Err(exception)``, like in ``Result.from_fn``.
+
+    Args:
+        fn (Callable[[T], Any]): The function to map. Must be picklable for process pools.
+        iterable (Iterable[T]): The inputs. Consumed lazily.
+        executor (str | Executor): ``"thread"``, ``"process"`` or an existing executor, which is
+            not shut down. Defaults to ``"thread"``.
+        chunksize (Optional[int]): The number of inputs per task. Defaults to a quarter of the
+            inputs per worker for sized iterables (at most 1024), else 64.
+        ordered (bool): Whether to yield in input order instead of completion order. Defaults to
+            ``True``.
+        fail_fast (bool): Whether to stop at the first ``Err``: it is the last item of the stream,
+            no further chunk is submitted and chunks that have not started are cancelled.
+            Defaults to ``False``.
+        max_workers (Optional[int]): The number of workers of a created executor, or of the
+            given executor, to size the chunks and the submitted work. Defaults to the default of
+            the executor class (``os.cpu_count()`` for a given executor).
+        err_t (type[BaseException] | tuple[type[BaseException], ...]): The exceptions to turn into
+            ``Err``. Defaults to ``Exception``.
+
+    Returns:
+        Iterator[Result[Any, Any]]: The results.
+
+    Raises:
+        ValueError: If ``executor`` is an unknown name or ``chunksize`` is smaller than 1.
+
+    Examples::
+
+        >>> list(par_map(int, ["1", "x", "3"], executor="thread", chunksize=2))
+        [Ok(1), Err(invalid literal for int() with base 10: 'x'), Ok(3)]
+
+        >>> list(par_map(int, ["1", "x", "3"], fail_fast=True))
+        [Ok(1), Err(invalid literal for int() with base 10: 'x')]
+    """
+    if not isinstance(executor, Executor) and executor not in _EXECUTORS:
+        raise ValueError(f"executor must be 'thread', 'process' or an Executor, not {executor!r}")
+    if chunksize is not None and chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1, not {chunksize}")
+    return _stream(fn, iterable, executor, chunksize, ordered, fail_fast, max_workers, err_t)
+
+
+def par_find_map(
+    fn: Callable[[T], Option[U]],
+    iterable: Iterable[T],
+    executor: ExecutorLike = "thread",
+    ordered: bool = False,
+    max_workers: Optional[int] = None,
+) -> Option[U]:
+    """Runs the probe ``fn`` on the inputs in parallel and returns the first ``Some`` it returns,
+    or ``Nil`` if it returns ``Nil`` for every input. The parallel version of ``find_map``.
+
+    As soon as the result is known, probes that have not started are cancelled and no further
+    input is consumed. Probes that are already running can not be interrupted: a created executor
+    is shut down without waiting for them. An exception raised by a probe is propagated.
+
+    Args:
+        fn (Callable[[T], Option[U]]): The probe. Must be picklable for process pools.
+        iterable (Iterable[T]): The inputs. Consumed lazily.
+        executor (str | Executor): ``"thread"``, ``"process"`` or an existing executor, which is
+            not shut down. Defaults to ``"thread"``.
+        ordered (bool): Whether to return the ``Some`` of the first input (in input order) that
+            has one, instead of the first ``Some`` that completes. Defaults to ``False``.
+        max_workers (Optional[int]): The number of workers of a created executor, or of the
+            given executor, to limit the submitted probes. Defaults to the default of the executor
+            class (``os.cpu_count()`` for a given executor).
+
+    Returns:
+        Option[U]: The first ``Some``, or ``Nil``.
+
+    Raises:
+        ValueError: If ``executor`` is an unknown name.
+
+    Examples::
+
+        >>> par_find_map(probe_replica, ["replica-a", "replica-b", "replica-c"])
+        Some(<connection to replica-b>)
+
+        >>> par_find_map(lambda x: Some(x) if x > 10 else Nil, range(5), ordered=True)
+        Nil
+    """
+    if not isinstance(executor, Executor) and executor not in _EXECUTORS:
+        raise ValueError(f"executor must be 'thread', 'process' or an Executor, not {executor!r}")
+    pool, workers, owned = _open_pool(executor, max_workers)
+    inputs = enumerate(iterable)
+    pending: dict[Future[Option[U]], int] = {}
+    best: Optional[tuple[int, Option[U]]] = None
+
+    def submit() -> None:
+        for index, x in islice(inputs, workers * _IN_FLIGHT_PER_WORKER - len(pending)):
+            pending[pool.submit(fn, x)] = index
+
+    try:
+        submit()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=pending.__getitem__):
+                index = pending.pop(future)
+                opt = future.result()
+                if opt._discriminant and (best is None or index < best[0]):
+                    best = (index, opt)
+            if best is not None:
+                if not ordered or all(index > best[0] for index in pending.values()):
+                    return best[1]
+            else:
+                submit()
+        return Nil if best is None else best[1]
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+@final
+class HedgeStats:
+    """Thread-safe counters of ``hedge`` calls (see ``hedge`` and ``rusttypes.aio.hedge``).
+
+    Attributes:
+        calls (int): The number of hedged calls.
+        fired (int): The number of additional attempts started by these calls.
+        won (int): The number of calls whose ``Ok`` came from an additional attempt.
+
+    Examples::
+
+        >>> stats = HedgeStats()
+        >>> hedge(fetch, delays=[0.05], stats=stats)
+        Ok(...)
+        >>> stats
+        HedgeStats(calls=1, fired=1, won=1)
+    """
+
+    __slots__ = ("calls", "fired", "won", "_lock")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.fired = 0
+        self.won = 0
+        self._lock = threading.Lock()
+
+    def record(self, fired: int, won: bool) -> None:
+        """Records a finished call that started ``fired`` additional attempts."""
+        with self._lock:
+            self.calls += 1
+            self.fired += fired
+            self.won += won
+
+    def __repr__(self) -> str:
+        return f"HedgeStats(calls={self.calls}, fired={self.fired}, won={self.won})"
+
+
+def hedge(
+    fn: Callable[[], Any],
+    delays: Sequence[float],
+    executor: Optional[Executor] = None,
+    stats: Optional[HedgeStats] = None,
+    err_t: type[BaseException] | tuple[type[BaseException], ...] = Exception,
+) -> Result[Any, list[Any]]:
+    """Calls ``fn`` with hedging: if no attempt succeeded ``delays[k]`` seconds after the call
+    started, attempt ``k + 2`` is started. The first ``Ok`` of any attempt is returned. An attempt
+    returns ``Ok``/``Err`` like ``Result.from_fn`` (a returned ``Result`` is taken as is). If all
+    running attempts failed, the next attempt starts right away instead of waiting for its delay.
+
+    Attempts run on ``executor``, by default on a thread pool created for the call. Pass a shared
+    executor on hot paths. Attempts that have not started when the result is known are
+    cancelled, running attempts can not be interrupted and finish in the background.
+
+    Args:
+        fn (Callable[[], Any]): The call to hedge. May be called several times concurrently.
+        delays (Sequence[float]): The non-decreasing start times of the additional attempts, in
+            seconds after the start of the call, e.g. the p95 and p99 latency of ``fn``.
+        executor (Optional[Executor]): The executor of the attempts. Defaults to ``None``.
+        stats (Optional[HedgeStats]): Counters to update. Defaults to ``None``.
+        err_t (type[BaseException] | tuple[type[BaseException], ...]): The exceptions to turn into
+            ``Err``. Defaults to ``Exception``.
+
+    Returns:
+        Result[Any, list[Any]]: The first ``Ok``, or ``Err`` with the errors of all attempts in
+            attempt order.
+
+    Raises:
+        ValueError: If ``delays`` is negative or decreasing.
+
+    Examples::
+
+        >>> hedge(lambda: fetch("/users/1"), delays=[0.05, 0.2], executor=pool)
+        Ok({'id': 1})
+    """
+    _delays.check_delays(delays)
+    pool = executor if executor is not None else ThreadPoolExecutor(len(delays) + 1)
+    start = time.monotonic()
+    attempts = [pool.submit(_attempt, fn, err_t)]
+    running = {attempts[0]: 0}
+    errors: dict[int, Any] = {}
+    winner: Optional[int] = None
+    try:
+        while True:
+            timeout: Optional[float] = None
+            if len(attempts) <= len(delays):
+                timeout = max(0.0, start + delays[len(attempts) - 1] - time.monotonic())
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=running.__getitem__):
+                index = running.pop(future)
+                result = future.result()
+                if not result._discriminant:
+                    winner = index
+                    return result
+                errors[index] = result.inner
+            if len(attempts) <= len(delays) and (not done or not running):
+                future = pool.submit(_attempt, fn, err_t)
+                running[future] = len(attempts)
+                attempts.append(future)
+            elif not running:
+                return Err([errors[index] for index in range(len(attempts))])
+    finally:
+        for future in running:
+            future.cancel()
+        if executor is None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        if stats is not None:
+            stats.record(len(attempts) - 1, winner is not None and winner > 0)
+
+
+def _attempt(
+    fn: Callable[[], Any], err_t: type[BaseException] | tuple[type[BaseException], ...]
+) -> Result[Any, Any]:
+    try:
+        value = fn()
+    except err_t as e:
+        return Err(e)
+    return value if isinstance(value, Result) else Ok(value)
+
+
+def _open_pool(executor: ExecutorLike, max_workers: Optional[int]) -> tuple[Executor, int, bool]:
+    """Returns the pool for ``executor``, its number of workers and whether the pool was created
+    here (and has to be shut down by the caller)."""
+    if isinstance(executor, Executor):
+        return executor, max_workers or os.cpu_count() or 1, False
+    if max_workers is None:
+        cpus = os.cpu_count() or 1
+        # the defaults of ``ThreadPoolExecutor`` and ``ProcessPoolExecutor``
+        max_workers = min(32, cpus + 4) if executor == "thread" else cpus
+    return _EXECUTORS[executor](max_workers), max_workers, True
+
+
+def _default_chunksize(iterable: Iterable[Any], workers: int) -> int:
+    if not isinstance(iterable, Sized):
+        return 64
+    return max(1, min(1024, -(-len(iterable) // (workers * _CHUNKS_PER_WORKER))))
+
+
+def _run_chunk(
+    fn: Callable[[Any], Any],
+    chunk: list[Any],
+    err_t: type[BaseException] | tuple[type[BaseException], ...],
+    fail_fast: bool,
+) -> list[Result[Any, Any]]:
+    """Runs ``fn`` on the inputs of one chunk, in the worker."""
+    results: list[Result[Any, Any]] = []
+    append = results.append
+    for x in chunk:
+        try:
+            value = fn(x)
+        except err_t as e:
+            value = Err(e)
+        else:
+            if not isinstance(value, Result):
+                value = Ok(value)
+        append(value)
+        if fail_fast and value._discriminant:
+            break
+    return results
+
+
+def _stream(
+    fn: Callable[[Any], Any],
+    iterable: Iterable[Any],
+    executor: ExecutorLike,
+    chunksize: Optional[int],
+    ordered: bool,
+    fail_fast: bool,
+    max_workers: Optional[int],
+    err_t: type[BaseException] | tuple[type[BaseException], ...],
+) -> Iterator[Result[Any, Any]]:
+    pool, workers, owned = _open_pool(executor, max_workers)
+    if chunksize is None:
+        chunksize = _default_chunksize(iterable, workers)
+    inputs = iter(iterable)
+    in_flight: deque[Future[list[Result[Any, Any]]]] = deque()
+    exhausted = False
+
+    def submit() -> bool:
+        chunk = list(islice(inputs, chunksize))
+        if chunk:
+            in_flight.append(pool.submit(_run_chunk, fn, chunk, err_t, fail_fast))
+        return bool(chunk)
+
+    try:
+        while len(in_flight) < workers * _IN_FLIGHT_PER_WORKER and submit():
+            pass
+        while in_flight:
+            if ordered:
+                future = in_flight.popleft()
+            else:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                future = next(f for f in in_flight if f in done)
+                in_flight.remove(future)
+            for result in future.result():
+                yield result
+                if fail_fast and result._discriminant:
+                    return
+            submit()
+        exhausted = True
+    finally:
+        for future in in_flight:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=exhausted, cancel_futures=True)
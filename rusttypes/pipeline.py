@@ -0,0 +1,201 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Precompiled combinator chains.
+
+A ``Pipeline`` describes a chain of combinators once, e.g.
+``Pipeline.ok().map(f).and_then(g).or_else(h)``, and compiles it into a single function with the
+same semantics as the method chain ``res.map(f).and_then(g).or_else(h)``. The compiled function
+works on the raw contained values and has the state (``Ok``/``Err``, ``Some``/``Nil``) encoded in
+its control flow, so no intermediate objects are created and no method is looked up per step.
+
+Examples::
+
+    >>> from rusttypes.pipeline import Pipeline
+    >>> from rusttypes.result import Err, Ok
+    >>> pipe = Pipeline.ok().map(lambda x: x + 1).and_then(lambda x: Ok(x) if x > 0 else Err(x))
+    >>> pipe(Ok(1)), pipe(Ok(-1)), pipe(Err("e"))
+    (Ok(2), Err(0), Err(e))
+
+    >>> pipe.apply(1)
+    Ok(2)
+
+    >>> run = pipe.compile()  # skips the call of ``Pipeline.__call__`` on hot paths
+    >>> [run(res) for res in [Ok(1), Ok(2)]]
+    [Ok(2), Ok(3)]
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Final, Generic, Optional, TypeVar, final
+
+from . import _fuse
+from .option import Option
+from .result import Result
+
+T = TypeVar("T")
+E = TypeVar("E")
+U = TypeVar("U")
+F = TypeVar("F")
+
+_STREAM_ONLY: Final = frozenset({"filter_map", "take_while_ok", "take_while_some"})
+"""Steps that drop elements and therefore only make sense in ``rusttypes.iterator``."""
+
+
+@final
+class Pipeline(Generic[T, E]):
+    """Reusable, compiled chain of ``Result`` or ``Option`` combinators.
+
+    A ``Pipeline`` is created with ``Pipeline.ok()`` (for ``Result`` values) or
+    ``Pipeline.some()`` (for ``Option`` values) and is immutable: every combinator returns a new
+    ``Pipeline``, so a common prefix can be shared by several pipelines. The chain is compiled on
+    first use.
+
+    Calling a ``Pipeline`` with a ``Result``/``Option`` applies the chain to it, ``apply`` applies
+    it to a raw value (``Ok(value)``, or ``Option.from_opt(value)`` for ``Option`` pipelines).
+    """
+
+    __slots__ = ("_family", "_steps", "_compiled", "_compiled_value")
+
+    def __init__(self, family: Any, steps: _fuse.Steps = ()) -> None:
+        self._family = family
+        self._steps = tuple(steps)
+        self._compiled: Optional[Callable[[Any], Any]] = None
+        self._compiled_value: Optional[Callable[[Any], Any]] = None
+
+    @staticmethod
+    def ok() -> Pipeline[Any, Any]:
+        """Returns an empty pipeline of ``Result`` combinators.
+
+        Examples::
+
+            >>> Pipeline.ok().map(str)(Ok(1))
+            Ok(1)
+        """
+        return Pipeline(_fuse.RESULT)
+
+    @staticmethod
+    def some() -> Pipeline[Any, Any]:
+        """Returns an empty pipeline of ``Option`` combinators.
+
+        Examples::
+
+            >>> Pipeline.some().filter(lambda x: x > 1).apply(1)
+            Nil
+        """
+        return Pipeline(_fuse.OPTION)
+
+    def map(self, op: Callable[[T], U]) -> Pipeline[U, E]:
+        """Appends ``map(op)`` to the chain, see ``Result.map``/``Option.map``."""
+        return self._then("map", op)
+
+    def map_err(self, op: Callable[[E], F]) -> Pipeline[T, F]:
+        """Appends ``map_err(op)`` to the chain, see ``Result.map_err``. ``Result`` only."""
+        return self._then("map_err", op)
+
+    def and_then(self, op: Callable[[T], Any]) -> Pipeline[Any, E]:
+        """Appends ``and_then(op)`` to the chain, see ``Result.and_then``/``Option.and_then``."""
+        return self._then("and_then", op)
+
+    def or_else(self, op: Callable[..., Any]) -> Pipeline[T, Any]:
+        """Appends ``or_else(op)`` to the chain, see ``Result.or_else``/``Option.or_else``."""
+        return self._then("or_else", op)
+
+    def inspect(self, op: Callable[[T], Any]) -> Pipeline[T, E]:
+        """Appends ``inspect(op)`` to the chain, see ``Result.inspect``/``Option.inspect``."""
+        return self._then("inspect", op)
+
+    def inspect_err(self, op: Callable[[E], Any]) -> Pipeline[T, E]:
+        """Appends ``inspect_err(op)`` to the chain, see ``Result.inspect_err``. ``Result``
+        only."""
+        return self._then("inspect_err", op)
+
+    def filter(self, predicate: Callable[[T], bool]) -> Pipeline[T, E]:
+        """Appends ``filter(predicate)`` to the chain, see ``Option.filter``. ``Option`` only."""
+        return self._then("filter", predicate)
+
+    def compile(self, raw: bool = False) -> Callable[[Any], Any]:
+        """Returns the compiled chain as a plain function of one argument.
+
+        Args:
+            raw (bool): Whether the function takes raw values (like ``apply``) instead of
+                ``Result``/``Option`` values (like calling the pipeline). Defaults to ``False``.
+
+        Returns:
+            Callable[[Any], Any]: The compiled chain.
+
+        Examples::
+
+            >>> Pipeline.some().map(lambda x: x * 2).compile(raw=True)(None)
+            Nil
+        """
+        if raw:
+            if self._compiled_value is None:
+                entry = "value" if self._family is _fuse.RESULT else "optional"
+                self._compiled_value = _fuse.fuse(self._family, self._steps, entry)
+            return self._compiled_value
+        if self._compiled is None:
+            self._compiled = _fuse.fuse(self._family, self._steps, "wrapped")
+        return self._compiled
+
+    def apply(self, value: Any) -> Any:
+        """Applies the chain to a raw value, which is treated as ``Ok(value)`` for ``Result``
+        pipelines and as ``Option.from_opt(value)`` for ``Option`` pipelines.
+
+        Args:
+            value (Any): The raw value.
+
+        Returns:
+            Result | Option: The result of the chain.
+
+        Examples::
+
+            >>> Pipeline.ok().map(lambda x: x * 2).apply(2)
+            Ok(4)
+        """
+        return self.compile(raw=True)(value)
+
+    @property
+    def source(self) -> str:
+        """The generated source code of the compiled chain, for debugging."""
+        return self.compile().__source__
+
+    def __call__(self, value: Result[Any, Any] | Option[Any]) -> Any:
+        return self.compile()(value)
+
+    def __repr__(self) -> str:
+        name = "ok" if self._family is _fuse.RESULT else "some"
+        steps = "".join(
+            f".{kind}({getattr(op, '__qualname__', repr(op))})" for kind, op in self._steps
+        )
+        return f"Pipeline.{name}(){steps}"
+
+    def _then(self, kind: str, op: Any) -> Pipeline[Any, Any]:
+        if kind not in _fuse.kinds(self._family) or kind in _STREAM_ONLY:
+            name = "Result" if self._family is _fuse.RESULT else "Option"
+            raise TypeError(f"{kind} is not available for {name} pipelines")
+        return Pipeline(self._family, self._steps + ((kind, op),))
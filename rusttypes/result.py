@@ -28,17 +28,37 @@
 
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
+import builtins
+import inspect
+import math
+from abc import abstractmethod
+from array import array
 from functools import wraps
-from typing import Any, Callable, Generic, TypeVar
-
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    ClassVar,
+    Coroutine,
+    Final,
+    Generator,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+    final,
+)
+
+from . import _try
 from . import option as o
-from .misc import panic, stringify
+from .misc import SumType, panic, stringify
 
 T = TypeVar("T")
 E = TypeVar("E")
 U = TypeVar("U")
 F = TypeVar("F")
+C = TypeVar("C")
 
 
 class ResultException(Exception, Generic[E]):
@@ -67,7 +87,7 @@ class ResultException(Exception, Generic[E]):
         return f"ResultException({self.inner})"
 
 
-class Result(ABC, Generic[T, E]):
+class Result(SumType, Generic[T, E], abstract=True):
     """Result type that represents either a successful value or an error. The ``Result`` type is a
     sum type that can be either an ``Ok`` or an ``Err``. The ``Ok`` variant holds the successful
     value, while the ``Err`` variant holds the error value. The ``Result`` type is used to handle
@@ -77,8 +97,20 @@ class Result(ABC, Generic[T, E]):
 
     - ``Ok(T)``: Represents a successful value ``T``.
     - ``Err(E)``: Represents an error value of type ``E``.
+
+    All variants use ``__slots__`` and therefore carry no per-instance ``__dict__``. Weak references
+    are not supported by default, subclasses that need them can opt in by adding ``"__weakref__"``
+    to their own ``__slots__``.
+
+    The hierarchy does not use ``abc.ABCMeta``, so ``isinstance`` checks against ``Result`` are
+    plain ``type`` checks and the cheapest way to test for a result in hot code.
     """
 
+    __slots__ = ()
+
+    _rusttypes_tag: ClassVar[str] = "result"
+    _discriminant: ClassVar[int]
+
     @staticmethod
     def from_opt(opt: o.Option[T], err: E = None) -> Result[T, E]:
         """Converts an ``Option`` to a ``Result``. If the ``Option`` is ``Some``, the value is
@@ -147,10 +179,208 @@ class Result(ABC, Generic[T, E]):
         except err_t as e:
             return Err(e)
 
+    @staticmethod
+    def sort_key(res: Result[T, E]) -> tuple[int, T | E]:
+        """Returns a key for ``sorted``, ``list.sort``, ``min`` and ``max`` that orders results the
+        same way as the comparison operators do (every ``Ok`` before every ``Err``, then by the
+        contained value), but is compared entirely by the builtin ``tuple`` comparison instead of
+        calling ``Result.__lt__`` for every pair.
+
+        Args:
+            res (Result[T, E]): The result to compute the key for.
+
+        Returns:
+            tuple[int, T | E]: ``(0, v)`` for ``Ok(v)`` and ``(1, e)`` for ``Err(e)``.
+
+        Examples::
+
+            >>> sorted([Err("a"), Ok(2), Ok(1)], key=Result.sort_key)
+            [Ok(1), Ok(2), Err("a")]
+        """
+        return (res._discriminant, res.inner)
+
+    @staticmethod
+    def collect(iterable: Iterable[Result[T, E]]) -> Result[list[T], E]:
+        """Collects an iterable of ``Result`` values into a ``Result`` of a list, like Rust's
+        ``collect::<Result<Vec<_>, _>>()``. Stops consuming ``iterable`` at the first ``Err``, no
+        exception is raised along the way.
+
+        Args:
+            iterable (Iterable[Result[T, E]]): The results to collect, may be a lazy generator.
+
+        Returns:
+            Result[list[T], E]: ``Ok`` of all contained values, or the first ``Err``.
+
+        Examples::
+
+            >>> Result.collect([Ok(1), Ok(2)])
+            Ok([1, 2])
+
+            >>> Result.collect([Ok(1), Err("first"), Err("second")])
+            Err("first")
+        """
+        values: list[T] = []
+        append = values.append
+        for res in iterable:
+            if res._discriminant:
+                return res
+            append(res.inner)
+        return Ok(values)
+
+    @staticmethod
+    def collect_into(
+        iterable: Iterable[Result[T, E]], into: Callable[[Iterable[T]], C]
+    ) -> Result[C, E]:
+        """Collects the contained values of an iterable of ``Result`` values with ``into`` (e.g.
+        ``set``, ``dict``, ``tuple``, ``"".join``), stopping at the first ``Err``. ``into`` receives
+        a lazy iterator, the values are never materialized in between.
+
+        Args:
+            iterable (Iterable[Result[T, E]]): The results to collect, may be a lazy generator.
+            into (Callable[[Iterable[T]], C]): Consumes the contained values and builds the
+                collection.
+
+        Returns:
+            Result[C, E]: ``Ok`` of the collection, or the first ``Err``.
+
+        Examples::
+
+            >>> Result.collect_into([Ok(("a", 1)), Ok(("b", 2))], dict)
+            Ok({"a": 1, "b": 2})
+
+            >>> Result.collect_into([Ok(1), Err("error")], set)
+            Err("error")
+        """
+        failed: list[Result[T, E]] = []
+        collected = into(_values_until_err(iterable, failed))
+        return failed[0] if failed else Ok(collected)
+
+    @staticmethod
+    def sum(iterable: Iterable[Result[T, E]], start: Any = 0) -> Result[Any, E]:
+        """Sums up the contained values of an iterable of ``Result`` values, stopping at the first
+        ``Err``.
+
+        Args:
+            iterable (Iterable[Result[T, E]]): The results to sum up, may be a lazy generator.
+            start (Any): The start value of the sum. Defaults to ``0``.
+
+        Returns:
+            Result[Any, E]: ``Ok`` of the sum, or the first ``Err``.
+
+        Examples::
+
+            >>> Result.sum([Ok(1), Ok(2)])
+            Ok(3)
+
+            >>> Result.sum([Ok(1), Err("error")])
+            Err("error")
+        """
+        return Result.collect_into(iterable, lambda values: builtins.sum(values, start))
+
+    @staticmethod
+    def product(iterable: Iterable[Result[T, E]], start: Any = 1) -> Result[Any, E]:
+        """Multiplies the contained values of an iterable of ``Result`` values, stopping at the
+        first ``Err``.
+
+        Args:
+            iterable (Iterable[Result[T, E]]): The results to multiply, may be a lazy generator.
+            start (Any): The start value of the product. Defaults to ``1``.
+
+        Returns:
+            Result[Any, E]: ``Ok`` of the product, or the first ``Err``.
+
+        Examples::
+
+            >>> Result.product([Ok(2), Ok(3)])
+            Ok(6)
+
+            >>> Result.product([Err("error"), Ok(3)])
+            Err("error")
+        """
+        return Result.collect_into(iterable, lambda values: math.prod(values, start=start))
+
+    @staticmethod
+    def partition(iterable: Iterable[Result[T, E]]) -> tuple[list[T], list[E]]:
+        """Splits an iterable of ``Result`` values into the contained ``Ok`` values and the
+        contained ``Err`` values in a single pass, keeping the order of both.
+
+        Args:
+            iterable (Iterable[Result[T, E]]): The results to split, may be a lazy generator.
+
+        Returns:
+            tuple[list[T], list[E]]: The contained values of all ``Ok`` and of all ``Err``.
+
+        Examples::
+
+            >>> Result.partition([Ok(1), Err("a"), Ok(2)])
+            ([1, 2], ["a"])
+        """
+        oks: list[T] = []
+        errs: list[E] = []
+        ok_append = oks.append
+        err_append = errs.append
+        for res in iterable:
+            if res._discriminant:
+                err_append(res.inner)
+            else:
+                ok_append(res.inner)
+        return oks, errs
+
+    @staticmethod
+    def partition_indexed(
+        iterable: Iterable[Result[T, E]],
+    ) -> tuple[list[T], list[E], array[int], array[int]]:
+        """Like ``Result.partition``, but additionally returns the positions of the ``Ok`` and
+        ``Err`` values in ``iterable``. The positions are stored compactly as ``array("q")``.
+
+        Args:
+            iterable (Iterable[Result[T, E]]): The results to split, may be a lazy generator.
+
+        Returns:
+            tuple[list[T], list[E], array[int], array[int]]: The contained values of all ``Ok``, of
+            all ``Err`` and the positions of the ``Ok`` and of the ``Err`` values.
+
+        Examples::
+
+            >>> Result.partition_indexed([Ok(1), Err("a"), Ok(2)])
+            ([1, 2], ["a"], array("q", [0, 2]), array("q", [1]))
+        """
+        oks: list[T] = []
+        errs: list[E] = []
+        ok_positions = array("q")
+        err_positions = array("q")
+        append_value = (oks.append, errs.append)
+        append_position = (ok_positions.append, err_positions.append)
+        for i, res in enumerate(iterable):
+            discriminant = res._discriminant
+            append_value[discriminant](res.inner)
+            append_position[discriminant](i)
+        return oks, errs, ok_positions, err_positions
+
     @abstractmethod
     def __eq__(self, other):
         raise NotImplementedError
 
+    @abstractmethod
+    def __hash__(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def __lt__(self, other):
+        raise NotImplementedError
+
+    @abstractmethod
+    def __le__(self, other):
+        raise NotImplementedError
+
+    @abstractmethod
+    def __gt__(self, other):
+        raise NotImplementedError
+
+    @abstractmethod
+    def __ge__(self, other):
+        raise NotImplementedError
+
     @abstractmethod
     def __repr__(self):
         raise NotImplementedError
@@ -809,14 +1039,41 @@ class Result(ABC, Generic[T, E]):
 
 
 class Ok(Result, Generic[T, E]):
+    __slots__ = ("inner",)
+
     inner: T
 
+    _discriminant: ClassVar[int] = 0
+
     def __init__(self, inner: T = None):
         self.inner = inner
 
     def __eq__(self, other):
         return isinstance(other, Ok) and self.inner == other.inner
 
+    def __hash__(self):
+        return hash((Ok, self.inner))
+
+    def __lt__(self, other):
+        if isinstance(other, Ok):
+            return self.inner < other.inner
+        return True if isinstance(other, Err) else NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, Ok):
+            return self.inner <= other.inner
+        return True if isinstance(other, Err) else NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, Ok):
+            return self.inner > other.inner
+        return False if isinstance(other, Err) else NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, Ok):
+            return self.inner >= other.inner
+        return False if isinstance(other, Err) else NotImplemented
+
     def __repr__(self):
         return f"Ok({self.inner})"
 
@@ -842,7 +1099,7 @@ class Ok(Result, Generic[T, E]):
         return o.Nil
 
     def map(self, op: Callable[[T], U]) -> Result[U, E]:
-        return Ok[U, E](op(self.inner))
+        return Ok(op(self.inner))
 
     def map_or(self, default: U, f: Callable[[T], U]) -> U:
         return f(self.inner)
@@ -851,7 +1108,7 @@ class Ok(Result, Generic[T, E]):
         return f(self.inner)
 
     def map_err(self, op: Callable[[E], F]) -> Result[T, F]:
-        return Ok[T, F](self.inner)
+        return self
 
     def inspect(self, op: Callable[[T], None]) -> Result[T, E]:
         op(self.inner)
@@ -882,10 +1139,10 @@ class Ok(Result, Generic[T, E]):
         return op(self.inner)
 
     def or_(self, res: Result[T, F]) -> Result[T, F]:
-        return Ok[T, F](self.inner)
+        return self
 
     def or_else(self, op: Callable[[E], Result[T, F]]) -> Result[T, F]:
-        return Ok[T, F](self.inner)
+        return self
 
     def unwrap_or(self, default: T) -> T:
         return self.inner
@@ -904,14 +1161,41 @@ class Ok(Result, Generic[T, E]):
 
 
 class Err(Result, Generic[T, E]):
+    __slots__ = ("inner",)
+
     inner: E
 
+    _discriminant: ClassVar[int] = 1
+
     def __init__(self, inner: E):
         self.inner = inner
 
     def __eq__(self, other):
         return isinstance(other, Err) and self.inner == other.inner
 
+    def __hash__(self):
+        return hash((Err, self.inner))
+
+    def __lt__(self, other):
+        if isinstance(other, Err):
+            return self.inner < other.inner
+        return False if isinstance(other, Ok) else NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, Err):
+            return self.inner <= other.inner
+        return False if isinstance(other, Ok) else NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, Err):
+            return self.inner > other.inner
+        return True if isinstance(other, Ok) else NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, Err):
+            return self.inner >= other.inner
+        return True if isinstance(other, Ok) else NotImplemented
+
     def __repr__(self):
         return f"Err({self.inner})"
 
@@ -937,7 +1221,7 @@ class Err(Result, Generic[T, E]):
         return o.Some(self.inner)
 
     def map(self, op: Callable[[T], U]) -> Result[U, E]:
-        return Err[U, E](self.inner)
+        return self
 
     def map_or(self, default: U, f: Callable[[T], U]) -> U:
         return default
@@ -946,7 +1230,7 @@ class Err(Result, Generic[T, E]):
         return default(self.inner)
 
     def map_err(self, op: Callable[[E], F]) -> Result[T, F]:
-        return Err[T, F](op(self.inner))
+        return Err(op(self.inner))
 
     def inspect(self, op: Callable[[T], None]) -> Result[T, E]:
         return self
@@ -974,10 +1258,10 @@ class Err(Result, Generic[T, E]):
         return self.inner
 
     def and_(self, res: Result[U, E]) -> Result[U, E]:
-        return Err[U, E](self.inner)
+        return self
 
     def and_then(self, op: Callable[[T], Result[U, E]]) -> Result[U, E]:
-        return Err[U, E](self.inner)
+        return self
 
     def or_(self, res: Result[T, F]) -> Result[T, F]:
         return res
@@ -1001,6 +1285,114 @@ class Err(Result, Generic[T, E]):
         raise ResultException(self.inner)
 
 
+@final
+class FrozenOk(Ok, Generic[T, E]):
+    """Immutable variant of ``Ok``, that can be shared between threads, caches and callers without
+    copying it defensively.
+
+    A ``FrozenOk`` compares and hashes like an ``Ok`` with the same value and supports the same
+    methods. Assigning to its attributes raises an ``AttributeError`` and ``copy.copy`` returns the
+    instance itself. Only the wrapper is frozen, to share it safely the contained value has to be
+    immutable as well.
+
+    Examples::
+
+        >>> FrozenOk(1) == Ok(1)
+        True
+
+        >>> FrozenOk(1).inner = 2
+        AttributeError: Can not assign to 'inner' of a FrozenOk
+    """
+
+    __slots__ = ()
+
+    def __init__(self, inner: T = None):
+        object.__setattr__(self, "inner", inner)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Can not assign to '{name}' of a FrozenOk")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Can not delete '{name}' of a FrozenOk")
+
+    def __copy__(self):
+        return self
+
+    def __reduce__(self):
+        return FrozenOk, (self.inner,)
+
+
+@final
+class FrozenErr(Err, Generic[T, E]):
+    """Immutable variant of ``Err``, that can be shared between threads, caches and callers without
+    copying it defensively.
+
+    A ``FrozenErr`` compares and hashes like an ``Err`` with the same value and supports the same
+    methods. Assigning to its attributes raises an ``AttributeError`` and ``copy.copy`` returns the
+    instance itself. Only the wrapper is frozen, to share it safely the contained value has to be
+    immutable as well.
+
+    Examples::
+
+        >>> FrozenErr("error") == Err("error")
+        True
+
+        >>> FrozenErr("error").inner = "other"
+        AttributeError: Can not assign to 'inner' of a FrozenErr
+    """
+
+    __slots__ = ()
+
+    def __init__(self, inner: E):
+        object.__setattr__(self, "inner", inner)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Can not assign to '{name}' of a FrozenErr")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Can not delete '{name}' of a FrozenErr")
+
+    def __copy__(self):
+        return self
+
+    def __reduce__(self):
+        return FrozenErr, (self.inner,)
+
+
+def _values_until_err(iterable: Iterable[Result[T, E]], failed: list[Result[T, E]]) -> Iterator[T]:
+    for res in iterable:
+        if res._discriminant:
+            failed.append(res)
+            return
+        yield res.inner
+
+
+def is_result(value: Any) -> bool:
+    """Returns ``True`` if ``value`` is a ``Result`` (``Ok`` or ``Err``), by comparing the class
+    tag of ``value``. Meant as a predicate, e.g. for ``filter(is_result, values)``. The
+    function call makes it slower than ``isinstance(value, Result)``, which should be preferred
+    in hot loops.
+
+    Args:
+        value (Any): The value to check.
+
+    Returns:
+        bool: ``True`` if ``value`` is a ``Result``, ``False`` otherwise.
+
+    Examples::
+
+        >>> is_result(Ok(1))
+        True
+
+        >>> is_result(Err("Some error message"))
+        True
+
+        >>> is_result(1)
+        False
+    """
+    return getattr(value, "_rusttypes_tag", None) == "result"
+
+
 #
 #  --- DECORATORS ---
 #
@@ -1009,21 +1401,37 @@ Fn = Callable[..., Result[T, E]]
 
 
 def catch(
-    *exceptions: type[BaseException], map_err: Callable[[BaseException], E] = stringify
+    *exceptions: type[BaseException],
+    map_err: Callable[[BaseException], E] = stringify,
+    on_error: str = "stop",
 ) -> Callable[[Fn], Fn]:
     """Catch specified exceptions and return them as ``Err``. If no exceptions are specified, catch
     all exceptions. Use the ``map_err`` function to map the caught exception to the error type of
-    the ``Result``.
+    the ``Result``. Coroutine functions are wrapped by a coroutine function, which catches the
+    exceptions raised while the coroutine is awaited.
+
+    Generator functions (sync and async) are wrapped by a generator function that passes the items
+    through unbuffered. With ``on_error="stop"``, a caught exception ends the stream with a final
+    ``Err`` item. With ``on_error="continue"``, the bodies of the outermost loops of the generator
+    are rewritten to yield the ``Err`` and continue with the next iteration; exceptions raised
+    outside of these loops still end the stream.
 
     Args:
         *exceptions (Type[BaseException]): The exceptions to catch.
         map_err (Callable[[BaseException], E]): The function to map the caught exception to the
             error type of the ``Result``. Defaults to ``rusttypes.misc.stringify``.
+        on_error (str): ``"stop"`` or ``"continue"``, see above. Only used for generator
+            functions. Defaults to ``"stop"``.
 
     Returns:
         Callable[[Callable[..., Result[T, E]]], Callable[..., Result[T, E]]]: Decorator that catches
             the specified exceptions and returns them as ``Err``.
 
+    Raises:
+        ValueError: If ``on_error`` is invalid.
+        TypeError: If ``on_error="continue"`` is used for a generator function without loops or
+            whose source can not be recompiled (see ``try_guard``).
+
     Examples:
 
         Lets say we have a function that parses a string to an integer. If the string is not a valid
@@ -1045,30 +1453,43 @@ def catch(
     if len(exceptions) <= 0:
         exceptions = (BaseException,)
 
-    def decorator(fn: Fn) -> Fn:
-        @wraps(fn)
-        def wrapper(*args: Any, **kwargs: Any) -> Result[T, E]:
-            try:
-                return fn(*args, **kwargs)
-            except exceptions as e:
-                return Err(map_err(e))
+    def to_err(e: BaseException) -> Result[T, E]:
+        return Err(map_err(e))
 
-        return wrapper
+    def decorator(fn: Fn) -> Fn:
+        return _guard(fn, exceptions, to_err, on_error)
 
     return decorator
 
 
-def try_guard(fn: Fn) -> Fn:
+def try_guard(fn: Optional[Fn] = None, *, optimize: bool = False, on_error: str = "stop") -> Any:
     """Bubble up ``Err`` that are thrown inside the function. If an ``Err`` is thrown, it is
     returned as is. This is useful in combination with the ``Result::try_`` method.
 
     Works in conjunction with the ``Result::try_`` function similar to the ``?`` operator in Rust.
+    Coroutine functions are wrapped by a coroutine function, which catches the ``Err`` thrown while
+    the coroutine is awaited. Generator functions (sync and async) yield the ``Err`` as item, see
+    ``catch`` for the ``on_error`` policies.
+
+    With ``optimize=True``, the source of the function is rewritten at definition time, so that
+    every ``expr.try_()`` in a statement of the function body becomes an inline check with an early
+    ``return`` of the ``Err``, instead of raising and catching a ``ResultException``. Calls that can
+    not be rewritten without changing the semantics of the function (e.g. inside lambdas,
+    comprehensions or ``try``/``with`` blocks, or after a global or attribute lookup in the same
+    statement, like ``Ok(r.try_())``) and functions that can not be recompiled (closures,
+    generators, functions without source, ...) keep the exception-based behaviour. Assign the
+    values of ``try_`` to local variables to have them rewritten.
 
     Args:
         fn (Callable[..., Result[T, E]]): The function to wrap.
+        optimize (bool): Whether to rewrite the ``try_`` calls into early returns. Defaults to
+            ``False``.
+        on_error (str): ``"stop"`` or ``"continue"``, see ``catch``. Only used for generator
+            functions. Defaults to ``"stop"``.
 
     Returns:
-        Callable[..., Result[T, E]]: Wrapped function that bubbles up ``Err``.
+        Callable[..., Result[T, E]]: Wrapped function that bubbles up ``Err``. If ``fn`` is omitted,
+            a decorator with the given options is returned.
 
     Examples:
 
@@ -1092,13 +1513,238 @@ def try_guard(fn: Fn) -> Fn:
             >>> parse_int_array("42 foo 1337")
             Err("invalid literal for int() with base 10: 'foo'")
 
+        The optimized mode avoids the cost of raising an exception for every ``Err``::
+
+            @try_guard(optimize=True)
+            def parse_pair(s: str) -> Result[int, str]:
+                a, b = s.split(",")
+                x = parse_int(a).try_()
+                y = parse_int(b).try_()
+                return Ok(x + y)
+
+    """
+
+    if fn is None:
+        return lambda fn: try_guard(fn, optimize=optimize, on_error=on_error)
+    if optimize:
+        fn = _try.hoist_try_calls(fn, _TRY_RUNTIME) or fn
+    return _guard(fn, (ResultException,), _result_exception_to_err, on_error)
+
+
+def _result_exception_to_err(e: ResultException[E]) -> Result[Any, E]:
+    return Err(e.inner)
+
+
+def _guard(
+    fn: Callable[..., Any],
+    exceptions: tuple[type[BaseException], ...],
+    to_err: Callable[[Any], Result[Any, Any]],
+    on_error: str,
+) -> Any:
+    """Wraps ``fn`` (a function, coroutine function, generator function or async generator
+    function), so that the ``exceptions`` it raises are returned (or yielded) as ``to_err(e)``."""
+    if on_error not in ("stop", "continue"):
+        raise ValueError(f"on_error must be 'stop' or 'continue', not {on_error!r}")
+    if inspect.iscoroutinefunction(fn) or inspect.isasyncgenfunction(fn):
+        # never turn the cancellation of a task into an Err
+        from asyncio import CancelledError
+
+        reraise: tuple[type[BaseException], ...] = (GeneratorExit, CancelledError)
+    else:
+        reraise = (GeneratorExit,)
+
+    if on_error == "continue" and (
+        inspect.isgeneratorfunction(fn) or inspect.isasyncgenfunction(fn)
+    ):
+        env = {
+            "__rusttypes_reraise__": reraise,
+            "__rusttypes_exceptions__": exceptions,
+            "__rusttypes_to_err__": to_err,
+        }
+        rewritten = _try.guard_loop_bodies(fn, env)
+        if rewritten is None:
+            raise TypeError(
+                f"on_error='continue' requires {fn.__qualname__} to have a loop and a source that "
+                "can be recompiled"
+            )
+        fn = rewritten
+
+    if inspect.iscoroutinefunction(fn):
+
+        @wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await fn(*args, **kwargs)
+            except reraise:
+                raise
+            except exceptions as e:
+                return to_err(e)
+
+        return async_wrapper
+
+    if inspect.isgeneratorfunction(fn):
+
+        @wraps(fn)
+        def generator_wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return (yield from fn(*args, **kwargs))
+            except reraise:
+                raise
+            except exceptions as e:
+                yield to_err(e)
+
+        return generator_wrapper
+
+    if inspect.isasyncgenfunction(fn):
+
+        @wraps(fn)
+        async def async_generator_wrapper(*args: Any, **kwargs: Any) -> Any:
+            agen = fn(*args, **kwargs)
+            try:
+                async for item in agen:
+                    yield item
+            except reraise:
+                raise
+            except exceptions as e:
+                yield to_err(e)
+            finally:
+                await agen.aclose()
+
+        return async_generator_wrapper
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return fn(*args, **kwargs)
+        except exceptions as e:
+            return to_err(e)
+
+    return wrapper
+
+
+@final
+class Done(Generic[T]):
+    """Marks the result of a ``do_async`` block. Async generators can not ``return`` a value, so the
+    block yields ``Done(result)`` instead.
+
+    Args:
+        value (T): The result of the block.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: T) -> None:
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"Done({self.value!r})"
+
+
+def do(fn: Callable[..., Generator[Any, Any, Result[T, E]]]) -> Fn:
+    """Runs a generator function as do-block: every ``value = yield result`` unwraps an ``Ok`` into
+    ``value``, an ``Err`` ends the block and is returned as is. The ``return`` value of the
+    generator is the result of the block.
+
+    Unlike ``try_guard``, no exception is raised to short-circuit: the generator is simply closed
+    (which still runs its ``finally`` blocks). Yielding anything but a ``Result`` raises a
+    ``TypeError`` at the ``yield``.
+
+    Args:
+        fn (Callable[..., Generator[Result[Any, E], Any, Result[T, E]]]): The generator function.
+
+    Returns:
+        Callable[..., Result[T, E]]: Function that runs the do-block.
+
+    Examples::
+
+        >>> @do
+        ... def parse_pair(s: str):
+        ...     a, b = s.split(",")
+        ...     x = yield parse_int(a)
+        ...     y = yield parse_int(b)
+        ...     return Ok(x + y)
+
+        >>> parse_pair("1,2")
+        Ok(3)
+
+        >>> parse_pair("1,foo")
+        Err("invalid literal for int() with base 10: 'foo'")
     """
 
     @wraps(fn)
     def wrapper(*args: Any, **kwargs: Any) -> Result[T, E]:
+        gen = fn(*args, **kwargs)
+        send = gen.send
         try:
-            return fn(*args, **kwargs)
-        except ResultException as e:
-            return Err(e.inner)
+            value = send(None)
+            while True:
+                if isinstance(value, Ok):
+                    value = send(value.inner)
+                elif isinstance(value, Err):
+                    gen.close()
+                    return value
+                else:
+                    value = gen.throw(TypeError(f"do-block yielded {value!r}, expected a Result"))
+        except StopIteration as e:
+            return e.value
+
+    return wrapper
+
+
+def do_async(
+    fn: Callable[..., AsyncGenerator[Any, Any]],
+) -> Callable[..., Coroutine[Any, Any, Result[T, E]]]:
+    """Async variant of ``do`` for async generator functions, which can ``await`` between the
+    steps. As async generators can not ``return`` a value, the block ends with
+    ``yield Done(result)``.
+
+    Args:
+        fn (Callable[..., AsyncGenerator[Any, Any]]): The async generator function.
+
+    Returns:
+        Callable[..., Coroutine[Any, Any, Result[T, E]]]: Coroutine function that runs the
+            do-block.
+
+    Raises:
+        RuntimeError: If the block ends without yielding ``Done``.
+
+    Examples::
+
+        >>> @do_async
+        ... async def fetch_pair(a: str, b: str):
+        ...     x = yield await fetch(a)
+        ...     y = yield await fetch(b)
+        ...     yield Done(Ok(x + y))
+    """
+
+    @wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Result[T, E]:
+        gen = fn(*args, **kwargs)
+        asend = gen.asend
+        try:
+            value = await asend(None)
+            while True:
+                if isinstance(value, Ok):
+                    value = await asend(value.inner)
+                elif isinstance(value, Err):
+                    await gen.aclose()
+                    return value
+                elif isinstance(value, Done):
+                    await gen.aclose()
+                    return value.value
+                else:
+                    error = TypeError(f"do-block yielded {value!r}, expected a Result or Done")
+                    value = await gen.athrow(error)
+        except StopAsyncIteration:
+            pass
+        panic("do_async block ended without yielding Done")
 
     return wrapper
+
+
+_TRY_RUNTIME: Final = {
+    "__rusttypes_ok__": frozenset({Ok, FrozenOk}),
+    "__rusttypes_err__": frozenset({Err, FrozenErr}),
+    "__rusttypes_type__": builtins.type,
+}
+"""Closure variables of the functions rewritten by ``try_guard(optimize=True)``."""
@@ -0,0 +1,324 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Sparse storage of long, mostly ``Nil`` sequences of ``Option`` values.
+
+A ``SparseOptionVector`` only stores the ``Some`` elements: a sorted ``array("q")`` of their
+indices and their values (an ``array.array`` for a typecode, a ``list`` otherwise). The ``Nil``
+elements cost nothing, point lookups are binary searches and return the shared ``Nil`` singleton,
+and ``map``/``filter`` only visit the stored values.
+
+Examples::
+
+    >>> from rusttypes.sparse import SparseOptionVector
+    >>> vec = SparseOptionVector.from_optionals([None, 2, None, None, 5])
+    >>> vec[1], vec[2]
+    (Some(2), Nil)
+
+    >>> list(vec.map(lambda x: x * 10).items())
+    [(1, 20), (4, 50)]
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from typing import Any, Callable, Generic, Iterable, Iterator, Optional, TypeVar, final
+
+from . import _columns
+from .option import Nil, Option, Some
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+
+@final
+class SparseOptionVector(Generic[T]):
+    """Immutable sequence of ``length`` ``Option`` values, of which only the ``Some`` elements are
+    stored.
+
+    ``SparseOptionVector`` is usually created with ``from_options``, ``from_optionals`` or
+    ``from_items``. The constructor takes the raw columns: element ``indices[k]`` is
+    ``Some(values[k])``, every other element is ``Nil``.
+
+    Args:
+        length (int): The number of elements.
+        indices (Iterable[int]): The strictly increasing indices of the ``Some`` elements.
+        values (Iterable[T]): The values of the ``Some`` elements, in the order of ``indices``.
+        typecode (Optional[str]): The ``array`` typecode of the values, ``None`` for arbitrary
+            Python objects. Defaults to ``None``.
+
+    Examples::
+
+        >>> SparseOptionVector(4, [1, 3], ["a", "b"])
+        SparseOptionVector(4, {1: 'a', 3: 'b'})
+    """
+
+    __slots__ = ("_length", "_indices", "_values", "_typecode")
+
+    def __init__(
+        self,
+        length: int,
+        indices: Iterable[int] = (),
+        values: Iterable[T] = (),
+        typecode: Optional[str] = None,
+    ) -> None:
+        if not isinstance(indices, array) or indices.typecode != "q":
+            indices = array("q", indices)
+        values = _columns.make_array(values, typecode)
+        if len(indices) != len(values):
+            raise ValueError(f"got {len(values)} values for {len(indices)} indices")
+        if indices and not (indices[0] >= 0 and indices[-1] < length):
+            raise ValueError(f"indices out of range for length {length}")
+        if any(a >= b for a, b in zip(indices, indices[1:], strict=False)):
+            raise ValueError("indices must be strictly increasing")
+
+        self._length = length
+        self._indices = indices
+        self._values = values
+        self._typecode = typecode
+
+    @staticmethod
+    def from_options(
+        options: Iterable[Option[T]], typecode: Optional[str] = None
+    ) -> SparseOptionVector[T]:
+        """Creates a ``SparseOptionVector`` from ``Option`` values.
+
+        Args:
+            options (Iterable[Option[T]]): The options to store.
+            typecode (Optional[str]): The ``array`` typecode of the contained values, ``None`` for
+                arbitrary Python objects. Defaults to ``None``.
+
+        Returns:
+            SparseOptionVector[T]: The stored options.
+
+        Examples::
+
+            >>> SparseOptionVector.from_options([Nil, Some(1), Nil])
+            SparseOptionVector(3, {1: 1})
+        """
+        indices = array("q")
+        values: list[T] = []
+        append_index = indices.append
+        append_value = values.append
+        length = 0
+        for opt in options:
+            if opt._discriminant:
+                append_index(length)
+                append_value(opt.inner)
+            length += 1
+        present = _columns.make_array(values, typecode)
+        return SparseOptionVector._with(length, indices, present, typecode)
+
+    @staticmethod
+    def from_optionals(
+        values: Iterable[Optional[T]], typecode: Optional[str] = None
+    ) -> SparseOptionVector[T]:
+        """Creates a ``SparseOptionVector`` from ``Optional`` values, where ``None`` is ``Nil``.
+
+        Args:
+            values (Iterable[Optional[T]]): The values to store.
+            typecode (Optional[str]): The ``array`` typecode of the contained values, ``None`` for
+                arbitrary Python objects. Defaults to ``None``.
+
+        Returns:
+            SparseOptionVector[T]: The stored values.
+
+        Examples::
+
+            >>> SparseOptionVector.from_optionals([None, 1.5, None], typecode="d")
+            SparseOptionVector(3, {1: 1.5})
+        """
+        values = values if isinstance(values, list) else list(values)
+        mask = bytes([v is not None for v in values])
+        indices = array("q", compress(range(len(values)), mask))
+        present = _columns.make_array(compress(values, mask), typecode)
+        return SparseOptionVector._with(len(values), indices, present, typecode)
+
+    @staticmethod
+    def from_items(
+        length: int, items: Iterable[tuple[int, T]], typecode: Optional[str] = None
+    ) -> SparseOptionVector[T]:
+        """Creates a ``SparseOptionVector`` of ``length`` elements from ``(index, value)`` pairs of
+        the ``Some`` elements, in any order.
+
+        Args:
+            length (int): The number of elements.
+            items (Iterable[tuple[int, T]]): The indices and values of the ``Some`` elements, e.g.
+                ``dict.items()``.
+            typecode (Optional[str]): The ``array`` typecode of the values, ``None`` for arbitrary
+                Python objects. Defaults to ``None``.
+
+        Returns:
+            SparseOptionVector[T]: The stored values.
+
+        Examples::
+
+            >>> SparseOptionVector.from_items(5, {3: "b", 0: "a"}.items())
+            SparseOptionVector(5, {0: 'a', 3: 'b'})
+        """
+        items = sorted(items, key=lambda item: item[0])
+        return SparseOptionVector(length, (i for i, _ in items), (v for _, v in items), typecode)
+
+    @property
+    def typecode(self) -> Optional[str]:
+        """The typecode of the values, ``None`` if they are arbitrary Python objects."""
+        return self._typecode
+
+    @property
+    def indices(self) -> array[int]:
+        """The indices of the ``Some`` elements, in increasing order."""
+        return self._indices
+
+    @property
+    def values(self) -> Any:
+        """The values of the ``Some`` elements, in the order of ``indices``."""
+        return self._values
+
+    def items(self) -> Iterator[tuple[int, T]]:
+        """Iterates over the index and value of every ``Some`` element, skipping all ``Nil``
+        elements.
+
+        Examples::
+
+            >>> list(SparseOptionVector.from_optionals([None, "a", None, "b"]).items())
+            [(1, 'a'), (3, 'b')]
+        """
+        return zip(self._indices, self._values, strict=True)
+
+    def count_some(self) -> int:
+        """Returns the number of ``Some`` elements."""
+        return len(self._indices)
+
+    def count_nil(self) -> int:
+        """Returns the number of ``Nil`` elements."""
+        return self._length - len(self._indices)
+
+    def to_options(self) -> list[Option[T]]:
+        """Returns the elements as a dense list of ``Some``/``Nil``.
+
+        Examples::
+
+            >>> SparseOptionVector.from_items(3, [(1, "a")]).to_options()
+            [Nil, Some(a), Nil]
+        """
+        options: list[Option[T]] = [Nil] * self._length
+        for i, v in zip(self._indices, self._values, strict=True):
+            options[i] = Some(v)
+        return options
+
+    def to_optionals(self) -> list[Optional[T]]:
+        """Returns the elements as a dense list of ``Optional`` values, where ``Nil`` is ``None``.
+
+        Examples::
+
+            >>> SparseOptionVector.from_items(3, [(1, "a")]).to_optionals()
+            [None, 'a', None]
+        """
+        values: list[Optional[T]] = [None] * self._length
+        for i, v in zip(self._indices, self._values, strict=True):
+            values[i] = v
+        return values
+
+    def map(self, op: Callable[[T], U], typecode: Any = _columns.SAME) -> SparseOptionVector[U]:
+        """Maps the values of all ``Some`` elements with ``op``, only the stored values are
+        visited.
+
+        Args:
+            op (Callable[[T], U]): The function to apply.
+            typecode (Optional[str]): The typecode of the result. Defaults to the typecode of this
+                vector.
+
+        Returns:
+            SparseOptionVector[U]: The mapped elements, sharing the indices with this vector.
+
+        Examples::
+
+            >>> vec = SparseOptionVector.from_optionals([None, 1, None])
+            >>> vec.map(lambda x: x + 1).to_optionals()
+            [None, 2, None]
+        """
+        if typecode is _columns.SAME:
+            typecode = self._typecode
+        values = _columns.make_array(map(op, self._values), typecode)
+        return SparseOptionVector._with(self._length, self._indices, values, typecode)
+
+    def filter(self, predicate: Callable[[T], bool]) -> SparseOptionVector[T]:
+        """Turns all ``Some`` elements, for which ``predicate`` returns ``False``, into ``Nil``.
+        Only the stored values are visited.
+
+        Args:
+            predicate (Callable[[T], bool]): The predicate to check the values against.
+
+        Returns:
+            SparseOptionVector[T]: The filtered elements.
+
+        Examples::
+
+            >>> vec = SparseOptionVector.from_optionals([None, 1, 2])
+            >>> vec.filter(lambda x: x % 2 == 0).to_optionals()
+            [None, None, 2]
+        """
+        keep = bytes([bool(predicate(v)) for v in self._values])
+        indices = array("q", compress(self._indices, keep))
+        values = _columns.make_array(compress(self._values, keep), self._typecode)
+        return SparseOptionVector._with(self._length, indices, values, self._typecode)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Option[T]]:
+        start = 0
+        for i, v in zip(self._indices, self._values, strict=True):
+            for _ in range(start, i):
+                yield Nil
+            yield Some(v)
+            start = i + 1
+        for _ in range(start, self._length):
+            yield Nil
+
+    def __getitem__(self, index: int) -> Option[T]:
+        i = index + self._length if index < 0 else index
+        if not 0 <= i < self._length:
+            raise IndexError("SparseOptionVector index out of range")
+        indices = self._indices
+        k = bisect_left(indices, i)
+        if k < len(indices) and indices[k] == i:
+            return Some(self._values[k])
+        return Nil
+
+    def __repr__(self) -> str:
+        return f"SparseOptionVector({self._length}, {dict(self.items())!r})"
+
+    @staticmethod
+    def _with(
+        length: int, indices: array[int], values: Any, typecode: Optional[str]
+    ) -> SparseOptionVector[Any]:
+        return _columns.unchecked(
+            SparseOptionVector, _length=length, _indices=indices, _values=values, _typecode=typecode
+        )
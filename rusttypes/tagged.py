@@ -0,0 +1,277 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Allocation free ``Result`` functions over tagged tuples.
+
+A tagged tuple ``(0, value)`` represents ``Ok(value)`` and ``(1, error)`` represents ``Err(error)``.
+Every method of ``Result`` has a function counterpart here, prefixed with ``res_``, that works on
+tagged tuples instead of ``Ok``/``Err`` instances (``res_map(t, op)`` is ``Result.map(op)``). The
+tags are the same as the ones used by ``Result.sort_key``, so tagged tuples sort like ``Result``
+values.
+
+Passthrough operations (e.g. ``res_map`` on an error) return the given tuple as is, functions that
+return an ``Option`` in ``Result`` return a Python ``Optional`` (see ``rusttypes.optional``).
+
+Examples::
+
+    >>> from rusttypes.tagged import ok, err, res_map, res_unwrap_or
+    >>> res_map(ok(2), lambda x: x * 2)
+    (0, 4)
+
+    >>> res_unwrap_or(res_map(err("error"), lambda x: x * 2), 0)
+    0
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Final, Literal, Optional, TypeVar, Union
+
+from .misc import panic
+from .result import Err, Ok, Result, ResultException
+
+T = TypeVar("T")
+E = TypeVar("E")
+U = TypeVar("U")
+F = TypeVar("F")
+
+OK: Final = 0
+"""Tag of a successful tagged tuple."""
+
+ERR: Final = 1
+"""Tag of an error tagged tuple."""
+
+Tagged = Union[tuple[Literal[0], T], tuple[Literal[1], E]]
+"""Tagged tuple encoding of ``Result[T, E]``."""
+
+
+def ok(value: T = None) -> Tagged[T, Any]:
+    """Returns the tagged tuple of ``Ok(value)``."""
+    return (OK, value)
+
+
+def err(error: E) -> Tagged[Any, E]:
+    """Returns the tagged tuple of ``Err(error)``."""
+    return (ERR, error)
+
+
+def from_result(res: Result[T, E]) -> Tagged[T, E]:
+    """Converts a ``Result`` into a tagged tuple.
+
+    Examples::
+
+        >>> from_result(Ok(1))
+        (0, 1)
+
+        >>> from_result(Err("error"))
+        (1, "error")
+    """
+    return (res._discriminant, res.inner)
+
+
+def to_result(t: Tagged[T, E]) -> Result[T, E]:
+    """Converts a tagged tuple into a ``Result``.
+
+    Examples::
+
+        >>> to_result((0, 1))
+        Ok(1)
+
+        >>> to_result((1, "error"))
+        Err("error")
+    """
+    return Err(t[1]) if t[0] else Ok(t[1])
+
+
+def from_fn(fn: Callable[[], T], err_t: type[E] | tuple[type[E], ...] = Exception) -> Tagged[T, E]:
+    """See ``Result.from_fn``. Returns a tagged tuple instead of a ``Result``.
+
+    Examples::
+
+        >>> from_fn(lambda: int("42"))
+        (0, 42)
+
+        >>> from_fn(lambda: int("foo"))
+        (1, ValueError("invalid literal for int() with base 10: 'foo'"))
+    """
+    try:
+        return (OK, fn())
+    except err_t as e:
+        return (ERR, e)
+
+
+def res_is_ok(t: Tagged[T, E]) -> bool:
+    """See ``Result.is_ok``."""
+    return not t[0]
+
+
+def res_is_ok_and(t: Tagged[T, E], f: Callable[[T], bool]) -> bool:
+    """See ``Result.is_ok_and``."""
+    return not t[0] and f(t[1])
+
+
+def res_is_err(t: Tagged[T, E]) -> bool:
+    """See ``Result.is_err``."""
+    return bool(t[0])
+
+
+def res_is_err_and(t: Tagged[T, E], f: Callable[[E], bool]) -> bool:
+    """See ``Result.is_err_and``."""
+    return bool(t[0]) and f(t[1])
+
+
+def res_ok(t: Tagged[T, E]) -> Optional[T]:
+    """See ``Result.ok``. Returns the contained value or ``None`` for an error."""
+    return None if t[0] else t[1]
+
+
+def res_err(t: Tagged[T, E]) -> Optional[E]:
+    """See ``Result.err``. Returns the contained error or ``None`` for a success."""
+    return t[1] if t[0] else None
+
+
+def res_map(t: Tagged[T, E], op: Callable[[T], U]) -> Tagged[U, E]:
+    """See ``Result.map``."""
+    return t if t[0] else (OK, op(t[1]))
+
+
+def res_map_or(t: Tagged[T, E], default: U, f: Callable[[T], U]) -> U:
+    """See ``Result.map_or``."""
+    return default if t[0] else f(t[1])
+
+
+def res_map_or_else(t: Tagged[T, E], default: Callable[[E], U], f: Callable[[T], U]) -> U:
+    """See ``Result.map_or_else``."""
+    return default(t[1]) if t[0] else f(t[1])
+
+
+def res_map_err(t: Tagged[T, E], op: Callable[[E], F]) -> Tagged[T, F]:
+    """See ``Result.map_err``."""
+    return (ERR, op(t[1])) if t[0] else t
+
+
+def res_inspect(t: Tagged[T, E], op: Callable[[T], None]) -> Tagged[T, E]:
+    """See ``Result.inspect``."""
+    if not t[0]:
+        op(t[1])
+    return t
+
+
+def res_inspect_err(t: Tagged[T, E], op: Callable[[E], None]) -> Tagged[T, E]:
+    """See ``Result.inspect_err``."""
+    if t[0]:
+        op(t[1])
+    return t
+
+
+def res_expect(t: Tagged[T, E], msg: str) -> T:
+    """See ``Result.expect``."""
+    if t[0]:
+        panic(msg)
+    return t[1]
+
+
+def res_unwrap(t: Tagged[T, E]) -> T:
+    """See ``Result.unwrap``."""
+    if t[0]:
+        panic("Called unwrap on Err")
+    return t[1]
+
+
+def res_unwrap_or_default(t: Tagged[T, E], ty: type[T]) -> T:
+    """See ``Result.unwrap_or_default``."""
+    if not t[0]:
+        return t[1]
+    try:
+        return ty.default()
+    except AttributeError:
+        panic("Called unwrap_or_default on Err without t implementing default() function")
+
+
+def res_expect_err(t: Tagged[T, E], msg: str) -> E:
+    """See ``Result.expect_err``."""
+    if not t[0]:
+        panic(msg)
+    return t[1]
+
+
+def res_unwrap_err(t: Tagged[T, E]) -> E:
+    """See ``Result.unwrap_err``."""
+    if not t[0]:
+        panic("Called unwrap_err on Ok")
+    return t[1]
+
+
+def res_and(t: Tagged[T, E], res: Tagged[U, E]) -> Tagged[U, E]:
+    """See ``Result.and_``."""
+    return t if t[0] else res
+
+
+def res_and_then(t: Tagged[T, E], op: Callable[[T], Tagged[U, E]]) -> Tagged[U, E]:
+    """See ``Result.and_then``. ``op`` has to return a tagged tuple."""
+    return t if t[0] else op(t[1])
+
+
+def res_or(t: Tagged[T, E], res: Tagged[T, F]) -> Tagged[T, F]:
+    """See ``Result.or_``."""
+    return res if t[0] else t
+
+
+def res_or_else(t: Tagged[T, E], op: Callable[[E], Tagged[T, F]]) -> Tagged[T, F]:
+    """See ``Result.or_else``. ``op`` has to return a tagged tuple."""
+    return op(t[1]) if t[0] else t
+
+
+def res_unwrap_or(t: Tagged[T, E], default: T) -> T:
+    """See ``Result.unwrap_or``."""
+    return default if t[0] else t[1]
+
+
+def res_unwrap_or_else(t: Tagged[T, E], op: Callable[[E], T]) -> T:
+    """See ``Result.unwrap_or_else``."""
+    return op(t[1]) if t[0] else t[1]
+
+
+def res_unwrap_unchecked(t: Tagged[T, E]) -> T:
+    """See ``Result.unwrap_unchecked``."""
+    if t[0]:
+        panic("Called unwrap_unchecked on Err")
+    return t[1]
+
+
+def res_unwrap_err_unchecked(t: Tagged[T, E]) -> E:
+    """See ``Result.unwrap_err_unchecked``."""
+    if not t[0]:
+        panic("Called unwrap_err_unchecked on Ok")
+    return t[1]
+
+
+def res_try(t: Tagged[T, E]) -> T:
+    """See ``Result.try_``. Works with the ``rusttypes.result.try_guard`` decorator, which returns
+    the error as ``Err``."""
+    if t[0]:
+        raise ResultException(t[1])
+    return t[1]
@@ -0,0 +1,202 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+import asyncio
+
+from rusttypes.aio import (
+    AsyncResult,
+    as_completed_results,
+    gather_results,
+    hedge,
+    settle_results,
+)
+from rusttypes.parallel import HedgeStats
+from rusttypes.result import Err, Ok, Result
+
+
+def run(awaitable):
+    async def main():
+        return await awaitable
+
+    return asyncio.run(main())
+
+
+async def fetch(x: int) -> Result[int, str]:
+    await asyncio.sleep(0)
+    return Ok(x) if x >= 0 else Err("negative")
+
+
+async def async_double(x: int) -> int:
+    await asyncio.sleep(0)
+    return 2 * x
+
+
+def test_async_result_map():
+    assert run(AsyncResult(fetch(1)).map(lambda x: x + 1)) == Ok(2)
+    assert run(AsyncResult(fetch(1)).map(async_double).map(str)) == Ok("2")
+    assert run(AsyncResult(fetch(-1)).map(async_double)) == Err("negative")
+    assert run(AsyncResult(fetch(-1)).map_err(str.upper)) == Err("NEGATIVE")
+    assert run(AsyncResult(fetch(1)).map_err(str.upper)) == Ok(1)
+
+
+def test_async_result_and_then():
+    assert run(AsyncResult(fetch(1)).and_then(fetch)) == Ok(1)
+    assert run(AsyncResult(fetch(1)).and_then(lambda x: fetch(-x))) == Err("negative")
+    assert run(AsyncResult(fetch(1)).and_then(lambda x: Ok(x + 1))) == Ok(2)
+    assert run(AsyncResult(fetch(-1)).and_then(fetch)) == Err("negative")
+    assert run(AsyncResult(fetch(-1)).or_else(lambda e: fetch(len(e)))) == Ok(8)
+    assert run(AsyncResult(fetch(-1)).or_else(lambda e: Ok(e))) == Ok("negative")
+    assert run(AsyncResult(fetch(1)).or_else(lambda e: Ok(e))) == Ok(1)
+
+
+def test_async_result_inspect():
+    seen = []
+
+    async def record(x: int) -> None:
+        seen.append(x)
+
+    chain = AsyncResult(fetch(1)).inspect(record).inspect(seen.append).inspect_err(seen.append)
+    assert run(chain) == Ok(1)
+    assert seen == [1, 1]
+    chain = AsyncResult(fetch(-1)).inspect(record).inspect_err(record)
+    assert run(chain) == Err("negative")
+    assert seen == [1, 1, "negative"]
+
+
+def test_async_result_shares_prefix():
+    base = AsyncResult.from_result(Ok(1)).map(lambda x: x + 1)
+    assert run(base.map(str)) == Ok("2")
+    assert run(AsyncResult.from_result(Err("e")).map(str)) == Err("e")
+    assert repr(base.map(str)).endswith("<lambda>).map(str)")
+
+
+async def slow(x: int, delay: float, log: list) -> Result[int, str]:
+    try:
+        await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        log.append(("cancelled", x))
+        raise
+    log.append(("done", x))
+    return Ok(x) if x >= 0 else Err(f"negative {x}")
+
+
+async def boom() -> Result[int, str]:
+    raise ValueError("boom")
+
+
+def test_gather_results():
+    log: list = []
+    assert asyncio.run(gather_results(fetch(1), fetch(2), fetch(3))) == Ok([1, 2, 3])
+    assert asyncio.run(gather_results()) == Ok([])
+
+    aws = [slow(1, 0.01, log), slow(-2, 0, log), slow(3, 10, log)]
+    assert asyncio.run(gather_results(*aws)) == Err("negative -2")
+    assert ("cancelled", 1) in log and ("cancelled", 3) in log
+
+    log.clear()
+    aws = [slow(-1, 0.02, log), slow(-2, 0, log), slow(3, 0.01, log)]
+    assert asyncio.run(gather_results(*aws, fail_fast=False)) == Err("negative -1")
+    assert sorted(log) == [("done", -2), ("done", -1), ("done", 3)]
+
+    try:
+        asyncio.run(gather_results(fetch(1), boom()))
+        raise AssertionError()
+    except ValueError:
+        pass
+
+
+def test_gather_results_limit():
+    running = []
+    peak = []
+
+    async def tracked(x: int) -> Result[int, str]:
+        running.append(x)
+        peak.append(len(running))
+        await asyncio.sleep(0.001)
+        running.remove(x)
+        return Ok(x)
+
+    result = asyncio.run(gather_results(*(tracked(x) for x in range(20)), limit=3))
+    assert result == Ok(list(range(20)))
+    assert max(peak) == 3
+
+    try:
+        asyncio.run(gather_results(limit=0))
+        raise AssertionError()
+    except ValueError:
+        pass
+
+
+def test_settle_results():
+    results = asyncio.run(settle_results(fetch(1), fetch(-1), boom(), limit=2))
+    assert results == [Ok(1), Err("negative"), Err("boom")]
+    results = asyncio.run(settle_results(boom(), map_err=type))
+    assert results == [Err(ValueError)]
+
+
+def test_as_completed_results():
+    log: list = []
+
+    async def collect(**kwargs):
+        aws = [slow(1, 0.02, log), slow(-2, 0, log), slow(3, 0.01, log)]
+        return [pair async for pair in as_completed_results(*aws, **kwargs)]
+
+    assert asyncio.run(collect()) == [(1, Err("negative -2")), (2, Ok(3)), (0, Ok(1))]
+    assert asyncio.run(collect(limit=1)) == [(0, Ok(1)), (1, Err("negative -2")), (2, Ok(3))]
+
+    async def first():
+        log.clear()
+        aws = [slow(1, 10, log), slow(2, 0, log)]
+        async for pair in as_completed_results(*aws):
+            return pair
+
+    assert asyncio.run(first()) == (1, Ok(2))
+    assert log == [("done", 2), ("cancelled", 1)]
+
+
+def test_hedge():
+    stats = HedgeStats()
+    log: list = []
+    delays = iter([1.0, 0.0])
+
+    async def attempt() -> Result[int, str]:
+        return await slow(1, next(delays), log)
+
+    assert asyncio.run(hedge(attempt, [0.01], stats=stats)) == Ok(1)
+    assert log == [("done", 1), ("cancelled", 1)]
+    assert repr(stats) == "HedgeStats(calls=1, fired=1, won=1)"
+
+    async def failing() -> int:
+        raise ValueError("boom")
+
+    result = asyncio.run(hedge(failing, [10.0], stats=stats))
+    assert [str(e) for e in result.unwrap_err()] == ["boom", "boom"]
+    assert asyncio.run(hedge(lambda: fetch(2), [0.5], stats=stats)) == Ok(2)
+    assert repr(stats) == "HedgeStats(calls=3, fired=2, won=1)"
@@ -0,0 +1,356 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from rusttypes.columnar import OptionArray, ResultArray
+from rusttypes.option import Nil, Some
+from rusttypes.result import Err, Ok, Result
+
+
+def test_from_options():
+    arr = OptionArray.from_options([Some(1), Nil, Some(3)], typecode="q")
+
+    assert len(arr) == 3
+    assert arr.typecode == "q"
+    assert arr.to_options() == [Some(1), Nil, Some(3)]
+    assert arr.to_optionals() == [1, None, 3]
+
+    arr = OptionArray.from_options([Some("a"), Nil])
+    assert arr.typecode is None
+    assert arr.to_options() == [Some("a"), Nil]
+    assert OptionArray.from_options([]).to_options() == []
+
+
+def test_from_optionals():
+    values = [1.5, None, None, 2.5, None, None, None, None, 3.5]
+    arr = OptionArray.from_optionals(values, typecode="d")
+
+    assert arr.to_optionals() == values
+    assert list(arr) == [Nil if v is None else Some(v) for v in values]
+
+
+def test_raw_buffers():
+    arr = OptionArray([1, 2, 3], b"\x05")
+    assert arr.to_optionals() == [1, None, 3]
+
+    # unused trailing bits are ignored
+    arr = OptionArray(array("q", [1, 2]), b"\xff")
+    assert arr.typecode == "q"
+    assert arr.count_some() == 2
+
+    arr = OptionArray([1, 2], b"\x03", typecode="d")
+    assert arr.to_optionals() == [1.0, 2.0]
+
+    try:
+        OptionArray([1] * 9, b"\xff")
+        raise AssertionError()
+    except ValueError:
+        pass
+
+
+def test_getitem():
+    arr = OptionArray.from_optionals([1, None, 3], typecode="q")
+
+    assert arr[0] == Some(1)
+    assert arr[1] is Nil
+    assert arr[-1] == Some(3)
+    assert arr[1:].to_optionals() == [None, 3]
+    assert arr[::2].to_optionals() == [1, 3]
+
+    try:
+        arr[3]
+        raise AssertionError()
+    except IndexError:
+        pass
+
+
+def test_counts():
+    arr = OptionArray.from_optionals([1, None, 3, None, 5, 6, 7, 8, 9, None])
+
+    assert arr.count_some() == 7
+    assert arr.count_nil() == 3
+    assert OptionArray.from_optionals([]).count_some() == 0
+
+
+def test_map():
+    arr = OptionArray.from_optionals([1, None, 3], typecode="q")
+
+    assert arr.map(lambda x: x * 2).typecode == "q"
+    assert arr.map(lambda x: x * 2).to_optionals() == [2, None, 6]
+    assert arr.map(lambda x: x * 2, vectorized=True).to_optionals() == [2, None, 6]
+    assert arr.map(str, typecode=None).to_optionals() == ["1", None, "3"]
+    assert arr.map(lambda x: x / 2, typecode="d").to_optionals() == [0.5, None, 1.5]
+
+    # ``op`` is never called for ``Nil`` elements
+    assert OptionArray.from_optionals(["a", None]).map(str.upper).to_optionals() == ["A", None]
+
+
+def test_filter():
+    arr = OptionArray.from_optionals([1, None, 3, 4], typecode="q")
+
+    assert arr.filter(lambda x: x > 2).to_optionals() == [None, None, 3, 4]
+    assert arr.filter(lambda x: x > 2, vectorized=True).to_optionals() == [None, None, 3, 4]
+    assert arr.filter(lambda x: True).to_optionals() == [1, None, 3, 4]
+
+
+def test_unwrap_or():
+    arr = OptionArray.from_optionals([1, None, 3], typecode="q")
+    assert list(arr.unwrap_or(0)) == [1, 0, 3]
+
+    arr = OptionArray.from_optionals(["a", None])
+    assert arr.unwrap_or("b") == ["a", "b"]
+
+
+def test_zip():
+    a = OptionArray.from_optionals([1, None, 3, 4], typecode="q")
+    b = OptionArray.from_optionals(["a", "b", None, "d"])
+
+    assert a.zip(b).to_optionals() == [(1, "a"), None, None, (4, "d")]
+
+    try:
+        a.zip(OptionArray.from_optionals([1]))
+        raise AssertionError()
+    except ValueError:
+        pass
+
+
+def test_and():
+    a = OptionArray.from_optionals([1, None, 3, 4], typecode="q")
+    b = OptionArray.from_optionals(["a", "b", None, "d"])
+
+    assert a.and_(b).to_optionals() == ["a", None, None, "d"]
+    assert b.and_(a).to_optionals() == [1, None, None, 4]
+    assert a.and_(b).to_options() == [x.and_(y) for x, y in zip(a, b, strict=True)]
+
+
+def test_result_array_from_results():
+    results = [Ok(1), Err("a"), Ok(3), Err("b")]
+    arr = ResultArray.from_results(results, typecode="q")
+
+    assert len(arr) == 4
+    assert arr.typecode == "q"
+    assert arr.to_results() == results
+    assert arr.oks.to_optionals() == [1, None, 3, None]
+    assert dict(arr.errors) == {1: "a", 3: "b"}
+    assert arr[0] == Ok(1)
+    assert arr[-1] == Err("b")
+    assert ResultArray.from_results([]).to_results() == []
+
+
+def test_result_array_raw_columns():
+    arr = ResultArray(OptionArray.from_optionals([1, None]), {1: "e"})
+    assert arr.to_results() == [Ok(1), Err("e")]
+
+    for errs in ({}, {0: "e"}, {1: "e", 2: "f"}):
+        try:
+            ResultArray(OptionArray.from_optionals([1, None]), errs)
+            raise AssertionError()
+        except ValueError:
+            pass
+
+
+def test_result_array_counts():
+    arr = ResultArray.from_results([Ok(1), Err("a"), Ok(3), Err("b"), Ok(5)])
+
+    assert arr.count_ok() == 3
+    assert arr.count_err() == 2
+
+
+def test_result_array_map():
+    arr = ResultArray.from_results([Ok(1), Err("a"), Ok(3)], typecode="q")
+
+    assert arr.map(lambda x: x * 2).to_results() == [Ok(2), Err("a"), Ok(6)]
+    assert arr.map(lambda x: x * 2, vectorized=True).to_results() == [Ok(2), Err("a"), Ok(6)]
+    assert arr.map(str, typecode=None).to_results() == [Ok("1"), Err("a"), Ok("3")]
+    assert arr.map_err(str.upper).to_results() == [Ok(1), Err("A"), Ok(3)]
+
+
+def test_result_array_and_then():
+    arr = ResultArray.from_results([Ok(2), Err("a"), Ok(-1), Ok(4)], typecode="q")
+    res = arr.and_then(lambda x: Ok(x // 2) if x > 0 else Err("neg"))
+
+    assert res.to_results() == [Ok(1), Err("a"), Err("neg"), Ok(2)]
+    assert dict(res.errors) == {1: "a", 2: "neg"}
+    assert res.to_results() == [
+        r.and_then(lambda x: Ok(x // 2) if x > 0 else Err("neg")) for r in arr
+    ]
+
+
+def test_result_array_unwrap_or():
+    arr = ResultArray.from_results([Ok(1), Err("a"), Ok(3)], typecode="q")
+    assert list(arr.unwrap_or(0)) == [1, 0, 3]
+
+
+def test_result_array_partition():
+    results = [Err("a"), Ok(1), Err("b"), Ok(3)]
+    arr = ResultArray.from_results(results)
+
+    assert arr.partition() == ([1, 3], ["a", "b"])
+    assert arr.partition() == Result.partition(results)
+
+
+def test_buffers():
+    arr = OptionArray.from_optionals([1, None, 3, None, 5, 6, 7, 8, 9], typecode="q")
+    validity, values = arr.buffers()
+
+    assert bytes(validity) == b"\xf5\x01"
+    assert values.format == "q"
+    assert values.tolist()[:3] == [1, 0, 3]
+
+    try:
+        OptionArray.from_optionals([1]).buffers()
+        raise AssertionError()
+    except TypeError:
+        pass
+
+
+def test_from_buffers():
+    arr = OptionArray.from_optionals([1, None, 3, None, 5, 6, 7, 8, 9], typecode="q")
+    validity, values = arr.buffers()
+
+    res = OptionArray.from_buffers(values, validity, "q")
+    assert res.typecode == "q"
+    assert res.to_optionals() == arr.to_optionals()
+    assert res.map(lambda x: x + 1).to_optionals() == [2, None, 4, None, 6, 7, 8, 9, 10]
+
+    # raw bytes of any exporter, without validity bitmap and with an explicit length
+    res = OptionArray.from_buffers(array("d", [1.5, 2.5, 3.5]).tobytes(), None, "d", length=2)
+    assert res.to_optionals() == [1.5, 2.5]
+
+
+def test_lossy_values():
+    arr = OptionArray.from_optionals([1, None, 3], typecode="q")
+
+    for fn in (
+        lambda: arr.map(lambda x: x / 2),
+        lambda: arr.unwrap_or(0.5),
+        lambda: OptionArray.from_optionals([1.5], typecode="q"),
+    ):
+        try:
+            fn()
+            raise AssertionError()
+        except TypeError:
+            pass
+
+    try:
+        OptionArray.from_optionals([300], typecode="b")
+        raise AssertionError()
+    except OverflowError:
+        pass
+
+
+def test_vectorized_map_without_numpy():
+    # an ``array.array`` buffer is not a NumPy array, ``op`` is called per element
+    arr = OptionArray(array("q", [1, 2, 3]), b"\x05")
+
+    res = arr.map(lambda x: x / 2, vectorized=True)
+    assert res.typecode == "d"
+    assert res.to_optionals() == [0.5, None, 1.5]
+    assert arr.map(lambda x: x * 2, vectorized=True).typecode == "q"
+    assert arr.map(str, vectorized=True).to_optionals() == ["1", None, "3"]
+
+    # the same typecode as with a NumPy buffer, if NumPy is installed
+    arr = OptionArray.from_optionals([1, None, 3], typecode="q")
+    assert arr.map(lambda x: x / 2, vectorized=True).typecode == "d"
+
+
+def test_numpy_map_filter():
+    np = pytest.importorskip("numpy")
+
+    arr = OptionArray.from_optionals([1, None, 3, 4], typecode="q")
+
+    res = arr.map(lambda x: x * 2, vectorized=True)
+    assert isinstance(res.unwrap_or(0), np.ndarray)
+    assert res.to_optionals() == [2, None, 6, 8]
+    assert arr.map(np.sqrt, vectorized=True).typecode == "d"
+    assert arr.map(lambda x: x // 2, typecode="b", vectorized=True).typecode == "b"
+    assert arr.filter(lambda x: x > 2, vectorized=True).to_optionals() == [None, None, 3, 4]
+
+    try:
+        arr.map(lambda x: x / 2, typecode="q", vectorized=True)
+        raise AssertionError()
+    except TypeError:
+        pass
+
+    try:
+        arr.map(lambda x: x[:2], vectorized=True)
+        raise AssertionError()
+    except ValueError:
+        pass
+
+
+def test_numpy_unwrap_or():
+    np = pytest.importorskip("numpy")
+
+    res = OptionArray.from_optionals([1, None, 3], typecode="q").unwrap_or(7)
+    assert isinstance(res, np.ndarray)
+    assert res.dtype.char == "q"
+    assert res.tolist() == [1, 7, 3]
+
+    res = OptionArray.from_optionals([1.5, None], typecode="d").unwrap_or(0)
+    assert res.dtype.char == "d"
+    assert res.tolist() == [1.5, 0.0]
+
+
+def test_numpy_from_buffers():
+    np = pytest.importorskip("numpy")
+
+    values = np.array([1, 2, 3], dtype="q")
+    res = OptionArray.from_buffers(values, b"\x05", "q")
+    assert isinstance(res.unwrap_or(0), np.ndarray)
+    assert res.to_optionals() == [1, None, 3]
+
+    # the values are shared with the exporter, not copied
+    values[0] = 10
+    assert res.to_optionals() == [10, None, 3]
+
+
+def test_arrow():
+    pa = pytest.importorskip("pyarrow")
+
+    arr = OptionArray.from_optionals([1, None, 3, None, 5, 6, 7, 8, 9], typecode="q")
+    res = arr.to_arrow()
+    assert res.type == pa.int64()
+    assert res.null_count == 2
+    assert res.to_pylist() == arr.to_optionals()
+
+    assert OptionArray.from_arrow(res).to_optionals() == arr.to_optionals()
+    assert OptionArray.from_arrow(res[3:]).to_optionals() == arr.to_optionals()[3:]
+    assert OptionArray.from_arrow(pa.array([1.5, 2.5])).to_optionals() == [1.5, 2.5]
+    assert OptionArray.from_optionals(["a", None]).to_arrow().to_pylist() == ["a", None]
+
+    try:
+        OptionArray.from_arrow(pa.array(["a"]))
+        raise AssertionError()
+    except TypeError:
+        pass
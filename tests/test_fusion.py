@@ -0,0 +1,180 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+import asyncio
+
+from rusttypes.fusion import fuse_chains, fused_source
+from rusttypes.option import Nil, Some
+from rusttypes.result import Err, FrozenOk, Ok
+
+
+def half(x):
+    return Ok(x // 2) if x % 2 == 0 else Err(f"odd {x}")
+
+
+def half_opt(x):
+    return Some(x // 2) if x % 2 == 0 else Nil
+
+
+class LoudOk(Ok):
+    __slots__ = ()
+
+    def map(self, op):
+        return Ok(("loud", op(self.inner)))
+
+
+def result_chain(r):
+    return r.map(lambda x: x + 1).and_then(half).map_err(str.upper).unwrap_or(-1)
+
+
+def result_chain_wrapped(r):
+    out = r.map(lambda x: x + 1).and_then(half).or_else(lambda e: Ok(len(e))).map(str)
+    return out
+
+
+def result_chain_map_or(r):
+    return r.inspect_err(str).and_then(half).map_or("none", str)
+
+
+def option_chain(o):
+    return o.map(abs).filter(lambda x: x > 2).and_then(half_opt).or_else(lambda: Some(0))
+
+
+def option_chain_else(o):
+    if o is not None:
+        return o.map(abs).and_then(half_opt).unwrap_or_else(lambda: -1)
+    return None
+
+
+def test_result_chains():
+    fns = [result_chain, result_chain_wrapped, result_chain_map_or]
+    for fn in fns:
+        fused = fuse_chains(fn)
+        assert fused is not fn
+        assert fused_source(fused) is not None
+        for r in [Ok(1), Ok(2), Err("e"), Ok(-3)]:
+            assert fused(r) == fn(r)
+
+
+def test_option_chains():
+    for fn in [option_chain, option_chain_else]:
+        fused = fuse_chains(fn)
+        assert fused is not fn
+        for o in [Some(-8), Some(1), Some(3), Nil]:
+            assert fused(o) == fn(o)
+
+
+def test_fallback_for_other_types():
+    class Weird:
+        def map(self, op):
+            return self
+
+        def and_then(self, op):
+            return self
+
+        def map_err(self, op):
+            return self
+
+        def unwrap_or(self, default):
+            return "weird"
+
+    assert fuse_chains(result_chain)(Weird()) == "weird"
+
+    def loud_chain(r):
+        return r.map(abs).map_err(str).unwrap_or(0)
+
+    # subclasses with own combinators run the original chain
+    assert fuse_chains(loud_chain) is not loud_chain
+    assert fuse_chains(loud_chain)(LoudOk(-1)) == loud_chain(LoudOk(-1)) == ("loud", 1)
+
+    # ``and_then`` returning an unknown variant continues with its methods
+    fused = fuse_chains(loud_and_then)
+    assert fused is not loud_and_then
+    assert fused(Ok(1)) == loud_and_then(Ok(1)) == Ok(("loud", "1"))
+
+
+def loud_and_then(r):
+    return r.and_then(LoudOk).map(str)
+
+
+def evaluation_order(r, log):
+    return r.map(log("map") or abs).map_err(log("map_err") or str).unwrap_or(log("unwrap_or"))
+
+
+def test_evaluation_order():
+    fused = fuse_chains(evaluation_order)
+    for r in [Ok(-1), Err("e")]:
+        log_fn, log_fused = [], []
+
+        def logger(log):
+            return lambda name: log.append(name)
+
+        assert fused(r, logger(log_fused)) == evaluation_order(r, logger(log_fn))
+        assert log_fused == log_fn == ["map", "map_err", "unwrap_or"]
+
+
+def shadowed_type(type, r):
+    return r.map(lambda x: x + type).and_then(half).unwrap_or(0)
+
+
+def test_shadowed_type():
+    fused = fuse_chains(shadowed_type)
+    assert fused_source(fused) is not None
+    for r in (Ok(1), Ok(2), Err("e"), FrozenOk(3)):
+        assert fused(1, r) == shadowed_type(1, r)
+    assert fused(1, Ok(1)) == 1
+
+
+def no_chain(r):
+    return r.map(abs)
+
+
+def test_unchanged():
+    assert fuse_chains(no_chain) is no_chain
+    assert fused_source(no_chain) is None
+
+    offset = 1
+
+    def closure(r):
+        return r.map(lambda x: x + offset).unwrap_or(0)
+
+    assert fuse_chains(closure) is closure
+    assert fuse_chains(len) is len
+
+
+async def async_chain(r):
+    await asyncio.sleep(0)
+    return r.map(abs).and_then(half).unwrap_or(-1)
+
+
+def test_async():
+    fused = fuse_chains(async_chain)
+    assert fused is not async_chain
+    assert asyncio.run(fused(Ok(-4))) == asyncio.run(async_chain(Ok(-4))) == 2
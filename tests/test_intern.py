@@ -0,0 +1,116 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+from rusttypes.intern import InternTable
+from rusttypes.option import Nil, Some
+from rusttypes.result import Ok
+
+
+def test_some():
+    table = InternTable()
+
+    assert table.some(1) is table.some(1)
+    assert table.some("foo") is table.some("foo")
+    assert table.some(None) is table.some(None)
+    assert table.some(True) is table.some(True)
+    assert table.some(True) is not table.some(1)
+    assert table.some(1.0) is not table.some(1.0)
+    assert table.some(1_000) is not table.some(1_000)
+    assert table.some("x" * 100) is not table.some("x" * 100)
+    assert table.some([1]) == Some([1])
+
+    assert table.some(1) == Some(1)
+    assert hash(table.some(1)) == hash(Some(1))
+
+
+def test_ok():
+    table = InternTable()
+
+    assert table.ok() is table.ok(None)
+    assert table.ok(0) is table.ok(0)
+    assert table.ok(False) is not table.ok(0)
+    assert table.ok(0) == Ok(0)
+    assert table.ok(0) is not table.some(0)
+
+
+def test_maxsize():
+    table = InternTable(maxsize=2)
+
+    assert table.some(1) is table.some(1)
+    assert table.some(2) is table.some(2)
+    assert table.some(3) is not table.some(3)
+    assert table.some(3) == Some(3)
+
+
+def test_cache_info():
+    table = InternTable()
+    table.some(1)
+    table.some(1)
+    table.ok(1)
+    table.some(1.5)
+
+    info = table.cache_info()
+    assert info.hits == 1
+    assert info.misses == 3
+    assert info.currsize == 2
+
+    table.cache_clear()
+    assert table.cache_info() == (0, 0, 1024, 0)
+
+
+def test_immutable():
+    table = InternTable()
+    x = table.some(1)
+
+    try:
+        x.inner = 2
+        raise AssertionError()
+    except AttributeError:
+        pass
+
+    y = x.insert(2)
+    assert y == Some(2)
+    assert x == Some(1)
+    assert table.some(1) == Some(1)
+
+    y, old = x.replace(3)
+    assert y == Some(3)
+    assert old == Some(1)
+    assert table.some(1) == Some(1)
+
+    y, old = x.take()
+    assert y == Nil
+    assert table.some(1) == Some(1)
+
+    try:
+        table.ok(1).inner = 2
+        raise AssertionError()
+    except AttributeError:
+        pass
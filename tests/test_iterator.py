@@ -0,0 +1,147 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+import itertools
+
+from rusttypes.iterator import OptionIter, ResultIter
+from rusttypes.option import Nil, Some
+from rusttypes.result import Err, Ok
+
+
+def half(x):
+    return Ok(x // 2) if x % 2 == 0 else Err(f"odd {x}")
+
+
+def half_opt(x):
+    return Some(x // 2) if x % 2 == 0 else Nil
+
+
+def test_result_iter_chain():
+    results = [Ok(4), Err("e"), Ok(3), Ok(8)]
+    chain = ResultIter(results).map(lambda x: x + 2).and_then(half).map_err(str.upper)
+
+    expected = [r.map(lambda x: x + 2).and_then(half).map_err(str.upper) for r in results]
+    assert list(chain) == expected
+    assert list(ResultIter(results)) == results
+    assert list(ResultIter(results).and_then(half)) == [r.and_then(half) for r in results]
+
+
+def test_result_iter_lazy():
+    seen = []
+    it = ResultIter(Ok(x) for x in itertools.count()).inspect(seen.append).map(lambda x: x * 2)
+    assert seen == []
+
+    assert list(itertools.islice(it, 3)) == [Ok(0), Ok(2), Ok(4)]
+    assert seen == [0, 1, 2]
+
+
+def test_result_iter_from_values():
+    assert list(ResultIter.from_values([1, 2]).and_then(half)) == [Err("odd 1"), Ok(1)]
+    assert list(ResultIter.from_values([1, 2])) == [Ok(1), Ok(2)]
+
+
+def test_result_iter_filter_map():
+    it = ResultIter([Ok(1), Ok(2), Err("e"), Ok(4)]).filter_map(half_opt).map(str)
+    assert list(it) == [Ok("1"), Err("e"), Ok("2")]
+
+
+def test_result_iter_take_while_ok():
+    consumed = []
+
+    def source():
+        for r in [Ok(2), Ok(4), Ok(5), Ok(6)]:
+            consumed.append(r)
+            yield r
+
+    assert list(ResultIter(source()).and_then(half).take_while_ok()) == [Ok(1), Ok(2)]
+    assert len(consumed) == 3
+
+
+def test_result_iter_try_fold():
+    def add(acc, x):
+        return Ok(acc + x)
+
+    assert ResultIter([Ok(1), Ok(2)]).try_fold(0, add) == Ok(3)
+    assert ResultIter([Ok(1), Err("e"), Err("f")]).try_fold(0, add) == Err("e")
+    assert ResultIter.from_values([2, 3]).try_fold(0, lambda acc, x: half(x)) == Err("odd 3")
+
+
+def test_result_iter_try_for_each():
+    seen = []
+
+    def check(x):
+        seen.append(x)
+        return Ok() if x > 0 else Err(x)
+
+    assert ResultIter.from_values([1, 2]).try_for_each(check) == Ok(None)
+    assert ResultIter.from_values([1, -1, 2]).try_for_each(check) == Err(-1)
+    assert seen == [1, 2, 1, -1]
+
+
+def test_result_iter_collect():
+    assert ResultIter.from_values([2, 4]).and_then(half).collect() == Ok([1, 2])
+    assert ResultIter.from_values([2, 3]).and_then(half).collect() == Err("odd 3")
+
+
+def test_option_iter_chain():
+    options = [Some(4), Nil, Some(3), Some(8)]
+    chain = OptionIter(options).map(lambda x: x + 2).and_then(half_opt).filter(lambda x: x > 2)
+
+    expected = [o.map(lambda x: x + 2).and_then(half_opt).filter(lambda x: x > 2) for o in options]
+    assert list(chain) == expected
+    assert list(OptionIter(options)) == options
+
+
+def test_option_iter_from_optionals():
+    assert list(OptionIter.from_optionals([1, None, 2]).and_then(half_opt)) == [Nil, Nil, Some(1)]
+
+
+def test_option_iter_filter_map():
+    it = OptionIter([Some(1), Some(2), Nil, Some(4)]).filter_map(half_opt)
+    assert list(it) == [Some(1), Nil, Some(2)]
+
+
+def test_option_iter_inspect():
+    seen = []
+    assert list(OptionIter([Some(1), Nil]).inspect(seen.append)) == [Some(1), Nil]
+    assert seen == [1]
+
+
+def test_option_iter_take_while_some():
+    it = OptionIter(Some(x) for x in itertools.count()).filter(lambda x: x < 3)
+    assert list(it.take_while_some()) == [Some(0), Some(1), Some(2)]
+
+
+def test_option_iter_try():
+    assert OptionIter([Some(1), Some(2)]).try_fold(0, lambda acc, x: Some(acc + x)) == Some(3)
+    assert OptionIter([Some(1), Nil]).try_fold(0, lambda acc, x: Some(acc + x)) is Nil
+    assert OptionIter([Some(2), Some(3)]).try_for_each(half_opt) is Nil
+    assert OptionIter([Some(2), Some(4)]).try_for_each(half_opt) == Some(None)
+    assert OptionIter([Some(2), Some(4)]).collect() == Some([2, 4])
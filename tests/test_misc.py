@@ -0,0 +1,102 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+import threading
+
+from rusttypes.misc import lightweight_exceptions_enabled, panic, set_lightweight_exceptions
+
+
+def test_panic():
+    try:
+        panic("boom")
+        raise AssertionError()
+    except RuntimeError as e:
+        assert str(e) == "boom"
+
+
+def panic_while_handling(msg: str) -> RuntimeError:
+    try:
+        try:
+            raise KeyError("cause")
+        except KeyError:
+            panic(msg)
+    except RuntimeError as e:
+        return e
+    raise AssertionError()
+
+
+def test_lightweight_panic():
+    assert not panic_while_handling("boom").__suppress_context__
+    set_lightweight_exceptions(True)
+    try:
+        e = panic_while_handling("boom")
+        assert str(e) == "boom"
+        assert e.__suppress_context__
+        assert e.__cause__ is None
+    finally:
+        set_lightweight_exceptions(None)
+
+
+def test_lightweight_exceptions_scope():
+    assert not lightweight_exceptions_enabled()
+    seen = []
+
+    def other_thread():
+        seen.append(lightweight_exceptions_enabled())
+
+    set_lightweight_exceptions(True)
+    try:
+        assert lightweight_exceptions_enabled()
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+    finally:
+        set_lightweight_exceptions(None)
+    assert seen == [False]
+    assert not lightweight_exceptions_enabled()
+
+    set_lightweight_exceptions(True, scope="global")
+    try:
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+        set_lightweight_exceptions(False)
+        assert not lightweight_exceptions_enabled()
+        set_lightweight_exceptions(None)
+        assert lightweight_exceptions_enabled()
+    finally:
+        set_lightweight_exceptions(False, scope="global")
+    assert seen == [False, True]
+
+    try:
+        set_lightweight_exceptions(True, scope="process")
+        raise AssertionError()
+    except ValueError:
+        pass
@@ -28,9 +28,12 @@
 
 from __future__ import annotations
 
+import copy
+import pickle
+import weakref
 from dataclasses import dataclass
 
-from rusttypes.option import Option, Nil, Some
+from rusttypes.option import FrozenSome, Option, Nil, Some, do, is_option
 from rusttypes.result import Err, Ok
 
 
@@ -53,6 +56,23 @@ def test_eq():
     assert Some(1) != Some(2)
 
 
+def test_slots():
+    assert not hasattr(Some(1), "__dict__")
+    assert not hasattr(Nil, "__dict__")
+
+    try:
+        weakref.ref(Some(1))
+        raise AssertionError()
+    except TypeError:
+        pass
+
+    class WeakSome(Some):
+        __slots__ = ("__weakref__",)
+
+    x = WeakSome(1)
+    assert weakref.ref(x)() is x
+
+
 def test_repr():
     assert repr(Nil) == "Nil"
     assert repr(Some(1)) == "Some(1)"
@@ -375,3 +395,155 @@ def test_flatten():
     assert Nil.flatten() == Nil
     assert Some(Some(42)).flatten() == Some(42)
     assert Some(Nil).flatten() == Nil
+
+
+def test_is_option():
+    assert is_option(Some(1))
+    assert is_option(Nil)
+    assert not is_option(1)
+    assert not is_option(None)
+    assert not is_option(Ok(1))
+
+
+def test_abstract():
+    try:
+        Option()
+        raise AssertionError()
+    except TypeError:
+        pass
+
+    try:
+
+        class Incomplete(Option):
+            pass
+
+        raise AssertionError()
+    except TypeError as e:
+        assert "as_optional" in str(e)
+
+    assert type(Option).__name__ == "type"
+
+
+def test_hash():
+    assert hash(Some(1)) == hash(Some(1))
+    assert hash(Nil) == hash(None)
+    assert len({Some(1), Some(1), Some(2), Nil, Nil}) == 3
+    assert {Some("foo"): 1, Nil: 2}[Some("foo")] == 1
+
+    try:
+        hash(Some([1, 2]))
+        raise AssertionError()
+    except TypeError:
+        pass
+
+
+def test_ordering():
+    assert Nil < Some(0)
+    assert Some(0) > Nil
+    assert Some(1) < Some(2)
+    assert Some(2) >= Some(2)
+    assert Nil <= Nil
+    assert not Nil < Nil
+    assert not Some(1) < Nil
+
+    xs = [Some(3), Nil, Some(1), Some(2), Nil]
+    assert sorted(xs) == [Nil, Nil, Some(1), Some(2), Some(3)]
+    assert sorted(xs, key=Option.sort_key) == sorted(xs)
+    assert min(xs) == Nil
+    assert max(xs, key=Option.sort_key) == Some(3)
+
+    try:
+        _ = Some(1) < 1
+        raise AssertionError()
+    except TypeError:
+        pass
+
+
+def test_frozen_some():
+    x = FrozenSome(1)
+    assert x == Some(1)
+    assert Some(1) == x
+    assert hash(x) == hash(Some(1))
+    assert is_option(x)
+    assert x.map(lambda v: v + 1) == Some(2)
+
+    try:
+        x.inner = 2
+        raise AssertionError()
+    except AttributeError as e:
+        assert str(e) == "Can not assign to 'inner' of a FrozenSome"
+
+    y = x.insert(2)
+    assert isinstance(y, FrozenSome)
+    assert (x, y) == (Some(1), Some(2))
+
+    y, old = x.replace(3)
+    assert isinstance(y, FrozenSome)
+    assert (x, y, old) == (Some(1), Some(3), Some(1))
+
+    y, old = x.take()
+    assert (y, old) == (Nil, Some(1))
+
+    assert copy.copy(x) is x
+    assert copy.deepcopy(x) == x
+    assert type(pickle.loads(pickle.dumps(x))) is FrozenSome
+
+
+def test_collect():
+    assert Option.collect([Some(1), Some(2)]) == Some([1, 2])
+    assert Option.collect([]) == Some([])
+    assert Option.collect([Some(1), Nil, Some(3)]) == Nil
+
+    consumed = []
+
+    def lazy():
+        for x in (Some(1), Nil, Some(3)):
+            consumed.append(x)
+            yield x
+
+    assert Option.collect(lazy()) == Nil
+    assert consumed == [Some(1), Nil]
+
+
+def test_collect_into():
+    assert Option.collect_into([Some(1), Some(1), Some(2)], set) == Some({1, 2})
+    assert Option.collect_into([Some(("a", 1)), Some(("b", 2))], dict) == Some({"a": 1, "b": 2})
+    assert Option.collect_into([Some("a"), Some("b")], "".join) == Some("ab")
+    assert Option.collect_into([Some(("a", 1)), Nil], dict) == Nil
+
+
+def test_sum_product():
+    assert Option.sum([Some(1), Some(2)]) == Some(3)
+    assert Option.sum(Some(x) for x in range(4)) == Some(6)
+    assert Option.sum([Some(1), Nil]) == Nil
+    assert Option.sum([Some([1]), Some([2])], start=[]) == Some([1, 2])
+    assert Option.product([Some(2), Some(3)]) == Some(6)
+    assert Option.product([Nil, Some(3)]) == Nil
+
+
+def test_do():
+    @do
+    def full_name(user: dict):
+        first = yield Option.from_opt(user.get("first"))
+        last = yield Option.from_opt(user.get("last"))
+        return Some(f"{first} {last}")
+
+    assert full_name({"first": "Ada", "last": "Lovelace"}) == Some("Ada Lovelace")
+    assert full_name({"first": "Ada"}) is Nil
+
+    @do
+    def frozen():
+        a = yield FrozenSome(1)
+        return Some(a + 1)
+
+    assert frozen() == Some(2)
+
+    @do
+    def not_an_option():
+        yield 1
+
+    try:
+        not_an_option()
+        raise AssertionError()
+    except TypeError:
+        pass
@@ -0,0 +1,185 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from rusttypes.optional import (
+    opt_and,
+    opt_and_then,
+    opt_expect,
+    opt_filter,
+    opt_flatten,
+    opt_get_or_insert,
+    opt_get_or_insert_default,
+    opt_get_or_insert_with,
+    opt_insert,
+    opt_inspect,
+    opt_is_nil,
+    opt_is_some,
+    opt_is_some_and,
+    opt_map,
+    opt_map_or,
+    opt_map_or_else,
+    opt_ok_or,
+    opt_ok_or_else,
+    opt_or,
+    opt_or_else,
+    opt_replace,
+    opt_take,
+    opt_transpose,
+    opt_unwrap,
+    opt_unwrap_or,
+    opt_unwrap_or_default,
+    opt_unwrap_or_else,
+    opt_unwrap_unchecked,
+    opt_unzip,
+    opt_xor,
+    opt_zip,
+    opt_zip_with,
+)
+
+
+@dataclass
+class Foo:
+    x: int
+
+    @staticmethod
+    def default() -> Foo:
+        return Foo(42)
+
+
+def test_is_some():
+    assert opt_is_some(0)
+    assert not opt_is_some(None)
+    assert opt_is_some_and(2, lambda x: x > 1)
+    assert not opt_is_some_and(None, lambda x: x > 1)
+    assert opt_is_nil(None)
+    assert not opt_is_nil(0)
+
+
+def test_unwrap():
+    assert opt_unwrap(1) == 1
+    assert opt_expect(1, "error") == 1
+    assert opt_unwrap_unchecked(1) == 1
+
+    try:
+        opt_unwrap(None)
+        raise AssertionError()
+    except RuntimeError as e:
+        assert str(e) == "Called unwrap on a Nil value"
+
+    try:
+        opt_expect(None, "error")
+        raise AssertionError()
+    except RuntimeError as e:
+        assert str(e) == "error"
+
+
+def test_unwrap_or():
+    assert opt_unwrap_or(1, 2) == 1
+    assert opt_unwrap_or(None, 2) == 2
+    assert opt_unwrap_or(0, 2) == 0
+    assert opt_unwrap_or_else(None, lambda: 2) == 2
+    assert opt_unwrap_or_default(None, Foo).x == 42
+    assert opt_unwrap_or_default(Foo(1), Foo).x == 1
+
+
+def test_map():
+    assert opt_map("foo", len) == 3
+    assert opt_map(None, len) is None
+    assert opt_map_or("foo", 42, len) == 3
+    assert opt_map_or(None, 42, len) == 42
+    assert opt_map_or_else(None, lambda: 42, len) == 42
+
+    seen = []
+    assert opt_inspect(1, seen.append) == 1
+    assert opt_inspect(None, seen.append) is None
+    assert seen == [1]
+
+
+def test_ok_or():
+    assert opt_ok_or("foo", 0) == (0, "foo")
+    assert opt_ok_or(None, 0) == (1, 0)
+    assert opt_ok_or_else(None, lambda: 0) == (1, 0)
+
+
+def test_and_or():
+    assert opt_and(2, None) is None
+    assert opt_and(None, "foo") is None
+    assert opt_and(2, "foo") == "foo"
+    assert opt_and_then(2, lambda x: str(x * x)) == "4"
+    assert opt_and_then(None, lambda x: str(x * x)) is None
+
+    assert opt_or(2, None) == 2
+    assert opt_or(None, 100) == 100
+    assert opt_or_else(None, lambda: "vikings") == "vikings"
+
+    assert opt_xor(2, None) == 2
+    assert opt_xor(None, 2) == 2
+    assert opt_xor(2, 2) is None
+    assert opt_xor(None, None) is None
+
+
+def test_filter():
+    assert opt_filter(4, lambda x: x % 2 == 0) == 4
+    assert opt_filter(3, lambda x: x % 2 == 0) is None
+    assert opt_filter(None, lambda x: x % 2 == 0) is None
+
+
+def test_insert():
+    assert opt_insert(None, 1) == 1
+    assert opt_get_or_insert(None, 1) == 1
+    assert opt_get_or_insert(2, 1) == 2
+    assert opt_get_or_insert_with(None, lambda: 1) == 1
+    assert opt_get_or_insert_default(None, Foo).x == 42
+    assert opt_take(1) == (None, 1)
+    assert opt_replace(2, 3) == (3, 2)
+
+
+def test_zip():
+    assert opt_zip(42, "foo") == (42, "foo")
+    assert opt_zip(42, None) is None
+    assert opt_zip_with(1, 2, lambda a, b: a + b) == 3
+    assert opt_zip_with(None, 2, lambda a, b: a + b) is None
+    assert opt_unzip((42, "foo")) == (42, "foo")
+    assert opt_unzip(None) == (None, None)
+
+    try:
+        opt_unzip((1, 2, 3))
+        raise AssertionError()
+    except ValueError as e:
+        assert str(e) == "Can not unzip tuple with more/less than 2 elements"
+
+
+def test_transpose_flatten():
+    assert opt_transpose(None) == (0, None)
+    assert opt_transpose((0, 42)) == (0, 42)
+    assert opt_transpose((1, "error")) == (1, "error")
+    assert opt_flatten(None) is None
+    assert opt_flatten(1) == 1
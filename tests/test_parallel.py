@@ -0,0 +1,186 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rusttypes.option import Nil, Option, Some
+from rusttypes.parallel import HedgeStats, hedge, par_find_map, par_map
+from rusttypes.result import Err, Ok, Result, catch
+
+
+def square(x: int) -> int:
+    if x < 0:
+        raise ValueError(f"negative {x}")
+    return x * x
+
+
+@catch(ValueError)
+def parse(s: str) -> Result[int, str]:
+    return Ok(int(s))
+
+
+def test_par_map():
+    assert list(par_map(square, range(10), chunksize=3)) == [Ok(x * x) for x in range(10)]
+    assert list(par_map(square, [])) == []
+
+    results = list(par_map(square, [1, -2, 3], chunksize=1))
+    assert results[0] == Ok(1) and results[2] == Ok(9)
+    assert isinstance(results[1].unwrap_err(), ValueError)
+
+    assert list(par_map(parse, ["1", "x"])) == [
+        Ok(1),
+        Err("invalid literal for int() with base 10: 'x'"),
+    ]
+    assert Result.collect(par_map(square, iter(range(1000)))) == Ok([x * x for x in range(1000)])
+
+
+def test_par_map_unordered():
+    def sleepy(x: int) -> int:
+        time.sleep(0.05 if x == 0 else 0)
+        return x
+
+    results = list(par_map(sleepy, range(4), chunksize=1, ordered=False, max_workers=4))
+    assert sorted(r.unwrap() for r in results) == [0, 1, 2, 3]
+    assert results[-1] == Ok(0)
+
+
+def test_par_map_fail_fast():
+    seen = []
+
+    def record(x: int) -> int:
+        seen.append(x)
+        return square(x)
+
+    inputs = [1, 2, -3, 4] + list(range(10_000))
+    with ThreadPoolExecutor(1) as executor:
+        results = list(par_map(record, inputs, executor=executor, chunksize=2, fail_fast=True))
+    assert results[:2] == [Ok(1), Ok(4)]
+    assert len(results) == 3 and results[2].is_err()
+    assert len(seen) < 100
+
+
+def test_par_map_process():
+    results = list(par_map(square, range(20), executor="process", max_workers=2, chunksize=4))
+    assert results == [Ok(x * x) for x in range(20)]
+    assert list(par_map(parse, ["x"], executor="process")) == [
+        Err("invalid literal for int() with base 10: 'x'")
+    ]
+
+
+def test_par_map_invalid():
+    try:
+        par_map(square, [1], executor="fiber")
+        raise AssertionError()
+    except ValueError:
+        pass
+
+    try:
+        par_map(square, [1], chunksize=0)
+        raise AssertionError()
+    except ValueError:
+        pass
+
+
+def even_half(x: int) -> Option[int]:
+    return Some(x // 2) if x % 2 == 0 else Nil
+
+
+def test_par_find_map():
+    assert par_find_map(even_half, [1, 3, 4, 5]) == Some(2)
+    assert par_find_map(even_half, [1, 3, 5]) is Nil
+    assert par_find_map(even_half, []) is Nil
+
+    def delayed(x: int) -> Option[int]:
+        time.sleep(0.2 if x == 2 else 0.01 * x)
+        return Some(x) if x >= 2 else Nil
+
+    assert par_find_map(delayed, [0, 1, 2, 3], max_workers=4) == Some(3)
+    assert par_find_map(delayed, [0, 1, 2, 3], ordered=True, max_workers=4) == Some(2)
+
+
+def test_par_find_map_cancels():
+    seen = []
+
+    def probe(x: int) -> Option[int]:
+        seen.append(x)
+        return Some(x) if x == 3 else Nil
+
+    with ThreadPoolExecutor(1) as executor:
+        assert par_find_map(probe, range(10_000), executor=executor, ordered=True) == Some(3)
+    assert len(seen) < 10
+
+    def failing(x: int) -> Option[int]:
+        raise ValueError("probe failed")
+
+    try:
+        par_find_map(failing, [1, 2])
+        raise AssertionError()
+    except ValueError:
+        pass
+
+
+def test_par_find_map_process():
+    assert par_find_map(even_half, range(1, 100, 2), executor="process", max_workers=2) is Nil
+    assert par_find_map(even_half, [1, 8], executor="process", ordered=True) == Some(4)
+
+
+def test_hedge():
+    stats = HedgeStats()
+    calls = itertools.count()
+
+    def slow_first() -> int:
+        n = next(calls)
+        time.sleep(1.0 if n == 0 else 0)
+        return n
+
+    start = time.perf_counter()
+    assert hedge(slow_first, [0.01], stats=stats) == Ok(1)
+    assert time.perf_counter() - start < 0.5
+    assert repr(stats) == "HedgeStats(calls=1, fired=1, won=1)"
+
+    assert hedge(lambda: 1, [0.5, 1.0], stats=stats) == Ok(1)
+    assert hedge(lambda: Err("e"), [], stats=stats) == Err(["e"])
+    assert repr(stats) == "HedgeStats(calls=3, fired=1, won=1)"
+
+    with ThreadPoolExecutor(4) as executor:
+        start = time.perf_counter()
+        result = hedge(lambda: square(-1), [10.0, 20.0], executor=executor, stats=stats)
+        assert time.perf_counter() - start < 5.0
+    errors = result.unwrap_err()
+    assert len(errors) == 3 and all(isinstance(e, ValueError) for e in errors)
+    assert repr(stats) == "HedgeStats(calls=4, fired=3, won=1)"
+
+    try:
+        hedge(lambda: 1, [0.2, 0.1])
+        raise AssertionError()
+    except ValueError:
+        pass
@@ -0,0 +1,120 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+from rusttypes.option import Nil, Option, Some
+from rusttypes.pipeline import Pipeline
+from rusttypes.result import Err, Ok
+
+
+def half(x):
+    return Ok(x // 2) if x % 2 == 0 else Err(f"odd {x}")
+
+
+def half_opt(x):
+    return Some(x // 2) if x % 2 == 0 else Nil
+
+
+def test_result_pipeline():
+    def recover(e):
+        return Ok(len(e)) if e.startswith("ODD") else Err(e)
+
+    pipe = Pipeline.ok().map(lambda x: x + 1).and_then(half).map_err(str.upper).or_else(recover)
+
+    for res in [Ok(1), Ok(2), Err("odd"), Err("bad"), Ok(-1)]:
+        expected = res.map(lambda x: x + 1).and_then(half).map_err(str.upper).or_else(recover)
+        assert pipe(res) == expected
+        assert pipe.compile()(res) == expected
+
+    assert pipe.apply(1) == Ok(1)
+    assert pipe.compile(raw=True)(2) == Ok(5)
+
+
+def test_result_pipeline_inspect():
+    seen = []
+    pipe = Pipeline.ok().inspect(seen.append).inspect_err(lambda e: seen.append(-e))
+
+    assert pipe(Ok(1)) == Ok(1)
+    assert pipe(Err(2)) == Err(2)
+    assert seen == [1, -2]
+
+
+def test_option_pipeline():
+    pipe = (
+        Pipeline.some()
+        .map(lambda x: x + 1)
+        .and_then(half_opt)
+        .filter(lambda x: x > 0)
+        .or_else(lambda: Some(-1))
+    )
+
+    for opt in [Some(1), Some(2), Some(-1), Nil]:
+        expected = (
+            opt.map(lambda x: x + 1)
+            .and_then(half_opt)
+            .filter(lambda x: x > 0)
+            .or_else(lambda: Some(-1))
+        )
+        assert pipe(opt) == expected
+        assert pipe.apply(opt.unwrap_or(None)) == expected
+
+
+def test_empty_pipeline():
+    assert Pipeline.ok()(Err("e")) == Err("e")
+    assert Pipeline.ok().apply(1) == Ok(1)
+    assert Pipeline.some().apply(None) is Nil
+    assert isinstance(Pipeline.some().apply(0), Option)
+
+
+def test_pipeline_shared_prefix():
+    prefix = Pipeline.ok().map(lambda x: x * 10)
+    a = prefix.map(str)
+    b = prefix.and_then(half)
+
+    assert prefix(Ok(1)) == Ok(10)
+    assert a(Ok(1)) == Ok("10")
+    assert b(Ok(1)) == Ok(5)
+
+
+def test_pipeline_unsupported():
+    for build in (
+        lambda: Pipeline.some().map_err(str),
+        lambda: Pipeline.ok().filter(bool),
+        lambda: Pipeline.ok()._then("take_while_ok", None),
+    ):
+        try:
+            build()
+            raise AssertionError()
+        except TypeError:
+            pass
+
+
+def test_pipeline_repr():
+    assert repr(Pipeline.ok().map(str).and_then(half)) == "Pipeline.ok().map(str).and_then(half)"
+    assert "def fused" in Pipeline.some().map(str).source
@@ -27,11 +27,29 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 from __future__ import annotations
 
+import asyncio
+import copy
 import math
+import pickle
+import weakref
 from dataclasses import dataclass
 
+from rusttypes.misc import set_lightweight_exceptions
 from rusttypes.option import Nil, Some
-from rusttypes.result import Result, Ok, Err, catch, try_guard
+from rusttypes.result import (
+    Done,
+    Err,
+    FrozenErr,
+    FrozenOk,
+    Ok,
+    Result,
+    ResultException,
+    catch,
+    do,
+    do_async,
+    is_result,
+    try_guard,
+)
 
 
 @dataclass
@@ -43,6 +61,23 @@ class Foo:
         return Foo(42)
 
 
+def test_slots():
+    assert not hasattr(Ok(1), "__dict__")
+    assert not hasattr(Err(1), "__dict__")
+
+    try:
+        weakref.ref(Ok(1))
+        raise AssertionError()
+    except TypeError:
+        pass
+
+    class WeakErr(Err):
+        __slots__ = ("__weakref__",)
+
+    x = WeakErr("Some error message")
+    assert weakref.ref(x)() is x
+
+
 def test_is_ok():
     x = Ok(-3)
     assert x.is_ok() is True
@@ -362,3 +397,460 @@ def test_try_guard():
 
     assert sqrt_map_err(4.0) == Ok(2.0)
     assert sqrt_map_err(-1.0) == Err(-1.0)
+
+
+def positive(x: float) -> Result[float, str]:
+    return Ok(x) if x >= 0 else Err("x must be positive")
+
+
+@try_guard(optimize=True)
+def sqrt_sum(x: float, y: float) -> Result[float, str]:
+    total = math.sqrt(positive(x).try_()) + math.sqrt(positive(y).try_())
+    if positive(total).try_() > 10:
+        return Ok(10.0)
+    return Ok(total)
+
+
+@try_guard(optimize=True)
+def sqrt_all(xs: list[float]) -> Result[list[float], str]:
+    return Ok([math.sqrt(positive(x).try_()) for x in xs])
+
+
+@try_guard(optimize=True)
+def try_order(r: Result[int, str], log: list[str]) -> Result[int, str]:
+    return Ok(log.append("first") or r.try_())
+
+
+@try_guard(optimize=True)
+def try_in_try_block(r: Result[int, str]) -> Result[int, str]:
+    try:
+        return Ok(r.try_())
+    except Exception:
+        return Ok(-1)
+
+
+@try_guard(optimize=True)
+def try_with_type_param(type: str, r: Result[int, str]) -> Result[tuple[str, int], str]:
+    value = (type, r.try_())
+    return Ok(value)
+
+
+class Tokenizer:
+    def __init__(self) -> None:
+        self.pos = 0
+
+    def next(self) -> Result[str, str]:
+        self.pos += 1
+        return Ok("tok")
+
+
+@try_guard(optimize=True)
+def try_mutating_receiver(t: Tokenizer) -> Result[tuple[int, str], str]:
+    return Ok((t.pos, t.next().try_()))
+
+
+@try_guard(optimize=True)
+def try_after_locals(t: Tokenizer, n: int) -> Result[tuple[int, str], str]:
+    value = (n, t.next().try_())
+    return Ok(value)
+
+
+def test_try_guard_optimize():
+    from rusttypes.fusion import fused_source
+
+    assert sqrt_sum(4.0, 9.0) == Ok(5.0)
+    assert sqrt_sum(-4.0, 9.0) == Err("x must be positive")
+    assert sqrt_sum(4.0, -9.0) == Err("x must be positive")
+    assert sqrt_sum(100.0, 100.0) == Ok(10.0)
+    assert "ResultException" not in fused_source(sqrt_sum)
+    assert ".try_()" in fused_source(sqrt_sum)
+    assert sqrt_sum.__name__ == "sqrt_sum"
+
+    # comprehensions keep the exception-based behaviour
+    assert sqrt_all([4.0, 9.0]) == Ok([2.0, 3.0])
+    assert sqrt_all([4.0, -9.0]) == Err("x must be positive")
+    assert fused_source(sqrt_all) is None
+
+    log: list[str] = []
+    assert try_order(Err("e"), log) == Err("e")
+    assert log == ["first"]
+
+    assert try_in_try_block(Ok(1)) == Ok(1)
+    assert try_in_try_block(Err("e")) == Ok(-1)
+    assert fused_source(try_in_try_block) is None
+
+    assert try_with_type_param("int", Ok(1)) == Ok(("int", 1))
+    assert try_with_type_param("int", Err("e")) == Err("e")
+    assert fused_source(try_with_type_param) is not None
+
+    # a lookup before the call may observe its side effects, the call stays in place
+    assert try_mutating_receiver(Tokenizer()) == Ok((0, "tok"))
+    assert fused_source(try_mutating_receiver) is None
+    assert try_after_locals(Tokenizer(), 1) == Ok((1, "tok"))
+    assert fused_source(try_after_locals) is not None
+
+    assert try_order(FrozenOk(3), log) == Ok(3)
+    assert try_order(FrozenErr("e"), log) == Err("e")
+
+
+@try_guard
+def lightweight_inner() -> Result[int, str]:
+    return Ok(Err("inner").try_())
+
+
+@try_guard
+def lightweight_outer() -> Result[int, str]:
+    try:
+        return Ok(Err("outer").try_())
+    finally:
+        lightweight_inner()
+
+
+@try_guard
+async def lightweight_coroutine(name: str, delay: float) -> Result[int, str]:
+    try:
+        return Ok(Err(f"from {name}").try_())
+    finally:
+        await asyncio.sleep(delay)
+
+
+def test_try_guard_lightweight():
+    @try_guard
+    def sqrt(x: float) -> Result[float, str]:
+        return Ok(math.sqrt(positive(x).try_()))
+
+    set_lightweight_exceptions(True)
+    try:
+        assert sqrt(4.0) == Ok(2.0)
+        assert sqrt(-1.0) == Err("x must be positive")
+        assert sqrt(-2.0) == Err("x must be positive")
+        try:
+            Err(1).try_()
+            raise AssertionError()
+        except ResultException as e:
+            assert e.inner == 1
+            first = e
+        # ``try_`` is not affected by the mode, every ``Err`` raises its own exception
+        try:
+            Err(2).try_()
+            raise AssertionError()
+        except ResultException as e:
+            assert e is not first
+            assert e.inner == 2
+        assert first.inner == 1
+
+        assert lightweight_outer() == Err("outer")
+
+        async def interleaved():
+            return await asyncio.gather(
+                lightweight_coroutine("a", 0.01), lightweight_coroutine("b", 0)
+            )
+
+        assert asyncio.run(interleaved()) == [Err("from a"), Err("from b")]
+    finally:
+        set_lightweight_exceptions(None)
+
+
+def test_catch_async():
+    @catch(ValueError)
+    async def parse(s: str) -> Result[int, str]:
+        await asyncio.sleep(0)
+        return Ok(int(s))
+
+    assert asyncio.iscoroutinefunction(parse)
+    assert asyncio.run(parse("1")) == Ok(1)
+    assert asyncio.run(parse("x")) == Err("invalid literal for int() with base 10: 'x'")
+
+
+async def async_positive(x: float) -> Result[float, str]:
+    await asyncio.sleep(0)
+    return positive(x)
+
+
+@try_guard(optimize=True)
+async def async_sqrt_sum(x: float, y: float) -> Result[float, str]:
+    a = (await async_positive(x)).try_()
+    b = positive(y).try_()
+    return Ok(math.sqrt(a) + math.sqrt(b))
+
+
+def test_try_guard_async():
+    from rusttypes.fusion import fused_source
+
+    @try_guard
+    async def sqrt(x: float) -> Result[float, str]:
+        return Ok(math.sqrt((await async_positive(x)).try_()))
+
+    assert asyncio.iscoroutinefunction(sqrt)
+    assert asyncio.run(sqrt(4.0)) == Ok(2.0)
+    assert asyncio.run(sqrt(-4.0)) == Err("x must be positive")
+
+    assert asyncio.iscoroutinefunction(async_sqrt_sum)
+    assert asyncio.run(async_sqrt_sum(4.0, 9.0)) == Ok(5.0)
+    assert asyncio.run(async_sqrt_sum(-4.0, 9.0)) == Err("x must be positive")
+    assert asyncio.run(async_sqrt_sum(4.0, -9.0)) == Err("x must be positive")
+    assert "await" in fused_source(async_sqrt_sum)
+
+
+@catch(ValueError, on_error="continue")
+def parse_lines(lines: list[str]):
+    for line in lines:
+        yield Ok(int(line))
+    yield Ok(int("end"))
+
+
+@try_guard(on_error="continue")
+async def async_roots(xs: list[float]):
+    for x in xs:
+        await asyncio.sleep(0)
+        yield Ok(math.sqrt(positive(x).try_()))
+
+
+def test_catch_generator():
+    @catch(ValueError)
+    def parse(lines: list[str]):
+        for line in lines:
+            yield Ok(int(line))
+
+    assert list(parse(["1", "2"])) == [Ok(1), Ok(2)]
+    error = "invalid literal for int() with base 10: 'x'"
+    assert list(parse(["1", "x", "3"])) == [Ok(1), Err(error)]
+
+    assert list(parse_lines(["1", "x", "3"])) == [
+        Ok(1),
+        Err(error),
+        Ok(3),
+        Err("invalid literal for int() with base 10: 'end'"),
+    ]
+
+    closed = []
+
+    @catch()
+    def endless():
+        try:
+            while True:
+                yield Ok(1)
+        finally:
+            closed.append(True)
+
+    stream = endless()
+    assert next(stream) == Ok(1)
+    stream.close()
+    assert closed == [True]
+
+    try:
+        catch(on_error="retry")(parse)
+        raise AssertionError()
+    except ValueError:
+        pass
+
+    try:
+        catch(on_error="continue")(parse)  # closures can not be recompiled
+        raise AssertionError()
+    except TypeError:
+        pass
+
+
+def test_try_guard_generator():
+    @try_guard
+    def roots(xs: list[float]):
+        for x in xs:
+            yield Ok(math.sqrt(positive(x).try_()))
+
+    assert list(roots([4.0, -1.0, 9.0])) == [Ok(2.0), Err("x must be positive")]
+
+    async def collect(stream):
+        return [item async for item in stream]
+
+    expected = [Ok(2.0), Err("x must be positive"), Ok(3.0)]
+    assert asyncio.run(collect(async_roots([4.0, -1.0, 9.0]))) == expected
+
+    @catch()
+    async def cancelled() -> Result[int, str]:
+        raise asyncio.CancelledError()
+
+    try:
+        asyncio.run(cancelled())
+        raise AssertionError()
+    except asyncio.CancelledError:
+        pass
+
+
+def test_do():
+    closed = []
+
+    @do
+    def sqrt_sum(x: float, y: float):
+        try:
+            a = yield positive(x)
+            b = yield positive(y)
+            return Ok(math.sqrt(a) + math.sqrt(b))
+        finally:
+            closed.append(True)
+
+    assert sqrt_sum(4.0, 9.0) == Ok(5.0)
+    assert sqrt_sum(4.0, -9.0) == Err("x must be positive")
+    assert closed == [True, True]
+
+    @do
+    def frozen():
+        a = yield FrozenOk(1)
+        b = yield FrozenErr("e")
+        return Ok(a + b)
+
+    assert frozen() == Err("e")
+
+    @do
+    def not_a_result():
+        try:
+            yield 1
+        except TypeError:
+            return Err("type error")
+
+    assert not_a_result() == Err("type error")
+
+
+def test_do_async():
+    async def fetch(x: float) -> Result[float, str]:
+        await asyncio.sleep(0)
+        return positive(x)
+
+    @do_async
+    async def sqrt_sum(x: float, y: float):
+        a = yield await fetch(x)
+        b = yield await fetch(y)
+        yield Done(Ok(math.sqrt(a) + math.sqrt(b)))
+
+    assert asyncio.run(sqrt_sum(4.0, 9.0)) == Ok(5.0)
+    assert asyncio.run(sqrt_sum(-4.0, 9.0)) == Err("x must be positive")
+
+    @do_async
+    async def no_done():
+        yield Ok(1)
+
+    try:
+        asyncio.run(no_done())
+        raise AssertionError()
+    except RuntimeError:
+        pass
+
+
+def test_passthrough_returns_self():
+    x = Ok(2)
+    assert x.map_err(str) is x
+    assert x.or_(Ok(3)) is x
+    assert x.or_else(Ok) is x
+
+    y = Err("Some error message")
+    assert y.map(str) is y
+    assert y.and_(Ok(3)) is y
+    assert y.and_then(Ok) is y
+
+
+def test_is_result():
+    assert is_result(Ok(1))
+    assert is_result(Err("Some error message"))
+    assert not is_result(1)
+    assert not is_result(Some(1))
+
+
+def test_abstract():
+    try:
+        Result()
+        raise AssertionError()
+    except TypeError:
+        pass
+
+    try:
+
+        class Incomplete(Result):
+            pass
+
+        raise AssertionError()
+    except TypeError as e:
+        assert "try_" in str(e)
+
+    assert type(Result).__name__ == "type"
+
+
+def test_hash():
+    assert hash(Ok(1)) == hash(Ok(1))
+    assert hash(Err("error")) == hash(Err("error"))
+    assert len({Ok(1), Ok(1), Err(1), Err(1)}) == 2
+    assert {Ok(1): "ok", Err(1): "err"}[Err(1)] == "err"
+
+
+def test_ordering():
+    assert Ok(100) < Err(0)
+    assert Err(0) > Ok(100)
+    assert Ok(1) < Ok(2)
+    assert Err("a") < Err("b")
+    assert Ok(2) <= Ok(2)
+    assert not Err(0) <= Ok(100)
+
+    xs = [Err("b"), Ok(3), Err("a"), Ok(1)]
+    assert sorted(xs) == [Ok(1), Ok(3), Err("a"), Err("b")]
+    assert sorted(xs, key=Result.sort_key) == sorted(xs)
+
+
+def test_frozen():
+    for frozen, plain in ((FrozenOk(1), Ok(1)), (FrozenErr("error"), Err("error"))):
+        assert frozen == plain
+        assert plain == frozen
+        assert hash(frozen) == hash(plain)
+        assert is_result(frozen)
+
+        try:
+            frozen.inner = 2
+            raise AssertionError()
+        except AttributeError:
+            pass
+
+        assert copy.copy(frozen) is frozen
+        assert copy.deepcopy(frozen) == plain
+        assert type(pickle.loads(pickle.dumps(frozen))) is type(frozen)
+
+    assert FrozenOk(1).map(lambda v: v + 1) == Ok(2)
+    assert FrozenErr(1).map_err(lambda v: v + 1) == Err(2)
+
+
+def test_collect():
+    assert Result.collect([Ok(1), Ok(2)]) == Ok([1, 2])
+    assert Result.collect([]) == Ok([])
+    assert Result.collect([Ok(1), Err("first"), Err("second")]) == Err("first")
+
+    consumed = []
+
+    def lazy():
+        for x in (Ok(1), Err("first"), Ok(3)):
+            consumed.append(x)
+            yield x
+
+    assert Result.collect(lazy()) == Err("first")
+    assert consumed == [Ok(1), Err("first")]
+
+
+def test_collect_into():
+    assert Result.collect_into([Ok(1), Ok(1), Ok(2)], set) == Ok({1, 2})
+    assert Result.collect_into([Ok(("a", 1)), Ok(("b", 2))], dict) == Ok({"a": 1, "b": 2})
+    assert Result.collect_into([Ok(1), Err("error"), Err("other")], set) == Err("error")
+
+
+def test_sum_product():
+    assert Result.sum([Ok(1), Ok(2)]) == Ok(3)
+    assert Result.sum(Ok(x) for x in range(4)) == Ok(6)
+    assert Result.sum([Ok(1), Err("error")]) == Err("error")
+    assert Result.product([Ok(2), Ok(3)]) == Ok(6)
+    assert Result.product([Err("error"), Ok(3)]) == Err("error")
+
+
+def test_partition():
+    xs = [Ok(1), Err("a"), Ok(2), Err("b")]
+    assert Result.partition(xs) == ([1, 2], ["a", "b"])
+    assert Result.partition(iter(xs)) == ([1, 2], ["a", "b"])
+    assert Result.partition([]) == ([], [])
+
+    oks, errs, ok_positions, err_positions = Result.partition_indexed(iter(xs))
+    assert (oks, errs) == ([1, 2], ["a", "b"])
+    assert list(ok_positions) == [0, 2]
+    assert list(err_positions) == [1, 3]
@@ -0,0 +1,104 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+from rusttypes.option import Nil, Some
+from rusttypes.sparse import SparseOptionVector
+
+
+def test_from_options():
+    options = [Nil, Some(1), Nil, Nil, Some(2)]
+    vec = SparseOptionVector.from_options(options, typecode="q")
+
+    assert len(vec) == 5
+    assert vec.typecode == "q"
+    assert list(vec.indices) == [1, 4]
+    assert list(vec.values) == [1, 2]
+    assert vec.to_options() == options
+    assert list(vec) == options
+    assert SparseOptionVector.from_options([]).to_options() == []
+
+
+def test_from_optionals():
+    values = [None, "a", None, None, "b", None]
+    vec = SparseOptionVector.from_optionals(iter(values))
+
+    assert vec.to_optionals() == values
+    assert list(vec.items()) == [(1, "a"), (4, "b")]
+    assert vec.count_some() == 2
+    assert vec.count_nil() == 4
+
+
+def test_from_items():
+    vec = SparseOptionVector.from_items(5, {3: "b", 0: "a"}.items())
+    assert vec.to_optionals() == ["a", None, None, "b", None]
+
+    for items in ([(5, "a")], [(-1, "a")], [(1, "a"), (1, "b")]):
+        try:
+            SparseOptionVector.from_items(5, items)
+            raise AssertionError()
+        except ValueError:
+            pass
+
+    try:
+        SparseOptionVector(5, [1, 2], ["a"])
+        raise AssertionError()
+    except ValueError:
+        pass
+
+
+def test_getitem():
+    vec = SparseOptionVector.from_optionals([None, 1, None, 3])
+
+    assert vec[0] is Nil
+    assert vec[1] == Some(1)
+    assert vec[2] is Nil
+    assert vec[-1] == Some(3)
+
+    try:
+        vec[4]
+        raise AssertionError()
+    except IndexError:
+        pass
+
+
+def test_map():
+    vec = SparseOptionVector.from_optionals([None, 1, None, 3], typecode="q")
+
+    assert vec.map(lambda x: x * 2).to_optionals() == [None, 2, None, 6]
+    assert vec.map(lambda x: x * 2).typecode == "q"
+    assert vec.map(str, typecode=None).to_optionals() == [None, "1", None, "3"]
+    assert vec.map(lambda x: x * 2).indices is vec.indices
+
+
+def test_filter():
+    vec = SparseOptionVector.from_optionals([None, 1, None, 2, 4])
+
+    assert vec.filter(lambda x: x % 2 == 0).to_optionals() == [None, None, None, 2, 4]
+    assert vec.filter(lambda x: False).count_some() == 0
@@ -0,0 +1,151 @@
+# Copyright (c) 2024, Hendrik Böck <hendrikboeck.dev@protonmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from __future__ import annotations
+
+from rusttypes.result import Err, Ok, try_guard
+from rusttypes.tagged import (
+    err,
+    from_fn,
+    from_result,
+    ok,
+    res_and,
+    res_and_then,
+    res_err,
+    res_expect,
+    res_expect_err,
+    res_inspect,
+    res_inspect_err,
+    res_is_err,
+    res_is_err_and,
+    res_is_ok,
+    res_is_ok_and,
+    res_map,
+    res_map_err,
+    res_map_or,
+    res_map_or_else,
+    res_ok,
+    res_or,
+    res_or_else,
+    res_try,
+    res_unwrap,
+    res_unwrap_err,
+    res_unwrap_or,
+    res_unwrap_or_else,
+    to_result,
+)
+
+
+def test_conversion():
+    assert ok(1) == (0, 1)
+    assert ok() == (0, None)
+    assert err("error") == (1, "error")
+    assert from_result(Ok(1)) == ok(1)
+    assert from_result(Err("error")) == err("error")
+    assert to_result(ok(1)) == Ok(1)
+    assert to_result(err("error")) == Err("error")
+    assert sorted([err("a"), ok(2), ok(1)]) == [ok(1), ok(2), err("a")]
+
+
+def test_from_fn():
+    assert from_fn(lambda: int("42")) == ok(42)
+    tag, e = from_fn(lambda: int("foo"))
+    assert tag == 1
+    assert isinstance(e, ValueError)
+
+
+def test_is_ok():
+    assert res_is_ok(ok(1))
+    assert not res_is_ok(err(1))
+    assert res_is_ok_and(ok(2), lambda x: x > 1)
+    assert not res_is_ok_and(err(2), lambda x: x > 1)
+    assert res_is_err(err(1))
+    assert res_is_err_and(err(2), lambda x: x > 1)
+    assert not res_is_err_and(ok(2), lambda x: x > 1)
+    assert res_ok(ok(1)) == 1
+    assert res_ok(err(1)) is None
+    assert res_err(err(1)) == 1
+    assert res_err(ok(1)) is None
+
+
+def test_map():
+    x = err("Some error message")
+    assert res_map(ok(2), lambda v: v + 1) == ok(3)
+    assert res_map(x, lambda v: v + 1) is x
+    assert res_map_or(ok("foo"), 42, len) == 3
+    assert res_map_or(err("bar"), 42, len) == 42
+    assert res_map_or_else(err("bar"), lambda _: 42, len) == 42
+    assert res_map_err(err(13), str) == err("13")
+    assert res_map_err(ok(2), str) == ok(2)
+
+    seen = []
+    res_inspect(ok(1), seen.append)
+    res_inspect(err(2), seen.append)
+    res_inspect_err(err(3), seen.append)
+    res_inspect_err(ok(4), seen.append)
+    assert seen == [1, 3]
+
+
+def test_unwrap():
+    assert res_unwrap(ok(2)) == 2
+    assert res_expect(ok(2), "error") == 2
+    assert res_unwrap_err(err(2)) == 2
+    assert res_expect_err(err(2), "error") == 2
+    assert res_unwrap_or(err(2), 0) == 0
+    assert res_unwrap_or_else(err("foo"), len) == 3
+
+    try:
+        res_unwrap(err("Some error message"))
+        raise AssertionError()
+    except RuntimeError as e:
+        assert str(e) == "Called unwrap on Err"
+
+    try:
+        res_unwrap_err(ok(1))
+        raise AssertionError()
+    except RuntimeError as e:
+        assert str(e) == "Called unwrap_err on Ok"
+
+
+def test_and_or():
+    assert res_and(ok(2), err("late error")) == err("late error")
+    assert res_and(err("early error"), ok("foo")) == err("early error")
+    assert res_and_then(ok(2), lambda x: ok(str(x * x))) == ok("4")
+    assert res_and_then(err("error"), lambda x: ok(str(x * x))) == err("error")
+    assert res_or(ok(2), err("late error")) == ok(2)
+    assert res_or(err("early error"), ok(2)) == ok(2)
+    assert res_or_else(err(3), lambda x: ok(x * x)) == ok(9)
+    assert res_or_else(ok(2), lambda x: ok(x * x)) == ok(2)
+
+
+def test_try():
+    @try_guard
+    def double(t):
+        return Ok(res_try(t) * 2)
+
+    assert double(ok(2)) == Ok(4)
+    assert double(err("error")) == Err("error")